@@ -0,0 +1,73 @@
+# -*- coding:utf-8 -*-
+
+"""Benchmark of diff engines (run by `python -m benchmarks.diff`)
+
+Usage:
+  diff [--items=<items>] [--repeat=<repeat>]
+
+Options:
+  --items=<items>     Number of items in a payload [default: 1000]
+  --repeat=<repeat>   Number of repeats for each engine [default: 5]
+"""
+
+import random
+import time
+from typing import Any, Tuple
+
+from docopt import docopt
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from jumeaux.domain.config.vo import DiffEngine
+from jumeaux.executor import create_diff_keys
+
+
+def create_payloads(items: int) -> Tuple[Any, Any]:
+    """Creates a search API like response and a slightly changed one"""
+    rnd = random.Random(0)
+
+    def item(i: int) -> dict:
+        return {
+            "id": i,
+            "name": f"item-{i}",
+            "price": rnd.randrange(10000) / 100,
+            "tags": [f"tag-{rnd.randrange(50)}" for _ in range(5)],
+            "stock": {"available": rnd.random() > 0.5, "count": rnd.randrange(100)},
+            "description": None,
+        }
+
+    one = {"total": items, "items": [item(i) for i in range(items)]}
+    other = {"total": items, "items": [dict(x) for x in one["items"]]}
+    for x in other["items"][::50]:
+        x["price"] = x["price"] + 1
+        x["stock"] = {"available": x["stock"]["available"], "count": str(x["stock"]["count"])}
+    other["items"].pop()
+    return one, other
+
+
+def bench(engine: DiffEngine, one: Any, other: Any, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        create_diff_keys(one, other, engine)
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def main():
+    args = docopt(__doc__)
+    one, other = create_payloads(int(args["--items"]))
+    repeat = int(args["--repeat"])
+
+    assert (
+        create_diff_keys(one, other, DiffEngine.JUMEAUX).to_dict()
+        == create_diff_keys(one, other, DiffEngine.DEEPDIFF).to_dict()
+    )
+
+    results = {e: bench(e, one, other, repeat) for e in [DiffEngine.DEEPDIFF, DiffEngine.JUMEAUX]}
+    for e, sec in results.items():
+        print(f"{e.value:>10}: {sec * 1000:8.2f}ms")
+    print(f"{'speedup':>10}: {results[DiffEngine.DEEPDIFF] / results[DiffEngine.JUMEAUX]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
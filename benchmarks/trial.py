@@ -0,0 +1,90 @@
+# -*- coding:utf-8 -*-
+
+"""Benchmark of overhead per trial except for HTTP (run by `python -m benchmarks.trial`)
+
+Responses are returned immediately without network, so the result is the time spent
+on jumeaux itself (creating args, res2res, res2dict, diff, judgement, building trials and so on).
+
+Usage:
+  trial [--trials=<trials>] [--repeat=<repeat>]
+
+Options:
+  --trials=<trials>   Number of trials in a run [default: 2000]
+  --repeat=<repeat>   Number of runs [default: 5]
+"""
+
+import datetime
+import io
+import logging
+import tempfile
+import time
+from unittest.mock import patch
+
+import requests
+from docopt import docopt
+from owlmixin import TList
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from jumeaux import executor
+from jumeaux.addons import AddOnExecutor
+from jumeaux.domain.config.vo import Config
+from jumeaux.models import Request
+
+BODY_ONE = b'{"id": 1, "name": "jumeaux", "tags": ["a", "b"], "price": 100}'
+BODY_OTHER = b'{"id": 1, "name": "jumeaux", "tags": ["a", "c"], "price": 100}'
+
+
+def http_get(args) -> requests.Response:
+    _, url, _, _ = args
+    res = requests.Response()
+    res._content = BODY_OTHER if "other" in url and "diff" in url else BODY_ONE
+    res.status_code = 200
+    res.url = url
+    res.encoding = "utf8"
+    res.headers["content-type"] = "application/json"
+    res.elapsed = datetime.timedelta(microseconds=1000)
+    return res
+
+
+def create_config(response_dir: str) -> Config:
+    return Config.from_dict(
+        {
+            "one": {"name": "one", "host": "http://host/one"},
+            "other": {"name": "other", "host": "http://host/other"},
+            "output": {"response_dir": response_dir, "streaming": True},
+            "addons": {
+                "log2reqs": {"name": "plain"},
+                "res2dict": [{"name": "json"}],
+            },
+        }
+    )
+
+
+def bench(trials: int, repeat: int) -> float:
+    reqs: TList[Request] = Request.from_dicts(
+        [{"path": "/same", "qs": {"q": ["1"]}}, {"path": "/diff"}] * (trials // 2)
+    )
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as response_dir, patch(
+        "jumeaux.executor.http_get", http_get
+    ):
+        config = create_config(response_dir)
+        executor.global_addon_executor = AddOnExecutor(config.addons)
+        for i in range(repeat):
+            begin = time.perf_counter()
+            executor.exec(config, reqs, f"bench{i}", None)
+            best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def main():
+    args = docopt(__doc__)
+    trials = int(args["--trials"])
+    logging.disable(logging.CRITICAL)
+
+    sec = bench(trials, int(args["--repeat"]))
+    print(f"{trials} trials: {sec * 1000:.0f}ms ({sec / trials * 1000000:.0f}us per trial)")
+
+
+if __name__ == "__main__":
+    main()
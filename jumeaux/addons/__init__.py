@@ -3,10 +3,13 @@
 
 from importlib import import_module
 from importlib.util import find_spec
+from typing import Any, Callable, Optional
+
 from owlmixin import TList
 
 from jumeaux.addons.models import Addon, Addons
 from jumeaux.domain.config.vo import Config
+from jumeaux.latency import AddOnProfiler
 from jumeaux.models import (
     Request,
     Log2ReqsAddOnPayload,
@@ -48,7 +51,10 @@ Please check either if << {relative_name} >> or << {a.name} >> are exist.
 
 
 class AddOnExecutor:
-    def __init__(self, addons: Addons) -> None:
+    def __init__(self, addons: Addons, profile: bool = False) -> None:
+        self.addons = addons
+        # Every add-on call is measured only if profile is True
+        self.profiler: Optional[AddOnProfiler] = AddOnProfiler() if profile else None
         self.log2reqs = create_addon(addons.log2reqs, "log2reqs")
         self.reqs2reqs = (
             addons.reqs2reqs.map(lambda x: create_addon(x, "reqs2reqs")) if addons else TList()
@@ -75,39 +81,59 @@ class AddOnExecutor:
         )
         self.final = addons.final.map(lambda x: create_addon(x, "final")) if addons else TList()
 
+    def _apply(self, layer: str, executors: TList, payload: Any, call: Callable[[Any, Any], Any]):
+        if not self.profiler:
+            return executors.reduce(lambda p, a: call(a, p), payload)
+
+        addons: TList[Addon] = getattr(self.addons, layer)
+        for i, a in enumerate(executors):
+            with self.profiler.measure(layer, i, addons[i].name):
+                payload = call(a, payload)
+        return payload
+
     def apply_log2reqs(self, payload: Log2ReqsAddOnPayload) -> TList[Request]:
-        return self.log2reqs.exec(payload)
+        if not self.profiler:
+            return self.log2reqs.exec(payload)
+
+        with self.profiler.measure("log2reqs", 0, self.addons.log2reqs.name):
+            return self.log2reqs.exec(payload)
 
     def apply_reqs2reqs(
         self, payload: Reqs2ReqsAddOnPayload, config: Config
     ) -> Reqs2ReqsAddOnPayload:
-        return self.reqs2reqs.reduce(lambda p, a: a.exec(p, config), payload)
+        return self._apply("reqs2reqs", self.reqs2reqs, payload, lambda a, p: a.exec(p, config))
 
     def apply_res2res(self, payload: Res2ResAddOnPayload) -> Res2ResAddOnPayload:
-        return self.res2res.reduce(lambda p, a: a.exec(p), payload)
+        return self._apply("res2res", self.res2res, payload, lambda a, p: a.exec(p))
 
     def apply_res2dict(self, payload: Res2DictAddOnPayload) -> Res2DictAddOnPayload:
-        return self.res2dict.reduce(lambda p, a: a.exec(p), payload)
+        return self._apply("res2dict", self.res2dict, payload, lambda a, p: a.exec(p))
 
     def apply_judgement(
         self, payload: JudgementAddOnPayload, reference: JudgementAddOnReference
     ) -> JudgementAddOnPayload:
-        return self.judgement.reduce(lambda p, a: a.exec(p, reference), payload)
+        return self._apply(
+            "judgement", self.judgement, payload, lambda a, p: a.exec(p, reference)
+        )
 
     def apply_store_criterion(
         self, payload: StoreCriterionAddOnPayload, reference: StoreCriterionAddOnReference
     ) -> StoreCriterionAddOnPayload:
-        return self.store_criterion.reduce(lambda p, a: a.exec(p, reference), payload)
+        return self._apply(
+            "store_criterion", self.store_criterion, payload, lambda a, p: a.exec(p, reference)
+        )
 
     def apply_dump(self, payload: DumpAddOnPayload) -> DumpAddOnPayload:
-        return self.dump.reduce(lambda p, a: a.exec(p), payload)
+        return self._apply("dump", self.dump, payload, lambda a, p: a.exec(p))
 
     def apply_did_challenge(
         self, payload: DidChallengeAddOnPayload, reference: DidChallengeAddOnReference
     ) -> DidChallengeAddOnPayload:
-        return self.did_challenge.reduce(lambda p, a: a.exec(p, reference), payload)
+        return self._apply(
+            "did_challenge", self.did_challenge, payload, lambda a, p: a.exec(p, reference)
+        )
 
     def apply_final(
         self, payload: FinalAddOnPayload, reference: FinalAddOnReference
     ) -> FinalAddOnPayload:
-        return self.final.reduce(lambda p, a: a.exec(p, reference), payload)
+        return self._apply("final", self.final, payload, lambda a, p: a.exec(p, reference))
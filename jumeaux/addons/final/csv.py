@@ -3,9 +3,11 @@
 import logging
 
 from owlmixin import OwlMixin, TList
+from owlmixin.transformers import traverse
+from owlmixin.util import dump_csvf
 
 from jumeaux.addons.final import FinalExecutor
-from jumeaux.models import FinalAddOnPayload, FinalAddOnReference
+from jumeaux.models import FinalAddOnPayload, FinalAddOnReference, Trial
 from jumeaux.logger import Logger
 
 logger: Logger = Logger(__name__)
@@ -21,9 +23,9 @@ class Executor(FinalExecutor):
     def __init__(self, config: dict):
         self.config: Config = Config.from_dict(config or {})
 
-    def exec(self, payload: FinalAddOnPayload, reference: FinalAddOnReference) -> FinalAddOnPayload:
-        payload.report.trials.map(
-            lambda x: {
+    def to_row(self, x: Trial) -> dict:
+        return traverse(
+            {
                 "seq": x.seq,
                 "name": x.name,
                 "method": x.method,
@@ -44,10 +46,17 @@ class Executor(FinalExecutor):
                 "other.response_sec": x.other.response_sec,
                 "other.content_type": x.other.content_type,
                 "other.encoding": x.other.encoding,
-            }
-        ).to_csvf(
+            },
+            force_value=True,
+        )
+
+    def exec(self, payload: FinalAddOnPayload, reference: FinalAddOnReference) -> FinalAddOnPayload:
+        # Rows are written one by one not to hold all trials in streaming mode
+        dump_csvf(
+            (self.to_row(x) for x in payload.iter_trials()),
+            self.config.column_names,
             fpath=self.config.output_path,
-            fieldnames=self.config.column_names,
+            encoding="utf8",
             with_header=self.config.with_header,
         )
 
@@ -1,6 +1,9 @@
 # -*- coding:utf-8 -*-
 
+import sys
+
 from owlmixin import OwlMixin, TOption
+from owlmixin.util import dump_json
 
 from jumeaux.addons.final import FinalExecutor
 from jumeaux.models import FinalAddOnPayload, FinalAddOnReference
@@ -8,6 +11,8 @@ from jumeaux.logger import Logger
 
 logger: Logger = Logger(__name__)
 
+TRIALS_PLACEHOLDER = "__JUMEAUX_TRIALS__"
+
 
 class Config(OwlMixin):
     sysout: bool = False
@@ -18,7 +23,42 @@ class Executor(FinalExecutor):
     def __init__(self, config: dict):
         self.config: Config = Config.from_dict(config or {})
 
+    def write_streaming(self, payload: FinalAddOnPayload, f):
+        """Write a report whose trials are read from `trials.jsonl` one by one.
+        The output is same as the report which holds all trials.
+        """
+        indent = self.config.indent.get()
+        report: dict = payload.report.to_dict()
+        report["trials"] = TRIALS_PLACEHOLDER
+        before, after = dump_json(report, indent).split(f'"{TRIALS_PLACEHOLDER}"')
+
+        # If indented, each trial is on its own line one level deeper than `trials` (as json.dumps)
+        line = before[before.rfind("\n") + 1 :]
+        margin = "" if indent is None else "\n" + " " * (len(line) - len(line.lstrip(" ")))
+        item_margin = "" if indent is None else margin + " " * indent
+
+        f.write(before + "[")
+        empty = True
+        for trial in payload.iter_trials():
+            item = dump_json(trial.to_dict(), indent).replace("\n", item_margin)
+            f.write(("" if empty else ",") + item_margin + item)
+            empty = False
+        f.write(("" if empty else margin) + "]" + after)
+
     def exec(self, payload: FinalAddOnPayload, reference: FinalAddOnReference) -> FinalAddOnPayload:
+        if payload.output_summary.streaming.get_or(False):
+            if self.config.sysout:
+                self.write_streaming(payload, sys.stdout)
+                print()
+            else:
+                with open(
+                    f"{payload.result_path}/report.json",
+                    "w",
+                    encoding=payload.output_summary.encoding,
+                ) as f:
+                    self.write_streaming(payload, f)
+            return payload
+
         if self.config.sysout:
             print(payload.report.to_json(indent=self.config.indent.get()))
         else:
@@ -3,6 +3,7 @@
 import json
 import os
 import shutil
+import tempfile
 import warnings
 from decimal import Decimal
 
@@ -53,7 +54,8 @@ class Executor(FinalExecutor):
         self.config: Config = Config.from_dict(config or {})
 
     def exec(self, payload: FinalAddOnPayload, reference: FinalAddOnReference) -> FinalAddOnPayload:
-        if When.NOT_EMPTY in self.config.when and payload.report.trials.size() == 0:
+        status = payload.report.summary.status
+        if When.NOT_EMPTY in self.config.when and status.same + status.different + status.failure == 0:
             logger.info_lv1('Skip sending results to Miroir because trials are empty.')
             return payload
 
@@ -135,9 +137,16 @@ class Executor(FinalExecutor):
         s3.put_object(Bucket=self.config.bucket,
                       Key=f'{base_key}/{report.key}/report-without-trials.json',
                       Body=json.dumps(d, ensure_ascii=False))
-        s3.put_object(Bucket=self.config.bucket,
-                      Key=f'{base_key}/{report.key}/trials.json',
-                      Body=report.trials.to_json())
+        # Trials are written to a temporary file one by one not to hold all trials in streaming mode
+        with tempfile.TemporaryFile() as f:
+            f.write(b'[')
+            for i, trial in enumerate(payload.iter_trials()):
+                f.write((',' if i > 0 else '').encode('utf8') + trial.to_json().encode('utf8'))
+            f.write(b']')
+            f.seek(0)
+            s3.put_object(Bucket=self.config.bucket,
+                          Key=f'{base_key}/{report.key}/trials.json',
+                          Body=f)
 
         # details
         upload_responses("one")
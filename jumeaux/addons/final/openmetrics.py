@@ -0,0 +1,37 @@
+# -*- coding:utf-8 -*-
+
+from owlmixin import OwlMixin, TDict, TOption
+
+from jumeaux.addons.final import FinalExecutor
+from jumeaux.logger import Logger
+from jumeaux.metrics import RunMetrics, write_textfile
+from jumeaux.models import FinalAddOnPayload, FinalAddOnReference
+
+logger: Logger = Logger(__name__)
+
+
+class Config(OwlMixin):
+    path: TOption[str]
+    labels: TDict[str] = {}
+
+
+class Executor(FinalExecutor):
+    def __init__(self, config: dict):
+        self.config: Config = Config.from_dict(config or {})
+
+    def exec(self, payload: FinalAddOnPayload, reference: FinalAddOnReference) -> FinalAddOnPayload:
+        metrics = RunMetrics()
+        for trial in payload.iter_trials():
+            metrics.record(trial.to_dict())
+
+        summary = payload.report.summary
+        path: str = self.config.path.get_or(f"{payload.result_path}/metrics.prom")
+        write_textfile(
+            path,
+            metrics.to_openmetrics(
+                summary.latencies.get(), summary.addon_profiles.get(), self.config.labels.to_dict()
+            ),
+        )
+        logger.info_lv1(f"Write metrics to {path}")
+
+        return payload
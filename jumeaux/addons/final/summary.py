@@ -4,7 +4,17 @@ import os
 from owlmixin import OwlMixin
 
 from jumeaux.addons.final import FinalExecutor
-from jumeaux.models import FinalAddOnPayload, Report, OutputSummary, FinalAddOnReference
+from jumeaux.models import (
+    FinalAddOnPayload,
+    Report,
+    OutputSummary,
+    FinalAddOnReference,
+    ConnectionStats,
+    ConnectionsSummary,
+    Aborted,
+    LatencyStats,
+    AddOnProfile,
+)
 from jumeaux.logger import Logger
 
 logger: Logger = Logger(__name__)
@@ -18,6 +28,65 @@ class Executor(FinalExecutor):
     def __init__(self, config: dict):
         self.config: Config = Config.from_dict(config or {})
 
+    def connections_summary(self, r: Report) -> str:
+        if r.summary.connections.is_none():
+            return ""
+
+        def line(title: str, x: ConnectionStats) -> str:
+            return f"| {title} | {x.new_connections} new / {x.requests} requests ({x.reuse_ratio:.1%} reused)"  # noqa
+
+        c: ConnectionsSummary = r.summary.connections.get()
+        return f"""
+-------------------------------------------------------------------
+{line("One connections  ", c.one)}
+{line("Other connections", c.other)}
+-------------------------------------------------------------------
+"""
+
+    def aborted_summary(self, r: Report) -> str:
+        if r.summary.aborted.is_none():
+            return ""
+
+        a: Aborted = r.summary.aborted.get()
+        return f"""
+-------------------------------------------------------------------
+| Aborted | {a.reason} ({a.trials} / {a.total} trials)
+-------------------------------------------------------------------
+"""
+
+    def latencies_summary(self, r: Report) -> str:
+        if not r.summary.latencies.get():
+            return ""
+
+        def line(stage: str, x: LatencyStats) -> str:
+            return f"| {stage:<15} | {x.count:>6} | {x.p50:>7.1f} | {x.p90:>7.1f} | {x.p99:>7.1f} | {x.max:>7.1f} |"  # noqa
+
+        lines = os.linesep.join(line(k, v) for k, v in r.summary.latencies.get().items())
+        return f"""
+--------------------------------------------------------------------
+| Latency (ms)    |  Count |     p50 |     p90 |     p99 |     Max |
+--------------------------------------------------------------------
+{lines}
+--------------------------------------------------------------------
+"""
+
+    def addon_profiles_summary(self, r: Report) -> str:
+        if not r.summary.addon_profiles.get():
+            return ""
+
+        def line(x: AddOnProfile) -> str:
+            name = f"{x.layer}/{x.name}"
+            return f"| {name:<30} | {x.calls:>6} | {x.total_ms:>9.1f} | {x.mean_ms:>7.2f} | {x.max_ms:>7.1f} | {x.errors:>6} |"  # noqa
+
+        lines = os.linesep.join(line(x) for x in r.summary.addon_profiles.get())
+        return f"""
+------------------------------------------------------------------------------------
+| Add-on (ms)                    |  Calls |     Total |    Mean |     Max | Errors |
+------------------------------------------------------------------------------------
+{lines}
+------------------------------------------------------------------------------------
+"""
+
     def exec(self, payload: FinalAddOnPayload, reference: FinalAddOnReference) -> FinalAddOnPayload:
         r: Report = payload.report
         s: OutputSummary = payload.output_summary
@@ -38,7 +107,7 @@ class Executor(FinalExecutor):
 -------------------------------------------------------------------
 |{r.summary.status.same:^21}|{r.summary.status.different:^21}|{r.summary.status.failure:^21}|
 -------------------------------------------------------------------
-
+{self.aborted_summary(r)}
 -------------------------------------------------------------------
 | Threads         | {r.summary.concurrency.threads}
 | Processes       | {r.summary.concurrency.processes}
@@ -46,6 +115,9 @@ class Executor(FinalExecutor):
 | End             | {r.summary.time.end}
 | Elapsed seconds | {r.summary.time.elapsed_sec}
 -------------------------------------------------------------------
+{self.connections_summary(r)}
+{self.latencies_summary(r)}
+{self.addon_profiles_summary(r)}
 
 
 >>> By Jumeaux {r.version}
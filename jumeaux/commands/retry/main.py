@@ -2,7 +2,7 @@
 Usage:
   {cli} <report> [--title=<title>] [--description=<description>]
                  [--tag=<tag>...] [--threads=<threads>] [--processes=<processes>]
-                 [--max-retries=<max_retries>] [-vvv]
+                 [--max-retries=<max_retries>] [--profile-addons] [--profile=<file>] [-vvv]
   {cli} (-h | --help)
 
 Options:
@@ -13,6 +13,8 @@ Options:
   --threads = <threads>                         The number of threads in challenge [def: 1]
   --processes = <processes>                     The number of processes in challenge
   --max-retries = <max_retries>                 The max number of retries which accesses to API
+  --profile-addons                              Measure time of each add-on and output to report
+  --profile = <file>                            Sample stacks of all workers to the file (collapsed)
   -vvv                                          Logger level (`-v` or `-vv` or `-vvv`)
   -h --help                                     Show this screen.
 """
@@ -37,6 +39,8 @@ class Args(OwlMixin):
     threads: TOption[int]
     processes: TOption[int]
     max_retries: TOption[int]
+    profile_addons: bool
+    profile: TOption[str]
     v: int
 
 
@@ -51,7 +55,9 @@ def run(args: Args):
                 "threads": args.threads,
                 "processes": args.processes,
                 "max_retries": args.max_retries,
+                "profile_addons": args.profile_addons,
             }
         ),
         report=args.report,
+        profile=args.profile,
     )
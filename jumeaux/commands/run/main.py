@@ -3,7 +3,8 @@ Usage:
   {cli} <files>... [--config=<yaml>...] [--title=<title>] [--description=<description>]
                    [--tag=<tag>...] [--skip-addon-tag=<skip_add_on_tag>...]
                    [--threads=<threads>] [--processes=<processes>]
-                   [--max-retries=<max_retries>] [-vvv]
+                   [--max-retries=<max_retries>] [--profile-addons] [--profile=<file>]
+                   [--resume=<key>] [-vvv]
   {cli} (-h | --help)
 
 Options:
@@ -16,6 +17,9 @@ Options:
   --threads = <threads>                         The number of threads in challenge [def: 1]
   --processes = <processes>                     The number of processes in challenge
   --max-retries = <max_retries>                 The max number of retries which accesses to API
+  --profile-addons                              Measure time of each add-on and output to report
+  --profile = <file>                            Sample stacks of all workers to the file (collapsed)
+  --resume = <key>                              Resume an interrupted run (output.streaming) of the key
   -vvv                                          Logger level (`-v` or `-vv` or `-vvv`)
   -h --help                                     Show this screen.
 """
@@ -42,6 +46,9 @@ class Args(OwlMixin):
     threads: TOption[int]
     processes: TOption[int]
     max_retries: TOption[int]
+    profile_addons: bool
+    profile: TOption[str]
+    resume: TOption[str]
     v: int
 
 
@@ -57,8 +64,11 @@ def run(args: Args):
                 "threads": args.threads,
                 "processes": args.processes,
                 "max_retries": args.max_retries,
+                "profile_addons": args.profile_addons,
             }
         ),
         config_paths=args.config or TList(["config.yml"]),
         skip_addon_tag=TOption(args.skip_addon_tag or None),
+        resume=args.resume,
+        profile=args.profile,
     )
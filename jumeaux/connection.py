@@ -0,0 +1,166 @@
+# -*- coding:utf-8 -*-
+
+import threading
+import time
+from typing import Optional, Tuple
+
+import requests
+from owlmixin import TOption
+from requests.adapters import HTTPAdapter
+
+from jumeaux.models import ConnectionStats, ConnectionPool, Timeout
+from jumeaux.logger import Logger
+
+logger: Logger = Logger(__name__)
+
+MIN_TIMEOUT_SEC = 0.001
+
+
+class PooledSession:
+    """`requests.Session` for one access point which keeps connections alive across trials.
+
+    It is picklable for `ProcessPoolExecutor`, but an unpickled one starts with an empty pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pool: TOption[ConnectionPool],
+        max_retries: int,
+        default_max_keepalive: int,
+        timeout: TOption[Timeout] = TOption(None),
+        retry_read: bool = True,
+    ):
+        """:param retry_read: False if requests are bounded by deadlines.
+        A timeout applies to each attempt, so retries of reads would multiply it.
+        """
+        self.name = name
+        self.pool = pool
+        self.max_retries = max_retries
+        self.default_max_keepalive = default_max_keepalive
+        self.timeout = timeout
+        self.retry_read = retry_read
+        self._init()
+
+    def _init(self):
+        max_connections: Optional[int] = self.pool.map(lambda x: x.max_connections.get()).get()
+        max_keepalive: int = (
+            self.pool.map(lambda x: x.max_keepalive.get()).get()
+            or max_connections
+            or self.default_max_keepalive
+        )
+
+        self.adapter = HTTPAdapter(max_retries=self.max_retries, pool_maxsize=max_keepalive)
+        if not self.retry_read:
+            self.adapter.max_retries = self.adapter.max_retries.new(read=False)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        # (connect, read) seconds for `requests`. None means waiting forever
+        self.requests_timeout: Optional[Tuple[Optional[float], Optional[float]]] = self.timeout.map(
+            lambda x: (
+                x.connect_ms.map(lambda ms: ms / 1000).get(),
+                x.read_ms.map(lambda ms: ms / 1000).get(),
+            )
+        ).get()
+
+        self.semaphore: Optional[threading.BoundedSemaphore] = (
+            threading.BoundedSemaphore(max_connections) if max_connections else None
+        )
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        # Counts of pools which were already closed
+        self.closed_requests = 0
+        self.closed_connections = 0
+
+    def __getstate__(self) -> dict:
+        return {
+            "name": self.name,
+            "pool": self.pool,
+            "max_retries": self.max_retries,
+            "default_max_keepalive": self.default_max_keepalive,
+            "timeout": self.timeout,
+            "retry_read": self.retry_read,
+        }
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init()
+
+    def _connection_pools(self) -> list:
+        pools = self.adapter.poolmanager.pools
+        return [x for x in (pools.get(k) for k in pools.keys()) if x is not None]
+
+    def _expire_idle_connections(self):
+        idle_timeout: Optional[int] = self.pool.map(lambda x: x.idle_timeout_sec.get()).get()
+        if idle_timeout is None or self.in_flight > 0:
+            return
+        if time.monotonic() - self.last_used < idle_timeout:
+            return
+
+        logger.debug(f"Close idle connections of {self.name}")
+        for p in self._connection_pools():
+            self.closed_requests += p.num_requests
+            self.closed_connections += p.num_connections
+        self.adapter.poolmanager.clear()
+
+    def _enter(self):
+        with self.lock:
+            self._expire_idle_connections()
+            self.in_flight += 1
+
+    def _exit(self):
+        with self.lock:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    def to_requests_timeout(self, remaining_sec: Optional[float]):
+        """Both connect and read timeouts are capped at `remaining_sec` (budget of a trial or a run),
+        so that a hung access point never blocks beyond deadlines.
+        """
+        if remaining_sec is None:
+            return self.requests_timeout
+        # 0 is not allowed by `requests`
+        remaining = max(remaining_sec, MIN_TIMEOUT_SEC)
+        if self.requests_timeout is None:
+            return remaining
+        return tuple(remaining if x is None else min(x, remaining) for x in self.requests_timeout)
+
+    def request(self, method: str, url: str, remaining_sec: Optional[float] = None, **kwargs):
+        kwargs.setdefault("timeout", self.to_requests_timeout(remaining_sec))
+        if self.semaphore:
+            self.semaphore.acquire()
+        self._enter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            self._exit()
+            if self.semaphore:
+                self.semaphore.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> ConnectionStats:
+        with self.lock:
+            pools = self._connection_pools()
+            num_requests: int = self.closed_requests + sum(p.num_requests for p in pools)
+            num_connections: int = self.closed_connections + sum(p.num_connections for p in pools)
+
+        return ConnectionStats.from_dict(
+            {
+                "requests": num_requests,
+                "new_connections": num_connections,
+                "reuse_ratio": round(1 - num_connections / num_requests, 3)
+                if num_requests
+                else 0.0,
+            }
+        )
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,75 @@
+# -*- coding:utf-8 -*-
+
+"""Diff engine for parsed JSON (dict, list and scalars).
+
+It reports the same keys as DeepDiff 3.3.0 does for JSON, but emits jumeaux xpaths
+(ex. `root<'a'><0>`) directly instead of creating objects for every node.
+
+* changed: `type_changes` and `values_changed`
+* added: `dictionary_item_added` and `iterable_item_added`
+* removed: `dictionary_item_removed` and `iterable_item_removed`
+"""
+
+from typing import Any, List
+
+from jumeaux.models import DiffKeys
+
+
+def to_key_xpath(key: Any) -> str:
+    # Same as `to_jumeaux_xpath(DeepDiff path)`
+    if isinstance(key, str):
+        return "<'" + key.replace("[", "<").replace("]", ">") + "'>"
+    return f"<{key}>"
+
+
+def _diff(
+    one: Any, other: Any, path: str, changed: List[str], added: List[str], removed: List[str]
+):
+    if one is other:
+        return
+    if type(one) is not type(other):
+        changed.append(path)
+        return
+
+    if isinstance(one, dict):
+        for k, v in one.items():
+            if k not in other:
+                removed.append(path + to_key_xpath(k))
+                continue
+            w = other[k]
+            # Scalars are compared here to avoid calling functions for every leaf
+            if v.__class__ is w.__class__ and isinstance(v, (str, int, float)) or v is None:
+                if v != w:
+                    changed.append(path + to_key_xpath(k))
+            else:
+                _diff(v, w, path + to_key_xpath(k), changed, added, removed)
+        for k in other:
+            if k not in one:
+                added.append(path + to_key_xpath(k))
+        return
+
+    if isinstance(one, (list, tuple)):
+        len_one = len(one)
+        len_other = len(other)
+        for i in range(min(len_one, len_other)):
+            _diff(one[i], other[i], f"{path}<{i}>", changed, added, removed)
+        for i in range(len_other, len_one):
+            removed.append(f"{path}<{i}>")
+        for i in range(len_one, len_other):
+            added.append(f"{path}<{i}>")
+        return
+
+    if one != other:
+        changed.append(path)
+
+
+def diff(one: Any, other: Any) -> DiffKeys:
+    """Returns keys which differ between `one` and `other` as jumeaux xpaths in order."""
+    changed: List[str] = []
+    added: List[str] = []
+    removed: List[str] = []
+    _diff(one, other, "root", changed, added, removed)
+
+    return DiffKeys.from_dict(
+        {"added": sorted(added), "changed": sorted(changed), "removed": sorted(removed)}
+    )
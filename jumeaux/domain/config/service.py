@@ -106,6 +106,22 @@ def merge_args2config(args: MergedArgs, config: Config) -> Config:
             "output": config.output,
             "threads": args.threads.get_or(config.threads),
             "processes": args.processes if args.processes.get() else config.processes,
+            "start_method": config.start_method,
+            "engine": config.engine,
+            "max_in_flight": config.max_in_flight,
+            "window": config.window,
+            "schedule": config.schedule,
+            "record": config.record,
+            "dedup": config.dedup,
+            "adaptive": config.adaptive,
+            "abort": config.abort,
+            "deadline": config.deadline,
+            "diff_engine": config.diff_engine,
+            "profile_addons": args.profile_addons
+            if args.profile_addons.get()
+            else config.profile_addons,
+            "progress": config.progress,
+            "metrics": config.metrics,
             "max_retries": args.max_retries.get()
             if args.max_retries.get() is not None
             else config.max_retries,
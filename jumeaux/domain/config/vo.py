@@ -8,6 +8,35 @@ class NotifierType(OwlEnum):
     SLACK = "slack"
 
 
+class Engine(OwlEnum):
+    POOL = "pool"
+    ASYNCIO = "asyncio"
+    HYBRID = "hybrid"
+
+
+class StartMethod(OwlEnum):
+    """Start method of worker processes (`multiprocessing`)"""
+
+    FORK = "fork"
+    SPAWN = "spawn"
+    FORKSERVER = "forkserver"
+
+
+class DiffEngine(OwlEnum):
+    JUMEAUX = "jumeaux"
+    DEEPDIFF = "deepdiff"
+
+
+class RecordMode(OwlEnum):
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class ScheduleKey(OwlEnum):
+    PATH = "path"
+    NAME = "name"
+
+
 class QueryCustomization(OwlMixin):
     overwrite: TOption[TDict[TList[str]]]
     remove: TOption[TList[str]]
@@ -18,6 +47,23 @@ class PathReplace(OwlMixin):
     after: str
 
 
+class ConnectionPool(OwlMixin):
+    max_connections: TOption[int]
+    max_keepalive: TOption[int]
+    idle_timeout_sec: TOption[int]
+
+
+class RateLimit(OwlMixin):
+    qps: TOption[int]
+    burst: TOption[int]
+    max_in_flight: TOption[int]
+
+
+class Timeout(OwlMixin):
+    connect_ms: TOption[int]
+    read_ms: TOption[int]
+
+
 class AccessPoint(OwlMixin):
     name: str
     host: str
@@ -26,17 +72,89 @@ class AccessPoint(OwlMixin):
     proxy: TOption[str]
     default_response_encoding: TOption[str]
     headers: TDict[str] = {}
+    pool: TOption[ConnectionPool]
+    rate_limit: TOption[RateLimit]
+    timeout: TOption[Timeout]
 
 
 class OutputSummary(OwlMixin):
     response_dir: str
     encoding: str = "utf8"
     logger: TOption[any]
+    # Write trials to `trials.jsonl` one by one instead of holding them in a report
+    streaming: TOption[bool]
+    # Write spans of trials to `trace.json` (Chrome trace event format)
+    trace: TOption[bool]
+
+
+class AdaptiveConcurrency(OwlMixin):
+    min: int = 1
+    max: int
+    initial: TOption[int]
 
 
 class Concurrency(OwlMixin):
     threads: int
     processes: int
+    engine: TOption[Engine]
+    max_in_flight: TOption[int]
+    adaptive: TOption[AdaptiveConcurrency]
+
+
+class AbortThreshold(OwlMixin):
+    # Abort when the number of trials exceeds it
+    count: TOption[int]
+    # Abort when the ratio of trials exceeds it after `min_trials` trials
+    ratio: TOption[float]
+    min_trials: int = 0
+
+
+class AbortCondition(OwlMixin):
+    different: TOption[AbortThreshold]
+    failure: TOption[AbortThreshold]
+
+
+class Deadline(OwlMixin):
+    # Wall-clock budget of a trial including res2dict and diff
+    trial_ms: TOption[int]
+    # Challenges which are not finished by then are cancelled
+    run_sec: TOption[int]
+
+
+class Progress(OwlMixin):
+    # Seconds between reports
+    interval_sec: int = 10
+    # Throughput is measured over this sliding window
+    window_sec: int = 60
+    # JSON file overwritten with the latest progress
+    status_file: TOption[str]
+
+
+class Metrics(OwlMixin):
+    # OpenMetrics text file (ex. for a textfile collector of node_exporter)
+    path: str
+    # Seconds between writes
+    interval_sec: int = 60
+    # Labels added to all metrics
+    labels: TDict[str] = {}
+
+
+class Schedule(OwlMixin):
+    """Requests expected to be slow are challenged first"""
+
+    # report.json of a previous run
+    report: str
+    encoding: str = "utf8"
+    # Requests are matched to trials of the report by it (path if not specified)
+    by: TOption[ScheduleKey]
+
+
+class Record(OwlMixin):
+    """Responses of `one` are recorded to or replayed from a local store"""
+
+    # SQLite database file
+    path: str
+    mode: RecordMode
 
 
 class Notifier(OwlMixin):
@@ -61,7 +179,22 @@ class Config(OwlMixin):
     output: OutputSummary
     threads: int = 1
     processes: TOption[int]
+    start_method: TOption[StartMethod]
+    engine: TOption[Engine]
+    max_in_flight: TOption[int]
+    window: TOption[int]
+    schedule: TOption[Schedule]
+    record: TOption[Record]
+    # Challenge each unique request once and copy its trial to the repeated ones
+    dedup: TOption[bool]
+    adaptive: TOption[AdaptiveConcurrency]
     max_retries: int = 3
+    abort: TOption[AbortCondition]
+    deadline: TOption[Deadline]
+    diff_engine: TOption[DiffEngine]
+    profile_addons: TOption[bool]
+    progress: TOption[Progress]
+    metrics: TOption[Metrics]
     title: TOption[str]
     description: TOption[str]
     tags: TOption[TList[str]]
@@ -79,3 +212,4 @@ class MergedArgs(OwlMixin):
     threads: TOption[int]
     processes: TOption[int]
     max_retries: TOption[int]
+    profile_addons: TOption[bool]
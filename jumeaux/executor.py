@@ -1,48 +1,92 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
 import datetime
 import hashlib
 import io
+import json
+import multiprocessing
 import os
+import queue
 import re
+import shutil
 import sys
+import tempfile
+import threading
+import time
 import urllib.parse as urlparser
 from concurrent import futures
-from typing import Tuple, Optional, Any
+from collections import Counter
+from contextlib import contextmanager
+from typing import (
+    Tuple,
+    Optional,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+)
 
-import requests
 from deepdiff import DeepDiff
 from fn import _
 from owlmixin import TList, TOption, TDict
-from requests.adapters import HTTPAdapter
-from requests.exceptions import ConnectionError
+from owlmixin.transformers import traverse_dict
+from requests.exceptions import ConnectionError, Timeout
 
 # PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 # sys.path.append(PROJECT_ROOT)
 # sys.path.append(os.getcwd())
 from jumeaux import __version__
 from jumeaux.addons import AddOnExecutor
+from jumeaux.addons.models import Addons
 from jumeaux.addons.utils import to_jumeaux_xpath, mill_seconds_until, now
+from jumeaux.connection import PooledSession
+from jumeaux.limiter import ChallengeLimiter
 from jumeaux.domain.config.service import (
     create_config_from_report,
     create_config,
     merge_args2config,
 )
-from jumeaux.domain.config.vo import Config, MergedArgs
+from jumeaux.diff import diff
+from jumeaux.latency import StageTimer, StageLatencies
+from jumeaux.trace import TraceWriter, create_async_span
+from jumeaux import profiler as profilers
+from jumeaux.progress import ProgressReporter
+from jumeaux.window import InFlightWindow
+from jumeaux.record import RecordedSession
+from jumeaux import schedule as schedules
+from jumeaux.metrics import MetricsWriter
+from jumeaux.domain.config.vo import (
+    Config,
+    MergedArgs,
+    Engine,
+    AbortCondition,
+    DiffEngine,
+    RecordMode,
+)
 
 # XXX: ...
-from jumeaux.logger import Logger
+from jumeaux.logger import Logger, LogLevel, init_logger_by_level, root_log_level
+from jumeaux import trial_log as trial_logs
+from jumeaux.trial_log import TrialLog
 from jumeaux.models import (
     to_json,
     Report,
     Request,
     Response,
     ChallengeArg,
+    RawResponse,
     Trial,
+    FailureReason,
     Proxy,
     Summary,
     Concurrency,
+    RecordStats,
     Log2ReqsAddOnPayload,
     Reqs2ReqsAddOnPayload,
     Res2ResAddOnPayload,
@@ -66,6 +110,23 @@ from jumeaux.models import (
 logger: Logger = Logger(__name__)
 global_addon_executor: AddOnExecutor
 
+DEFAULT_MAX_IN_FLIGHT = 100
+# Each request in flight occupies a thread of the I/O thread pool, so threads are bounded by this
+MAX_IN_FLIGHT = 256
+# Default `window` is this times as many as challenges which can run at the same time
+DEFAULT_WINDOW_FACTOR = 2
+# Stages of a trial in order (milliseconds of them are aggregated into `Summary.latencies`)
+STAGES = [
+    "request_one",
+    "request_other",
+    "res2res",
+    "res2dict",
+    "diff",
+    "judgement",
+    "store_criterion",
+    "did_challenge",
+]
+
 START_JUMEAUX_AA = r"""
         ____  _             _         _
 __/\__ / ___|| |_ __ _ _ __| |_      | |_   _ _ __ ___   ___  __ _ _   ___  __ __/\__
@@ -131,35 +192,42 @@ def write_to_file(name, dir, body):
         f.write(body)
 
 
-def make_dir(path):
-    os.makedirs(path)
+def make_dir(path, exist_ok: bool = False):
+    os.makedirs(path, exist_ok=exist_ok)
     os.chmod(path, 0o777)
 
 
-def http_get(args: Tuple[Any, str, TDict[str], TOption[Proxy]]):
-    session, url, headers, proxies = args
-    try:
-        r = session.get(url, headers=headers, proxies=proxies.map(lambda x: x.to_dict()).get_or({}))
-    finally:
-        session.close()
-    return r
+def http_get(args: Tuple[Any, str, TDict[str], TOption[Proxy], Optional[float]]):
+    session, url, headers, proxies, remaining_sec = args
+    return session.get(
+        url,
+        headers=headers,
+        proxies=proxies.map(lambda x: x.to_dict()).get_or({}),
+        remaining_sec=remaining_sec,
+    )
 
 
 def http_post(
-    args: Tuple[Any, str, TOption[str], TOption[dict], TOption[dict], TDict[str], TOption[Proxy]]
+    args: Tuple[
+        Any,
+        str,
+        TOption[str],
+        TOption[dict],
+        TOption[dict],
+        TDict[str],
+        TOption[Proxy],
+        Optional[float],
+    ]
 ):
-    session, url, raw, form, json_, headers, proxies = args
-    try:
-        r = session.post(
-            url,
-            data=raw.get() or form.get(),
-            json=json_.get(),
-            headers=headers,
-            proxies=proxies.map(lambda x: x.to_dict()).get_or({}),
-        )
-    finally:
-        session.close()
-    return r
+    session, url, raw, form, json_, headers, proxies, remaining_sec = args
+    return session.post(
+        url,
+        data=raw.get() or form.get(),
+        json=json_.get(),
+        headers=headers,
+        proxies=proxies.map(lambda x: x.to_dict()).get_or({}),
+        remaining_sec=remaining_sec,
+    )
 
 
 def merge_headers(access_point_base: TDict[str], this_request: TDict[str]) -> TDict[str]:
@@ -170,9 +238,10 @@ def merge_headers(access_point_base: TDict[str], this_request: TDict[str]) -> TD
     )
 
 
-def concurrent_request(
-    session,
+def prepare_http_calls(
     *,
+    session_one,
+    session_other,
     headers: TDict[str],
     method: HttpMethod,
     raw: TOption[str],
@@ -184,40 +253,112 @@ def concurrent_request(
     headers_other: TDict[str],
     proxies_one: TOption[Proxy],
     proxies_other: TOption[Proxy],
-):
+    remaining_sec: Optional[float] = None,
+) -> Tuple[Callable, tuple, tuple]:
+    """:param remaining_sec: Read timeout of sessions whose `timeout` is not configured"""
     merged_header_one: TDict[str] = merge_headers(headers_one, headers)
     merged_header_other: TDict[str] = merge_headers(headers_other, headers)
     logger.debug(f"One   Request headers: {merged_header_one}")
     logger.debug(f"Other Request headers: {merged_header_other}")
 
-    with futures.ThreadPoolExecutor(max_workers=2) as ex:
-        if method is HttpMethod.GET:
-            res_one, res_other = ex.map(
-                http_get,
-                (
-                    (session, url_one, merged_header_one, proxies_one),
-                    (session, url_other, merged_header_other, proxies_other),
-                ),
-            )
-        elif method is HttpMethod.POST:
-            res_one, res_other = ex.map(
-                http_post,
-                (
-                    (session, url_one, raw, form, json_, merged_header_one, proxies_one),
-                    (session, url_other, raw, form, json_, merged_header_other, proxies_other),
-                ),
-            )
-        else:
-            # Unreachable
-            raise RuntimeError
+    if method is HttpMethod.GET:
+        return (
+            http_get,
+            (session_one, url_one, merged_header_one, proxies_one, remaining_sec),
+            (session_other, url_other, merged_header_other, proxies_other, remaining_sec),
+        )
+    if method is HttpMethod.POST:
+        return (
+            http_post,
+            (session_one, url_one, raw, form, json_, merged_header_one, proxies_one, remaining_sec),
+            (
+                session_other,
+                url_other,
+                raw,
+                form,
+                json_,
+                merged_header_other,
+                proxies_other,
+                remaining_sec,
+            ),
+        )
+
+    # Unreachable
+    raise RuntimeError
+
+
+def traced(http: Callable, name: str, timer: Optional[StageTimer]) -> Callable:
+    """`http` which records its span to `timer` in the thread which sends the request"""
+    if timer is None or timer.events is None:
+        return http
+
+    def call(args):
+        begin = time.perf_counter()
+        try:
+            return http(args)
+        finally:
+            timer.span(name, "http", begin, time.perf_counter(), url=args[1])
+
+    return call
+
+
+def run_in_daemon_thread(func: Callable, args) -> futures.Future:
+    """Unlike `ThreadPoolExecutor`, the thread is never joined even at the exit of the interpreter,
+    so a request which is left behind doesn't block the process.
+    """
+    future: futures.Future = futures.Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(func(args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def concurrent_request(
+    timeout_sec: Optional[float] = None, timer: Optional[StageTimer] = None, **kwargs
+):
+    """`futures.TimeoutError` is raised if responses are not returned in `timeout_sec`"""
+    http, args_one, args_other = prepare_http_calls(**kwargs)
+    # Requests over `timeout_sec` are left behind so as not to block the trial
+    f_one = run_in_daemon_thread(traced(http, "one", timer), args_one)
+    f_other = run_in_daemon_thread(traced(http, "other", timer), args_other)
+    deadline: Optional[float] = None if timeout_sec is None else time.monotonic() + timeout_sec
+    res_one = f_one.result(timeout=to_remaining_sec(deadline))
+    res_other = f_other.result(timeout=to_remaining_sec(deadline))
+
+    return res_one, res_other
+
+
+async def concurrent_request_async(
+    loop, io_thread_pool, timer: Optional[StageTimer] = None, **kwargs
+):
+    """Same as `concurrent_request` but requests are sent by the shared `io_thread_pool`
+    instead of creating threads each time. `requests` blocks, so each request still occupies
+    a thread of the pool while the coroutine waits for it.
+    """
+    http, args_one, args_other = prepare_http_calls(**kwargs)
+    res_one, res_other = await asyncio.gather(
+        loop.run_in_executor(io_thread_pool, traced(http, "one", timer), args_one),
+        loop.run_in_executor(io_thread_pool, traced(http, "other", timer), args_other),
+    )
 
     return res_one, res_other
 
 
-def res2res(res: Response, req: Request) -> Res2ResAddOnPayload:
-    return global_addon_executor.apply_res2res(
+def res2res(res: Response, req: Request) -> Tuple[Response, TList[str]]:
+    """:return: The response and its tags"""
+    # Payloads are not created for an empty layer since they are expensive on the hot path
+    if not global_addon_executor.res2res:
+        return res, TList()
+    payload: Res2ResAddOnPayload = global_addon_executor.apply_res2res(
         Res2ResAddOnPayload.from_dict({"response": res, "req": req, "tags": []})
     )
+    return payload.response, payload.tags
 
 
 def res2dict(res: Response) -> TOption[dict]:
@@ -226,39 +367,67 @@ def res2dict(res: Response) -> TOption[dict]:
     ).result
 
 
+class LazyRes2Dict:
+    """res2dict which runs only when the result is read at the first time.
+    Parsing is skipped unless a diff or an add-on needs the result.
+    """
+
+    def __init__(self, res: Response, log_prefix: str, title: str, timer: StageTimer) -> None:
+        self.res = res
+        self.log_prefix = log_prefix
+        self.title = title
+        self.timer = timer
+        self.result: Optional[TOption[DictOrList]] = None
+
+    def resolve(self) -> TOption[DictOrList]:
+        if self.result is None:
+            with self.timer.measure("res2dict") as lap:
+                self.result = res2dict(self.res)
+            logger.info_lv3(f"{self.log_prefix} ⏰ {self.title} res2dict:   {lap.ms}ms")
+        return self.result
+
+
 def judgement(
     r_one: Response,
     r_other: Response,
-    d_one: TOption[DictOrList],
-    d_other: TOption[DictOrList],
+    d_one: LazyRes2Dict,
+    d_other: LazyRes2Dict,
     name: str,
     path: str,
     qs: TDict[TList[str]],
     headers: TDict[str],
     diffs_by_cognition: Optional[TDict[DiffKeys]],
 ) -> Tuple[Status, TOption[TDict[DiffKeys]]]:
-    result: JudgementAddOnPayload = global_addon_executor.apply_judgement(
-        JudgementAddOnPayload.from_dict(
-            {
-                "diffs_by_cognition": diffs_by_cognition
-                and diffs_by_cognition.omit_by(lambda k, v: v.is_empty()),
-                "regard_as_same": r_one.body == r_other.body
-                if diffs_by_cognition is None
-                else diffs_by_cognition["unknown"].is_empty(),
-            }
-        ),
-        JudgementAddOnReference.from_dict(
-            {
-                "name": name,
-                "path": path,
-                "qs": qs,
-                "headers": headers,
-                "dict_one": d_one,
-                "dict_other": d_other,
-                "res_one": r_one,
-                "res_other": r_other,
-            }
-        ),
+    payload: JudgementAddOnPayload = JudgementAddOnPayload.from_dict(
+        {
+            "diffs_by_cognition": diffs_by_cognition
+            and diffs_by_cognition.omit_by(lambda k, v: v.is_empty()),
+            "regard_as_same": r_one.body == r_other.body
+            if diffs_by_cognition is None
+            else diffs_by_cognition["unknown"].is_empty(),
+        }
+    )
+    # Identical bodies without diffs are same in any judgement, so res2dict is not called for them
+    identical: bool = r_one.body == r_other.body and not payload.diffs_by_cognition.get()
+    # The reference requires res2dict results, so they are not created if no one reads them
+    result: JudgementAddOnPayload = (
+        global_addon_executor.apply_judgement(
+            payload,
+            JudgementAddOnReference.from_dict(
+                {
+                    "name": name,
+                    "path": path,
+                    "qs": qs,
+                    "headers": headers,
+                    "dict_one": d_one.resolve(),
+                    "dict_other": d_other.resolve(),
+                    "res_one": r_one,
+                    "res_other": r_other,
+                }
+            ),
+        )
+        if global_addon_executor.judgement and not identical
+        else payload
     )
 
     status: Status = Status.SAME if result.regard_as_same else Status.DIFFERENT  # type: ignore # Prevent for enum problem
@@ -267,6 +436,8 @@ def judgement(
 
 
 def store_criterion(status: Status, name: str, req: Request, r_one: Response, r_other: Response):
+    if not global_addon_executor.store_criterion:
+        return False
     return global_addon_executor.apply_store_criterion(
         StoreCriterionAddOnPayload.from_dict({"stored": False}),
         StoreCriterionAddOnReference.from_dict(
@@ -281,6 +452,8 @@ def store_criterion(status: Status, name: str, req: Request, r_one: Response, r_
 
 
 def dump(res: Response):
+    if not global_addon_executor.dump:
+        return res.body
     return global_addon_executor.apply_dump(
         DumpAddOnPayload.from_dict({"response": res, "body": res.body, "encoding": res.encoding})
     ).body
@@ -322,21 +495,11 @@ def create_query_string(
     return urlparser.urlencode(removed, doseq=True, encoding=encoding)
 
 
-def challenge(arg_dict: dict) -> dict:
-    """
-    [[[ WARNING !!!!! ]]]
-    `arg_dict` is dict like `ChallengeArg` because HttpMethod(OwlEnum) can't be pickled.
-    Return value is dict like `Trial` because Status(OwlEnum) can't be pickled.
-    """
-    arg: ChallengeArg = ChallengeArg.from_dict(arg_dict)
-
-    name: str = arg.req.name.get_or(str(arg.seq))
-    log_prefix = f"[{arg.seq} / {arg.number_of_request}]"
+def to_log_prefix(arg: ChallengeArg) -> str:
+    return f"[{arg.seq} / {arg.number_of_request}]"
 
-    logger.info_lv3(f"{log_prefix} {'-'*80}")
-    logger.info_lv3(f"{log_prefix}  {arg.seq}. {arg.req.name.get_or(arg.req.path)}")
-    logger.info_lv3(f"{log_prefix} {'-'*80}")
 
+def create_urls(arg: ChallengeArg) -> Tuple[str, str]:
     path_str_one = arg.path_one.map(lambda x: re.sub(x.before, x.after, arg.req.path)).get_or(
         arg.req.path
     )
@@ -345,303 +508,1083 @@ def challenge(arg_dict: dict) -> dict:
     )
     qs_str_one = create_query_string(arg.req.qs, arg.query_one, arg.req.url_encoding)
     qs_str_other = create_query_string(arg.req.qs, arg.query_other, arg.req.url_encoding)
-    url_one = f"{arg.host_one}{path_str_one}?{qs_str_one}"
-    url_other = f"{arg.host_other}{path_str_other}?{qs_str_other}"
 
-    # Get two responses
-    req_time = now()
-    try:
-        logger.info_lv3(f"{log_prefix} One   URL:   {url_one}")
-        logger.debug(f"{log_prefix} One   PROXY: {arg.proxy_one.map(lambda x: x.to_dict()).get()}")
+    return (
+        f"{arg.host_one}{path_str_one}?{qs_str_one}",
+        f"{arg.host_other}{path_str_other}?{qs_str_other}",
+    )
 
-        logger.info_lv3(f"{log_prefix} Other URL:   {url_other}")
-        logger.debug(
-            f"{log_prefix} Other PROXY: {arg.proxy_other.map(lambda x: x.to_dict()).get()}"
-        )
 
-        if arg.req.headers:
-            logger.info_lv3(f"{log_prefix} Additional headers:   {arg.req.headers}")
-        if arg.req.raw.any():
-            logger.info_lv3(f"{log_prefix} raw:   {arg.req.raw.get()}")
-        if arg.req.form.any():
-            logger.info_lv3(f"{log_prefix} form:   {arg.req.form.get()}")
-        if arg.req.json.any():
-            logger.info_lv3(f"{log_prefix} json:   {arg.req.json.get()}")
+def to_request_kwargs(
+    arg: ChallengeArg, url_one: str, url_other: str, remaining_sec: Optional[float] = None
+) -> dict:
+    return {
+        "session_one": arg.session_one,
+        "session_other": arg.session_other,
+        "headers": arg.req.headers,
+        "method": arg.req.method,
+        "raw": arg.req.raw,
+        "form": arg.req.form,
+        "json_": arg.req.json,
+        "url_one": url_one,
+        "url_other": url_other,
+        "headers_one": arg.headers_one,
+        "headers_other": arg.headers_other,
+        "proxies_one": arg.proxy_one,
+        "proxies_other": arg.proxy_other,
+        "remaining_sec": remaining_sec,
+    }
 
-        r_one, r_other = concurrent_request(
-            arg.session,
-            headers=arg.req.headers,
-            method=arg.req.method,
-            raw=arg.req.raw,
-            form=arg.req.form,
-            json_=arg.req.json,
-            url_one=url_one,
-            url_other=url_other,
-            headers_one=arg.headers_one,
-            headers_other=arg.headers_other,
-            proxies_one=arg.proxy_one,
-            proxies_other=arg.proxy_other,
-        )
 
-        logger.info_lv3(
-            f"{log_prefix} One:   {r_one.status_code} / {to_sec(r_one.elapsed)}s / {len(r_one.content)}b / {r_one.headers.get('content-type')}"  # noqa
-        )
-        logger.info_lv3(
-            f"{log_prefix} Other: {r_other.status_code} / {to_sec(r_other.elapsed)}s / {len(r_other.content)}b / {r_other.headers.get('content-type')}"  # noqa
-        )
-    except ConnectionError:
-        logger.info_lv1(f"{log_prefix} 💀 {arg.req.name.get()}")
-        # TODO: Integrate logic into create_trial
-        return Trial.from_dict(
-            {
-                "seq": arg.seq,
-                "name": name,
-                "tags": [],
-                "request_time": req_time.isoformat(),
-                "status": "failure",
-                "method": arg.req.method,
-                "path": arg.req.path,
-                "queries": arg.req.qs,
-                "raw": arg.req.raw,
-                "form": arg.req.form,
-                "json": arg.req.json,
-                "headers": arg.req.headers,
-                "one": {"url": url_one, "type": "unknown"},
-                "other": {"url": url_other, "type": "unknown"},
-            }
-        ).to_dict()
+def log_before_request(arg: ChallengeArg, url_one: str, url_other: str):
+    log_prefix = to_log_prefix(arg)
 
-    res2res_one_begin = now()
-    res_one_payload: Res2ResAddOnPayload = res2res(
-        Response.from_requests(r_one, arg.default_response_encoding_one), arg.req
-    )
-    res_one = res_one_payload.response
-    logger.info_lv3(f"{log_prefix} ⏰ One   res2res:   {mill_seconds_until(res2res_one_begin)}ms")
+    logger.info_lv3(f"{log_prefix} {'-'*80}")
+    logger.info_lv3(f"{log_prefix}  {arg.seq}. {arg.req.name.get_or(arg.req.path)}")
+    logger.info_lv3(f"{log_prefix} {'-'*80}")
 
-    res2res_other_begin = now()
-    res_other_payload: Res2ResAddOnPayload = res2res(
-        Response.from_requests(r_other, arg.default_response_encoding_other), arg.req
+    logger.info_lv3(f"{log_prefix} One   URL:   {url_one}")
+    logger.debug(f"{log_prefix} One   PROXY: {arg.proxy_one.map(lambda x: x.to_dict()).get()}")
+
+    logger.info_lv3(f"{log_prefix} Other URL:   {url_other}")
+    logger.debug(f"{log_prefix} Other PROXY: {arg.proxy_other.map(lambda x: x.to_dict()).get()}")
+
+    if arg.req.headers:
+        logger.info_lv3(f"{log_prefix} Additional headers:   {arg.req.headers}")
+    if arg.req.raw.any():
+        logger.info_lv3(f"{log_prefix} raw:   {arg.req.raw.get()}")
+    if arg.req.form.any():
+        logger.info_lv3(f"{log_prefix} form:   {arg.req.form.get()}")
+    if arg.req.json.any():
+        logger.info_lv3(f"{log_prefix} json:   {arg.req.json.get()}")
+
+
+def log_after_request(arg: ChallengeArg, r_one, r_other):
+    log_prefix = to_log_prefix(arg)
+    logger.info_lv3(
+        f"{log_prefix} One:   {r_one.status_code} / {to_sec(r_one.elapsed)}s / {len(r_one.content)}b / {r_one.headers.get('content-type')}"  # noqa
     )
-    res_other = res_other_payload.response
     logger.info_lv3(
-        f"{log_prefix} ⏰ Other   res2res:   {mill_seconds_until(res2res_other_begin)}ms"
+        f"{log_prefix} Other: {r_other.status_code} / {to_sec(r_other.elapsed)}s / {len(r_other.content)}b / {r_other.headers.get('content-type')}"  # noqa
     )
 
-    res2dict_one_begin = now()
-    dict_one: TOption[DictOrList] = res2dict(res_one)
-    logger.info_lv3(f"{log_prefix} ⏰ One   res2dict:   {mill_seconds_until(res2dict_one_begin)}ms")
 
-    res2dict_other_begin = now()
-    dict_other: TOption[DictOrList] = res2dict(res_other)
-    logger.info_lv3(
-        f"{log_prefix} ⏰ Other   res2dict:   {mill_seconds_until(res2dict_other_begin)}ms"
+class TrialTimeoutError(Exception):
+    """Raised when a trial runs out of `deadline.trial_ms`"""
+
+
+def to_remaining_sec(deadline: Optional[float]) -> Optional[float]:
+    """`deadline` is a value of `time.monotonic()`. None means no deadline."""
+    return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+
+def to_trial_deadline(arg: ChallengeArg, begin: float) -> Optional[float]:
+    return arg.trial_timeout_ms.map(lambda x: begin + x / 1000).get()
+
+
+def to_request_deadline(arg: ChallengeArg, begin: float) -> Optional[float]:
+    """The earlier of deadlines of the trial and the run"""
+    deadlines = [
+        x for x in (to_trial_deadline(arg, begin), arg.run_deadline.get()) if x is not None
+    ]
+    return min(deadlines) if deadlines else None
+
+
+def to_timeout_reason(request_deadline: Optional[float]) -> FailureReason:
+    """Requests without `timeout` time out at `request_deadline`"""
+    if request_deadline is not None and to_remaining_sec(request_deadline) == 0:
+        return FailureReason.TRIAL_TIMEOUT  # type: ignore # Prevent for enum problem
+    return FailureReason.TIMEOUT  # type: ignore # Prevent for enum problem
+
+
+def check_trial_deadline(arg: ChallengeArg, begin: float, stage: str):
+    deadline: Optional[float] = to_trial_deadline(arg, begin)
+    if deadline is not None and time.monotonic() > deadline:
+        raise TrialTimeoutError(f"Over {arg.trial_timeout_ms.get()}ms before {stage}")
+
+
+def to_response_summary(
+    url: str,
+    res: Optional[Response] = None,
+    file: Optional[str] = None,
+    prop_file: Optional[str] = None,
+) -> dict:
+    """:return: dict like `ResponseSummary`. `type` is unknown if `res` is None"""
+    if res is None:
+        return {"url": url, "type": "unknown"}
+    return traverse_dict(
+        {
+            "url": url,
+            "type": res.type,
+            "status_code": res.status_code,
+            "byte": res.byte,
+            "response_sec": res.elapsed_sec,
+            "content_type": res.content_type,
+            "mime_type": res.mime_type,
+            "encoding": res.encoding,
+            "file": file,
+            "prop_file": prop_file,
+        },
+        ignore_none=True,
+        force_value=True,
     )
 
-    # Create diff
-    # Either dict_one or dic_other is None, it means that it can't be analyzed, therefore return None
-    diff_diagnosis_begin = now()
-    ddiff = (
-        None
-        if dict_one.is_none() or dict_other.is_none()
-        else {}
-        if res_one.body == res_other.body
-        else DeepDiff(dict_one.get(), dict_other.get())
+
+def create_trial(
+    arg: ChallengeArg,
+    name: str,
+    tags: List[str],
+    req_time: datetime.datetime,
+    status: Status,
+    one: dict,
+    other: dict,
+    failure_reason: Optional[FailureReason] = None,
+    diffs_by_cognition: Optional[TDict[DiffKeys]] = None,
+) -> dict:
+    """Same as `Trial.from_dict({...}).to_dict()` without slow validations on the hot path.
+
+    :param one: dict like `ResponseSummary`
+    :param other: dict like `ResponseSummary`
+    :return: dict like `Trial`
+    """
+    return traverse_dict(
+        {
+            "seq": arg.seq,
+            "name": name,
+            "tags": tags,
+            "headers": arg.req.headers,
+            "queries": arg.req.qs,
+            "raw": arg.req.raw,
+            "form": arg.req.form,
+            "json": arg.req.json,
+            "one": one,
+            "other": other,
+            "method": arg.req.method,
+            "path": arg.req.path,
+            "request_time": req_time.isoformat(),
+            "status": status,
+            "failure_reason": failure_reason,
+            "diffs_by_cognition": diffs_by_cognition,
+        },
+        ignore_none=True,
+        force_value=True,
     )
-    logger.info_lv3(
-        f"{log_prefix} ⏰ Diff diagnosis:   {mill_seconds_until(diff_diagnosis_begin)}ms"
+
+
+def create_failure_trial(
+    arg: ChallengeArg,
+    req_time: datetime.datetime,
+    url_one: str,
+    url_other: str,
+    reason: FailureReason,
+) -> dict:
+    logger.info_lv1(f"{to_log_prefix(arg)} 💀 {arg.req.name.get()} ({reason.value})")
+    return create_trial(
+        arg,
+        arg.req.name.get_or(str(arg.seq)),
+        [],
+        req_time,
+        Status.FAILURE,  # type: ignore # Prevent for enum problem
+        to_response_summary(url_one),
+        to_response_summary(url_other),
+        failure_reason=reason,
     )
 
-    initial_diffs_by_cognition: Optional[TDict[DiffKeys]] = TDict(
-        {
-            "unknown": DiffKeys.from_dict(
-                {
-                    "changed": TList(
-                        ddiff.get("type_changes", {}).keys()
-                        | ddiff.get("values_changed", {}).keys()
-                    )
-                    .map(to_jumeaux_xpath)
-                    .order_by(_),
-                    "added": TList(
-                        ddiff.get("dictionary_item_added", {})
-                        | ddiff.get("iterable_item_added", {}).keys()
+
+def challenge(arg: ChallengeArg) -> dict:
+    """
+    [[[ WARNING !!!!! ]]]
+    Return value is dict like `Trial` because Status(OwlEnum) can't be pickled.
+    """
+    return challenge_with_stages(arg)[0]
+
+
+def add_trial_span(timer: StageTimer, trial: dict, begin: float) -> StageTimer:
+    if timer.events is not None:
+        timer.events.extend(
+            create_async_span(
+                trial["name"],
+                "trial",
+                trial["seq"],
+                begin,
+                time.perf_counter(),
+                seq=trial["seq"],
+                status=trial["status"],
+            )
+        )
+    return timer
+
+
+def challenge_with_stages(arg: ChallengeArg, cpu_executor=None) -> Tuple[dict, StageTimer]:
+    """Same as `challenge` but also returns the timer of stages.
+    No stages are measured for failure trials.
+
+    :param cpu_executor: Process pool where CPU-bound stages run (only the hybrid engine)
+    """
+    if arg.profile_dir.get():
+        profilers.profile_worker(arg.profile_dir.get())
+    timer = StageTimer(arg.trace)
+    trace_begin = time.perf_counter()
+    trial, timer = _challenge(arg, timer, cpu_executor)
+    return trial, add_trial_span(timer, trial, trace_begin)
+
+
+def _challenge(arg: ChallengeArg, timer: StageTimer, cpu_executor=None) -> Tuple[dict, StageTimer]:
+    url_one, url_other = create_urls(arg)
+
+    # Get two responses
+    req_time = now()
+    begin = time.monotonic()
+    request_deadline: Optional[float] = to_request_deadline(arg, begin)
+    try:
+        log_before_request(arg, url_one, url_other)
+        r_one, r_other = concurrent_request(
+            timeout_sec=to_remaining_sec(to_trial_deadline(arg, begin)),
+            timer=timer,
+            **to_request_kwargs(arg, url_one, url_other, to_remaining_sec(request_deadline)),
+        )
+        log_after_request(arg, r_one, r_other)
+    except Timeout:
+        return (
+            create_failure_trial(
+                arg, req_time, url_one, url_other, to_timeout_reason(request_deadline)
+            ),
+            timer,
+        )
+    except ConnectionError:
+        return (
+            create_failure_trial(
+                arg,
+                req_time,
+                url_one,
+                url_other,
+                FailureReason.CONNECTION_ERROR,  # type: ignore # Prevent for enum problem
+            ),
+            timer,
+        )
+    except futures.TimeoutError:
+        return (
+            create_failure_trial(
+                arg,
+                req_time,
+                url_one,
+                url_other,
+                FailureReason.TRIAL_TIMEOUT,  # type: ignore # Prevent for enum problem
+            ),
+            timer,
+        )
+
+    try:
+        return (
+            judge_responses_in_process(cpu_executor, arg, r_one, r_other, req_time, begin, timer)
+            if cpu_executor
+            else judge_responses(arg, r_one, r_other, req_time, begin, timer)
+        )
+    except TrialTimeoutError as e:
+        logger.info_lv1(f"{to_log_prefix(arg)} {e}")
+        # Stages of failure trials are not aggregated
+        timer.elapsed_ms.clear()
+        return (
+            create_failure_trial(
+                arg,
+                req_time,
+                url_one,
+                url_other,
+                FailureReason.TRIAL_TIMEOUT,  # type: ignore # Prevent for enum problem
+            ),
+            timer,
+        )
+
+
+async def challenge_async(
+    arg: ChallengeArg,
+    *,
+    loop,
+    semaphore: asyncio.Semaphore,
+    in_flight: asyncio.Condition,
+    limiter: ChallengeLimiter,
+    io_thread_pool,
+    cpu_executor,
+    in_worker: bool = False,
+) -> Tuple[dict, StageTimer]:
+    """Same as `challenge_with_stages` but only waits for responses in the event loop.
+    CPU-bound stages after getting responses run in `cpu_executor`.
+    If `in_worker` is True, `cpu_executor` is a process pool initialized by `init_worker`.
+    """
+    async with semaphore:
+        async with in_flight:
+            await in_flight.wait_for(limiter.try_acquire)
+
+        trial: Optional[dict] = None
+        try:
+            wait_sec = limiter.reserve()
+            if wait_sec > 0:
+                await asyncio.sleep(wait_sec)
+
+            url_one, url_other = create_urls(arg)
+            timer = StageTimer(arg.trace)
+            trace_begin = time.perf_counter()
+
+            req_time = now()
+            begin = time.monotonic()
+            request_deadline: Optional[float] = to_request_deadline(arg, begin)
+            try:
+                log_before_request(arg, url_one, url_other)
+                r_one, r_other = await asyncio.wait_for(
+                    concurrent_request_async(
+                        loop,
+                        io_thread_pool,
+                        timer,
+                        **to_request_kwargs(
+                            arg, url_one, url_other, to_remaining_sec(request_deadline)
+                        ),
+                    ),
+                    to_remaining_sec(to_trial_deadline(arg, begin)),
+                )
+                log_after_request(arg, r_one, r_other)
+            except Timeout:
+                trial = create_failure_trial(
+                    arg, req_time, url_one, url_other, to_timeout_reason(request_deadline)
+                )
+                return trial, add_trial_span(timer, trial, trace_begin)
+            except ConnectionError:
+                trial = create_failure_trial(
+                    arg,
+                    req_time,
+                    url_one,
+                    url_other,
+                    FailureReason.CONNECTION_ERROR,  # type: ignore # Prevent for enum problem
+                )
+                return trial, add_trial_span(timer, trial, trace_begin)
+            except asyncio.TimeoutError:
+                trial = create_failure_trial(
+                    arg,
+                    req_time,
+                    url_one,
+                    url_other,
+                    FailureReason.TRIAL_TIMEOUT,  # type: ignore # Prevent for enum problem
+                )
+                return trial, add_trial_span(timer, trial, trace_begin)
+
+            try:
+                # `timer` is copied if `cpu_executor` is a process pool, so the returned one is used
+                trial, timer = await (
+                    loop.run_in_executor(
+                        cpu_executor,
+                        judge_responses_in_worker,
+                        *to_worker_task(arg),
+                        RawResponse.from_requests(r_one),
+                        RawResponse.from_requests(r_other),
+                        req_time,
+                        begin,
+                        timer,
                     )
-                    .map(to_jumeaux_xpath)
-                    .order_by(_),
-                    "removed": TList(
-                        ddiff.get("dictionary_item_removed", {})
-                        | ddiff.get("iterable_item_removed", {}).keys()
+                    if in_worker
+                    else loop.run_in_executor(
+                        cpu_executor, judge_responses, arg, r_one, r_other, req_time, begin, timer
                     )
-                    .map(to_jumeaux_xpath)
-                    .order_by(_),
-                }
+                )
+            except TrialTimeoutError as e:
+                logger.info_lv1(f"{to_log_prefix(arg)} {e}")
+                # Stages of failure trials are not aggregated
+                timer.elapsed_ms.clear()
+                trial = create_failure_trial(
+                    arg,
+                    req_time,
+                    url_one,
+                    url_other,
+                    FailureReason.TRIAL_TIMEOUT,  # type: ignore # Prevent for enum problem
+                )
+            return trial, add_trial_span(timer, trial, trace_begin)
+        finally:
+            limiter.release(trial)
+            async with in_flight:
+                in_flight.notify_all()
+
+
+def create_diff_keys(one: DictOrList, other: DictOrList, engine: DiffEngine) -> DiffKeys:
+    if engine is DiffEngine.JUMEAUX:
+        return diff(one, other)
+
+    ddiff = DeepDiff(one, other)
+    return DiffKeys.from_dict(
+        {
+            "changed": TList(
+                ddiff.get("type_changes", {}).keys() | ddiff.get("values_changed", {}).keys()
+            )
+            .map(to_jumeaux_xpath)
+            .order_by(_),
+            "added": TList(
+                ddiff.get("dictionary_item_added", {})
+                | ddiff.get("iterable_item_added", {}).keys()
+            )
+            .map(to_jumeaux_xpath)
+            .order_by(_),
+            "removed": TList(
+                ddiff.get("dictionary_item_removed", {})
+                | ddiff.get("iterable_item_removed", {}).keys()
             )
+            .map(to_jumeaux_xpath)
+            .order_by(_),
         }
-    ) if ddiff is not None else None
+    )
+
+
+def judge_responses(
+    arg: ChallengeArg,
+    r_one,
+    r_other,
+    req_time: datetime.datetime,
+    begin: float,
+    timer: Optional[StageTimer] = None,
+) -> Tuple[dict, StageTimer]:
+    """
+    [[[ WARNING !!!!! ]]]
+    Return value is dict like `Trial` because Status(OwlEnum) can't be pickled,
+    and `timer` which measured stages.
+
+    `begin` is `time.monotonic()` when the trial began.
+    `TrialTimeoutError` is raised between stages if the trial runs out of `trial_timeout_ms`.
+    """
+    name: str = arg.req.name.get_or(str(arg.seq))
+    log_prefix = to_log_prefix(arg)
+    # Workers of `cpu_executor` in the asyncio engine
+    if arg.profile_dir.get():
+        profilers.profile_worker(arg.profile_dir.get())
+
+    timer = timer or StageTimer(arg.trace)
+    timer.add("request_one", r_one.elapsed.total_seconds() * 1000)
+    timer.add("request_other", r_other.elapsed.total_seconds() * 1000)
+
+    with timer.measure("res2res") as lap:
+        res_one, tags_one = res2res(
+            Response.from_requests(r_one, arg.default_response_encoding_one), arg.req
+        )
+    logger.info_lv3(f"{log_prefix} ⏰ One   res2res:   {lap.ms}ms")
+
+    with timer.measure("res2res") as lap:
+        res_other, tags_other = res2res(
+            Response.from_requests(r_other, arg.default_response_encoding_other), arg.req
+        )
+    logger.info_lv3(f"{log_prefix} ⏰ Other   res2res:   {lap.ms}ms")
+
+    dict_one = LazyRes2Dict(res_one, log_prefix, "One  ", timer)
+    dict_other = LazyRes2Dict(res_other, log_prefix, "Other", timer)
+
+    check_trial_deadline(arg, begin, "diff")
+
+    # Create diff
+    # Byte-identical bodies have no diffs, so they are neither parsed nor compared.
+    # Either dict_one or dic_other is None, it means that it can't be analyzed, therefore return None
+    with timer.measure("diff") as lap:
+        diff_keys: Optional[DiffKeys] = (
+            DiffKeys.empty()
+            if res_one.body == res_other.body
+            else None
+            if dict_one.resolve().is_none() or dict_other.resolve().is_none()
+            else create_diff_keys(
+                dict_one.resolve().get(), dict_other.resolve().get(), arg.diff_engine
+            )
+        )
+    logger.info_lv3(f"{log_prefix} ⏰ Diff diagnosis:   {lap.ms}ms")
+
+    initial_diffs_by_cognition: Optional[TDict[DiffKeys]] = (
+        TDict({"unknown": diff_keys}) if diff_keys is not None else None
+    )
 
     # Judgement
-    judgement_begin = now()
-    status, diffs_by_cognition = judgement(
-        res_one,
-        res_other,
-        dict_one,
-        dict_other,
-        name,
-        arg.req.path,
-        arg.req.qs,
-        arg.req.headers,
-        initial_diffs_by_cognition,
-    )
-    logger.info_lv3(f"{log_prefix} ⏰ Judgement:   {mill_seconds_until(judgement_begin)}ms")
+    with timer.measure("judgement") as lap:
+        status, diffs_by_cognition = judgement(
+            res_one,
+            res_other,
+            dict_one,
+            dict_other,
+            name,
+            arg.req.path,
+            arg.req.qs,
+            arg.req.headers,
+            initial_diffs_by_cognition,
+        )
+    logger.info_lv3(f"{log_prefix} ⏰ Judgement:   {lap.ms}ms")
 
     status_symbol = "O" if status == Status.SAME else "X"
     log_msg = f"{log_prefix} {status_symbol} ({res_one.status_code} - {res_other.status_code}) <{res_one.elapsed_sec}s - {res_other.elapsed_sec}s> {{{arg.req.method}}} {arg.req.name.get_or(arg.req.path)}"  # noqa
     (logger.info_lv2 if status == Status.SAME else logger.info_lv1)(log_msg)
 
+    check_trial_deadline(arg, begin, "store criterion")
+
     # Store files
-    store_criterion_begin = now()
-    file_one: Optional[str] = None
-    file_other: Optional[str] = None
-    prop_file_one: Optional[str] = None
-    prop_file_other: Optional[str] = None
-    if store_criterion(status, name, arg.req, res_one, res_other):
-        dir = f"{arg.res_dir}/{arg.key}"
-        file_one = f"one/({arg.seq}){name}"
-        file_other = f"other/({arg.seq}){name}"
-        write_to_file(file_one, dir, dump(res_one))
-        write_to_file(file_other, dir, dump(res_other))
-        if not dict_one.is_none():
-            prop_file_one = f"one-props/({arg.seq}){name}.json"
-            write_to_file(
-                prop_file_one, dir, to_json(dict_one.get()).encode("utf-8", errors="replace")
-            )
-        if not dict_other.is_none():
-            prop_file_other = f"other-props/({arg.seq}){name}.json"
-            write_to_file(
-                prop_file_other, dir, to_json(dict_other.get()).encode("utf-8", errors="replace")
-            )
-    logger.info_lv3(
-        f"{log_prefix} ⏰ Store criterion:   {mill_seconds_until(store_criterion_begin)}ms"
-    )
+    with timer.measure("store_criterion") as lap:
+        file_one: Optional[str] = None
+        file_other: Optional[str] = None
+        prop_file_one: Optional[str] = None
+        prop_file_other: Optional[str] = None
+        if store_criterion(status, name, arg.req, res_one, res_other):
+            dir = f"{arg.res_dir}/{arg.key}"
+            file_one = f"one/({arg.seq}){name}"
+            file_other = f"other/({arg.seq}){name}"
+            write_to_file(file_one, dir, dump(res_one))
+            write_to_file(file_other, dir, dump(res_other))
+            if not dict_one.resolve().is_none():
+                prop_file_one = f"one-props/({arg.seq}){name}.json"
+                write_to_file(
+                    prop_file_one,
+                    dir,
+                    to_json(dict_one.resolve().get()).encode("utf-8", errors="replace"),
+                )
+            if not dict_other.resolve().is_none():
+                prop_file_other = f"other-props/({arg.seq}){name}.json"
+                write_to_file(
+                    prop_file_other,
+                    dir,
+                    to_json(dict_other.resolve().get()).encode("utf-8", errors="replace"),
+                )
+    logger.info_lv3(f"{log_prefix} ⏰ Store criterion:   {lap.ms}ms")
 
     # Did challenge
-    did_challenge_begin = now()
-    payload = global_addon_executor.apply_did_challenge(
-        DidChallengeAddOnPayload.from_dict(
-            {
-                "trial": Trial.from_dict(
+    with timer.measure("did_challenge") as lap:
+        trial: dict = create_trial(
+            arg,
+            name,
+            tags_one.concat(tags_other).uniq(),  # TODO: tags created by reqs2reqs
+            req_time,
+            status,
+            to_response_summary(res_one.url, res_one, file_one, prop_file_one),
+            to_response_summary(res_other.url, res_other, file_other, prop_file_other),
+            diffs_by_cognition=diffs_by_cognition.get(),
+        )
+        # The payload and the reference are created only if someone reads them
+        if global_addon_executor.did_challenge:
+            trial = global_addon_executor.apply_did_challenge(
+                DidChallengeAddOnPayload.from_dict({"trial": Trial.from_dict(trial)}),
+                DidChallengeAddOnReference.from_dict(
                     {
-                        "seq": arg.seq,
-                        "name": name,
-                        "tags": res_one_payload.tags.concat(
-                            res_other_payload.tags
-                        ).uniq(),  # TODO: tags created by reqs2reqs
-                        "request_time": req_time.isoformat(),
-                        "status": status,
-                        "method": arg.req.method,
-                        "path": arg.req.path,
-                        "queries": arg.req.qs,
-                        "raw": arg.req.raw,
-                        "form": arg.req.form,
-                        "json": arg.req.json,
-                        "headers": arg.req.headers,
-                        "diffs_by_cognition": diffs_by_cognition,
-                        "one": {
-                            "url": res_one.url,
-                            "type": res_one.type,
-                            "status_code": res_one.status_code,
-                            "byte": res_one.byte,
-                            "response_sec": res_one.elapsed_sec,
-                            "content_type": res_one.content_type,
-                            "mime_type": res_one.mime_type,
-                            "encoding": res_one.encoding,
-                            "file": file_one,
-                            "prop_file": prop_file_one,
-                        },
-                        "other": {
-                            "url": res_other.url,
-                            "type": res_other.type,
-                            "status_code": res_other.status_code,
-                            "byte": res_other.byte,
-                            "response_sec": res_other.elapsed_sec,
-                            "content_type": res_other.content_type,
-                            "mime_type": res_other.mime_type,
-                            "encoding": res_other.encoding,
-                            "file": file_other,
-                            "prop_file": prop_file_other,
-                        },
+                        "res_one": res_one,
+                        "res_other": res_other,
+                        "res_one_props": dict_one.resolve(),
+                        "res_other_props": dict_other.resolve(),
                     }
-                )
-            }
-        ),
-        DidChallengeAddOnReference.from_dict(
-            {
-                "res_one": res_one,
-                "res_other": res_other,
-                "res_one_props": dict_one,
-                "res_other_props": dict_other,
-            }
-        ),
+                ),
+            ).trial.to_dict()
+    logger.info_lv3(f"{log_prefix} ⏰ Did challenge:   {lap.ms}ms")
+
+    return trial, timer
+
+
+# Common properties of all challenges in a worker process (only with `processes`)
+worker_template: Optional[ChallengeArg] = None
+
+
+def init_worker(addons: Addons, profile_addons: bool, log_level: LogLevel, template: ChallengeArg):
+    """Initializer of a worker process.
+    Add-ons and connection pools (sessions in `template`) are created only once per worker,
+    so that it works even if the worker is not forked (ex. `spawn`).
+    """
+    global global_addon_executor, worker_template
+    init_logger_by_level(log_level)
+    global_addon_executor = AddOnExecutor(addons, profile_addons)
+    worker_template = template
+
+
+def to_worker_task(arg: ChallengeArg) -> Tuple[int, Request]:
+    """Only properties which differ between challenges are sent to a worker process"""
+    return arg.seq, arg.req
+
+
+def from_worker_task(seq: int, req: Request) -> ChallengeArg:
+    if worker_template is None:
+        raise RuntimeError("The worker process is not initialized by init_worker")
+    return worker_template.replace(seq=seq, req=req)
+
+
+def challenge_in_worker(seq: int, req: Request) -> Tuple[dict, StageTimer]:
+    """`challenge_with_stages` in a worker process initialized by `init_worker`"""
+    return challenge_with_stages(from_worker_task(seq, req))
+
+
+def judge_responses_in_worker(seq: int, req: Request, *args) -> Tuple[dict, StageTimer]:
+    """`judge_responses` in a worker process initialized by `init_worker`"""
+    return judge_responses(from_worker_task(seq, req), *args)
+
+
+def judge_responses_in_process(
+    cpu_executor,
+    arg: ChallengeArg,
+    r_one,
+    r_other,
+    req_time: datetime.datetime,
+    begin: float,
+    timer: StageTimer,
+) -> Tuple[dict, StageTimer]:
+    """`judge_responses` in a worker process of `cpu_executor` initialized by `init_worker`.
+    The calling thread waits for the result, so it works as a front end of network I/O.
+    """
+    return cpu_executor.submit(
+        judge_responses_in_worker,
+        *to_worker_task(arg),
+        RawResponse.from_requests(r_one),
+        RawResponse.from_requests(r_other),
+        req_time,
+        begin,
+        timer,
+    ).result()
+
+
+def in_worker_process(config: Config) -> bool:
+    """Whether challenges (only CPU-bound stages in the asyncio engine) run in worker processes.
+    The hybrid engine runs challenges in threads and only CPU-bound stages in processes.
+    """
+    return config.processes.get() is not None and config.engine.get_or(Engine.POOL) is not (
+        Engine.HYBRID  # type: ignore # Prevent for enum problem
     )
-    logger.info_lv3(f"{log_prefix} ⏰ Did challenge:   {mill_seconds_until(did_challenge_begin)}ms")
 
-    return payload.trial.to_dict()
+
+def create_process_pool(config: Config, template: ChallengeArg) -> futures.ProcessPoolExecutor:
+    initargs = (config.addons, config.profile_addons.get_or(False), root_log_level(), template)
+    mp_context = multiprocessing.get_context(
+        config.start_method.map(lambda x: x.value).get()  # type: ignore # Prevent for enum problem
+    )
+    if sys.version_info < (3, 7):
+        # `initializer` is not supported, so workers inherit add-ons and the template by fork
+        if mp_context.get_start_method() != "fork":
+            logger.error(
+                f"start_method {mp_context.get_start_method()} requires Python 3.7+", exit=True
+            )
+        global worker_template
+        worker_template = template
+        return futures.ProcessPoolExecutor(max_workers=config.processes.get())
+
+    return futures.ProcessPoolExecutor(
+        max_workers=config.processes.get(),  # The number of cores if None
+        mp_context=mp_context,
+        initializer=init_worker,
+        initargs=initargs,
+    )
 
 
-def create_concurrent_executor(config: Config) -> Tuple[Any, Concurrency]:
+def create_concurrency(config: Config) -> Concurrency:
+    engine: Engine = config.engine.get_or(Engine.POOL)
     processes = config.processes.get()
-    if processes:
-        return (
-            futures.ProcessPoolExecutor(max_workers=processes),
-            Concurrency.from_dict({"processes": processes, "threads": 1}),
-        )
+    if processes and engine is not Engine.HYBRID:
+        return Concurrency.from_dict({"processes": processes, "threads": 1})
+
+    # Workers of the pool (hybrid) engine are prepared for the upper bound of adaptive concurrency
+    threads = (
+        config.adaptive.map(lambda x: x.max).get_or(config.threads)
+        if engine in (Engine.POOL, Engine.HYBRID)
+        else config.threads
+    )
+    return Concurrency.from_dict(
+        {
+            # The hybrid engine uses all cores unless otherwise specified
+            "processes": (processes or os.cpu_count() or 1) if engine is Engine.HYBRID else 1,
+            "threads": threads,
+        }
+    )
+
 
-    threads = config.threads
+def create_concurrent_executor(config: Config, concurrency: Concurrency, template: ChallengeArg):
+    """:param template: Common properties of all challenges which are sent to worker processes"""
     return (
-        futures.ThreadPoolExecutor(max_workers=threads),
-        Concurrency.from_dict({"processes": 1, "threads": threads}),
+        create_process_pool(config, template)
+        if in_worker_process(config)
+        else futures.ThreadPoolExecutor(max_workers=concurrency.threads)
+    )
+
+
+@contextmanager
+def shutting_down(executor, deadline: Optional[float] = None):
+    """Same as `with executor` but challenges left behind after `deadline` are not waited for"""
+    try:
+        yield executor
+    finally:
+        executor.shutdown(wait=to_remaining_sec(deadline) != 0)
+
+
+def challenge_all_pool(
+    ex_args: Iterable[ChallengeArg],
+    executor,
+    limiter: ChallengeLimiter,
+    deadline: Optional[float] = None,
+    in_worker: bool = False,
+    cpu_executor=None,
+    window: Optional[InFlightWindow] = None,
+) -> Generator[Tuple[dict, StageTimer], None, None]:
+    """Challenges are submitted to `executor` only after `limiter` allows them,
+    so that workers never wait for rate limits.
+    If `in_worker` is True, they run in worker processes initialized by `init_worker`.
+    If `cpu_executor` is specified, only their CPU-bound stages run in it (hybrid engine).
+    Results (trial and the timer of stages) are yielded in order of completion as same as
+    `futures.as_completed`, so that a slow challenge never blocks later results.
+    `ex_args` are read lazily and a challenge is submitted only after `window` acquires its seq,
+    so the caller must release seqs of yielded results in `window`.
+    It stops when `deadline` (`time.monotonic()`) has passed.
+    """
+    # Completed futures, and the number of submitted challenges at last
+    completed: queue.Queue = queue.Queue()
+    stopped = threading.Event()
+    lock = threading.Lock()
+    running: Set[futures.Future] = set()
+
+    def on_done(f: futures.Future):
+        limiter.release(None if f.cancelled() or f.exception() else f.result()[0])
+        with lock:
+            running.discard(f)
+        completed.put(f)
+
+    def submit_all():
+        count = 0
+        try:
+            for x in ex_args:
+                if window and not window.acquire(x.seq):
+                    break
+                limiter.acquire()
+                if stopped.is_set() or to_remaining_sec(deadline) == 0:
+                    limiter.release()
+                    break
+                f = (
+                    executor.submit(challenge_in_worker, *to_worker_task(x))
+                    if in_worker
+                    else executor.submit(challenge_with_stages, x, cpu_executor)
+                )
+                with lock:
+                    running.add(f)
+                count += 1
+                f.add_done_callback(on_done)
+        finally:
+            completed.put(count)
+
+    submitter = threading.Thread(target=submit_all, name="jumeaux-submitter", daemon=True)
+    submitter.start()
+
+    def cancel_all():
+        with lock:
+            fs = list(running)
+        # Callbacks of cancelled futures are called in this thread
+        for f in fs:
+            f.cancel()
+
+    total: Optional[int] = None
+    yielded = 0
+    try:
+        while total is None or yielded < total:
+            try:
+                x = completed.get(timeout=to_remaining_sec(deadline))
+            except queue.Empty:
+                return
+            if isinstance(x, int):
+                total = x
+                continue
+            yield x.result()
+            yielded += 1
+    finally:
+        stopped.set()
+        # The submitter may be waiting for a place in the window
+        if window:
+            window.close()
+        cancel_all()
+        submitter.join()
+        cancel_all()
+
+
+def challenge_all_async(
+    ex_args: Iterable[ChallengeArg],
+    cpu_executor,
+    max_in_flight: int,
+    limiter: ChallengeLimiter,
+    deadline: Optional[float] = None,
+    in_worker: bool = False,
+    window: Optional[InFlightWindow] = None,
+) -> Generator[Tuple[dict, StageTimer], None, None]:
+    """Requests of `max_in_flight` challenges are in flight at the same time on one event loop.
+    The loop only schedules challenges and waits for them. `requests` is blocking I/O,
+    so requests are sent by a shared I/O thread pool of `max_in_flight * 2` threads.
+    It is not an asynchronous HTTP client, so `max_in_flight` is capped at `MAX_IN_FLIGHT`.
+    Results (trial and the timer of stages) are yielded in order of completion as same as
+    `futures.as_completed`, so that a slow challenge never blocks later results.
+    `ex_args` are read lazily and a challenge is created only after `window` acquires its seq,
+    so the caller must release seqs of yielded results in `window`.
+    It stops when `deadline` (`time.monotonic()`) has passed.
+    """
+    max_in_flight = min(max_in_flight, limiter.max_in_flight or max_in_flight)
+    loop = asyncio.new_event_loop()
+    # Each challenge sends two requests (one and other), and each request occupies a thread
+    io_thread_pool = futures.ThreadPoolExecutor(max_workers=max_in_flight * 2)
+
+    async def create_semaphore() -> Tuple[asyncio.Semaphore, asyncio.Condition]:
+        # They must be created in the loop which uses them
+        return asyncio.Semaphore(max_in_flight), asyncio.Condition()
+
+    args: Iterator[ChallengeArg] = iter(ex_args)
+    # An arg which was read but is waiting for a place in the window
+    waiting: Optional[ChallengeArg] = None
+    tasks: Set[asyncio.Task] = set()
+    try:
+        semaphore, in_flight = loop.run_until_complete(create_semaphore())
+
+        def fill():
+            nonlocal waiting
+            while True:
+                x = waiting or next(args, None)
+                if x is None:
+                    return
+                if window and not window.try_acquire(x.seq):
+                    waiting = x
+                    return
+                waiting = None
+                tasks.add(
+                    loop.create_task(
+                        challenge_async(
+                            x,
+                            loop=loop,
+                            semaphore=semaphore,
+                            in_flight=in_flight,
+                            limiter=limiter,
+                            io_thread_pool=io_thread_pool,
+                            cpu_executor=cpu_executor,
+                            in_worker=in_worker,
+                        )
+                    )
+                )
+
+        fill()
+        while tasks:
+            done, _ = loop.run_until_complete(
+                asyncio.wait(
+                    tasks,
+                    timeout=to_remaining_sec(deadline),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            )
+            if not done:
+                return
+            for t in done:
+                tasks.remove(t)
+                yield t.result()
+            fill()
+    finally:
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        # Requests left behind after `deadline` are not waited for
+        io_thread_pool.shutdown(wait=to_remaining_sec(deadline) != 0)
+        loop.close()
+
+
+def to_dedup_key(arg: ChallengeArg) -> str:
+    """Requests with the same key are regarded as the same.
+    It consists of method, resolved paths and queries of one and other (after `path` and `query`),
+    headers and body. Order of queries and cases of header names are ignored.
+    """
+
+    def normalize_url(url: str) -> list:
+        path, _, query = url.partition("?")
+        return [path, sorted(urlparser.parse_qsl(query, keep_blank_values=True))]
+
+    url_one, url_other = create_urls(arg)
+    request = json.dumps(
+        [
+            arg.req.method.value,
+            normalize_url(url_one),
+            normalize_url(url_other),
+            {k.lower(): v for k, v in arg.req.headers.items()},
+            arg.req.raw.get(),
+            arg.req.form.get(),
+            arg.req.json.get(),
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
     )
+    return hashlib.sha256(request.encode("utf8")).hexdigest()
+
+
+def find_repeats(args: Iterable[ChallengeArg]) -> Dict[int, List[int]]:
+    """:return: Seqs of requests which repeat the first one with the same `to_dedup_key`,
+    by the seq of the first one
+    """
+    first_seqs: Dict[str, int] = {}
+    repeats: Dict[int, List[int]] = {}
+    for arg in args:
+        first_seq = first_seqs.setdefault(to_dedup_key(arg), arg.seq)
+        if first_seq != arg.seq:
+            repeats.setdefault(first_seq, []).append(arg.seq)
+    return repeats
+
+
+def to_repeated_trial(trial: dict, seq: int, req: Request) -> dict:
+    """Trial of `req` which shares responses and the result with `trial` of the same request"""
+    return {
+        **trial,
+        **traverse_dict(
+            {
+                "seq": seq,
+                "name": req.name.get_or(str(seq)),
+                "headers": req.headers,
+                "queries": req.qs,
+                "path": req.path,
+                "repeat_of": trial["seq"],
+            },
+            ignore_none=True,
+            force_value=True,
+        ),
+    }
+
+
+def judge_abort(condition: AbortCondition, status_counts: Counter) -> Optional[str]:
+    """Returns the reason if finished trials satisfy `condition`, otherwise None."""
+    finished: int = sum(status_counts.values())
+    for status, threshold in [("different", condition.different), ("failure", condition.failure)]:
+        if threshold.is_none():
+            continue
+        t = threshold.get()
+        count: int = status_counts[status]
 
+        if t.count.get() is not None and count > t.count.get():
+            return f"{status} count {count} > {t.count.get()}"
+        if t.ratio.get() is not None and finished >= max(t.min_trials, 1):
+            ratio: float = count / finished
+            if ratio > t.ratio.get():
+                return f"{status} ratio {ratio:.3f} > {t.ratio.get()} after {finished} trials"
 
-def exec(config: Config, reqs: TList[Request], key: str, retry_hash: Optional[str]) -> Report:
+    return None
+
+
+def exec(
+    config: Config,
+    reqs: TList[Request],
+    key: str,
+    retry_hash: Optional[str],
+    resume: bool = False,
+    profile_dir: Optional[str] = None,
+) -> Report:
+    """
+    :param profile_dir: Directory where worker processes write their profiles
+    """
     # Provision
-    s = requests.Session()
-    s.mount("http://", HTTPAdapter(max_retries=config.max_retries))
-    s.mount("https://", HTTPAdapter(max_retries=config.max_retries))
+    concurrency = create_concurrency(config)
+    engine: Engine = config.engine.get_or(Engine.POOL)
+    if engine is Engine.ASYNCIO:
+        max_in_flight: int = config.max_in_flight.get_or(
+            config.adaptive.map(lambda x: x.max).get_or(DEFAULT_MAX_IN_FLIGHT)
+        )
+        if max_in_flight > MAX_IN_FLIGHT:
+            logger.warning(
+                f"max_in_flight ({max_in_flight}) is capped at {MAX_IN_FLIGHT} "
+                "because each request in flight occupies a thread."
+            )
+        concurrency = Concurrency.from_dict(
+            {
+                **concurrency.to_dict(),
+                "engine": engine,
+                "max_in_flight": min(max_in_flight, MAX_IN_FLIGHT),
+            }
+        )
+    if engine is Engine.HYBRID:
+        concurrency = Concurrency.from_dict({**concurrency.to_dict(), "engine": engine})
+    if config.adaptive.get():
+        concurrency = Concurrency.from_dict(
+            {**concurrency.to_dict(), "adaptive": config.adaptive.get().to_dict()}
+        )
 
-    make_dir(f"{config.output.response_dir}/{key}/one")
-    make_dir(f"{config.output.response_dir}/{key}/other")
-    make_dir(f"{config.output.response_dir}/{key}/one-props")
-    make_dir(f"{config.output.response_dir}/{key}/other-props")
+    # Keep connections as many as challenges in flight unless otherwise specified
+    max_challenges: int = concurrency.max_in_flight.get_or(concurrency.threads)
+    # Challenges submitted but not yet consumed. Workers are not starved while results are consumed
+    window: int = config.window.get_or(
+        concurrency.max_in_flight.get_or(concurrency.threads * concurrency.processes)
+        * DEFAULT_WINDOW_FACTOR
+    )
+    # Requests are bounded by deadlines if specified, and retries of reads would exceed them
+    retry_read: bool = config.deadline.is_none()
+    session_one = PooledSession(
+        "one", config.one.pool, config.max_retries, max_challenges, config.one.timeout, retry_read
+    )
+    session_other = PooledSession(
+        "other",
+        config.other.pool,
+        config.max_retries,
+        max_challenges,
+        config.other.timeout,
+        retry_read,
+    )
+    # Responses of one are recorded to or replayed from a local store
+    record_session: Optional[RecordedSession] = config.record.map(
+        lambda x: RecordedSession(session_one, x)
+    ).get()
+    replay: bool = config.record.map(lambda x: x.mode is RecordMode.REPLAY).get_or(False)
+
+    make_dir(f"{config.output.response_dir}/{key}/one", exist_ok=resume)
+    make_dir(f"{config.output.response_dir}/{key}/other", exist_ok=resume)
+    make_dir(f"{config.output.response_dir}/{key}/one-props", exist_ok=resume)
+    make_dir(f"{config.output.response_dir}/{key}/other-props", exist_ok=resume)
+
+    # Trials which finished before interrupted are skipped
+    trials_path = f"{config.output.response_dir}/{key}/trials.jsonl"
+    finished_seqs, status_counts = trial_logs.recover(trials_path) if resume else (set(), Counter())
+    if resume:
+        logger.info_lv1(f"Resume {key}: {len(finished_seqs)} / {len(reqs)} trials were finished")
+
+    # Requests without `timeout` are also bounded by the deadline of the run
+    run_sec: Optional[int] = config.deadline.map(lambda x: x.run_sec.get()).get()
+    deadline: Optional[float] = time.monotonic() + run_sec if run_sec else None
 
     # Parse inputs to args of multi-thread executor.
-    ex_args = reqs.emap(
-        lambda x, i: {
-            "seq": i + 1,
-            "number_of_request": len(reqs),
-            "key": key,
-            "session": s,
-            "req": x,
-            "host_one": config.one.host,
-            "host_other": config.other.host,
-            "proxy_one": Proxy.from_host(config.one.proxy),
-            "proxy_other": Proxy.from_host(config.other.proxy),
-            "path_one": config.one.path,
-            "path_other": config.other.path,
-            "query_one": config.one.query,
-            "query_other": config.other.query,
-            "headers_one": config.one.headers,
-            "headers_other": config.other.headers,
-            "default_response_encoding_one": config.one.default_response_encoding,
-            "default_response_encoding_other": config.other.default_response_encoding,
-            "res_dir": config.output.response_dir,
-        }
-    ).to_dicts()
+    # `seq` and `req` are replaced for each challenge
+    template = ChallengeArg(
+        seq=0,
+        number_of_request=len(reqs),
+        key=key,
+        session_one=record_session or session_one,
+        session_other=session_other,
+        req=Request.from_dict({"path": ""}),
+        host_one=config.one.host,
+        host_other=config.other.host,
+        proxy_one=TOption(Proxy.from_host(config.one.proxy)),
+        proxy_other=TOption(Proxy.from_host(config.other.proxy)),
+        path_one=config.one.path,
+        path_other=config.other.path,
+        query_one=config.one.query,
+        query_other=config.other.query,
+        headers_one=config.one.headers,
+        headers_other=config.other.headers,
+        default_response_encoding_one=config.one.default_response_encoding,
+        default_response_encoding_other=config.other.default_response_encoding,
+        res_dir=config.output.response_dir,
+        trial_timeout_ms=config.deadline.flat_map(lambda x: x.trial_ms),
+        run_deadline=TOption(deadline),
+        diff_engine=config.diff_engine.get_or(DiffEngine.JUMEAUX),
+        trace=config.output.trace.get_or(False),
+        profile_dir=TOption(profile_dir),
+    )
+    # Requests are challenged in order of seq unless scheduled
+    order: Iterable[int] = config.schedule.map(lambda x: schedules.schedule(reqs, x)).get_or(
+        range(len(reqs))
+    )
+    # Repeated requests are not challenged, and trials of them are copied from the first one
+    repeats: Dict[int, List[int]] = (
+        find_repeats(
+            template.replace(seq=i + 1, req=reqs[i]) for i in order if i + 1 not in finished_seqs
+        )
+        if config.dedup.get_or(False)
+        else {}
+    )
+    repeated_seqs: Set[int] = {x for seqs in repeats.values() for x in seqs}
+    # Args are created only when challenges are submitted
+    ex_args: Iterator[ChallengeArg] = (
+        template.replace(seq=i + 1, req=reqs[i])
+        for i in order
+        if i + 1 not in finished_seqs and i + 1 not in repeated_seqs
+    )
+    # Only seq and req of each challenge are sent to worker processes
+    executor = create_concurrent_executor(config, concurrency, template)
+    cpu_executor: Optional[futures.ProcessPoolExecutor] = (
+        create_process_pool(config, template) if engine is Engine.HYBRID else None
+    )
 
     # Challenge
     title = config.title.get_or("No title")
     description = config.description.get()
     tags = config.tags.get_or([])
-    executor, concurrency = create_concurrent_executor(config)
 
     logger.info_lv1(
         f"""
@@ -653,20 +1596,158 @@ def exec(config: Config, reqs: TList[Request], key: str, retry_hash: Optional[st
 --------------------------------------------------------------------------------
 | - {concurrency.processes} processes
 | - {concurrency.threads} threads
+| - {engine.value} engine
 --------------------------------------------------------------------------------
     """
     )
 
+    # Trials are not held in memory in streaming mode
+    streaming: bool = config.output.streaming.get_or(False)
+    trial_log: Optional[TrialLog] = TrialLog(trials_path) if streaming else None
+    trace: Optional[TraceWriter] = (
+        TraceWriter(f"{config.output.response_dir}/{key}/trace.json")
+        if config.output.trace.get_or(False)
+        else None
+    )
+    trials: TList[Trial] = TList()
+
+    def write_trial(r: dict):
+        if trial_log:
+            trial_log.write(r)
+        else:
+            trials.append(Trial.from_dict(r))
+
+    # Trials are written as they complete, and sorted by seq after all of them are written
+    in_flight_window = InFlightWindow(window)
+
+    # Rate limits are applied before challenges are dispatched to workers
+    # Replayed responses of one are not limited
+    limiter = ChallengeLimiter(
+        TOption(None) if replay else config.one.rate_limit, config.other.rate_limit, config.adaptive
+    )
+
+    latencies = StageLatencies(STAGES)
+    progress: Optional[ProgressReporter] = config.progress.map(
+        lambda x: ProgressReporter(x, len(reqs), lambda: limiter.in_flight, status_counts)
+    ).get()
+    metrics: Optional[MetricsWriter] = config.metrics.map(
+        lambda x: MetricsWriter(x, latencies, global_addon_executor.profiler)
+    ).get()
+    abort_reason: Optional[str] = None
     start_time = now()
-    with executor as ex:
-        trials = TList([r for r in ex.map(challenge, ex_args)]).map(Trial.from_dict)
+    try:
+        if progress:
+            progress.start()
+        if metrics:
+            metrics.start()
+        with shutting_down(executor, deadline) as ex:
+            in_worker: bool = in_worker_process(config)
+            results: Generator[Tuple[dict, StageTimer], None, None] = (
+                challenge_all_async(
+                    ex_args,
+                    ex,
+                    concurrency.max_in_flight.get(),
+                    limiter,
+                    deadline,
+                    in_worker,
+                    in_flight_window,
+                )
+                if engine is Engine.ASYNCIO
+                else challenge_all_pool(
+                    ex_args, ex, limiter, deadline, in_worker, cpu_executor, in_flight_window
+                )
+            )
+            # Results are handled and written as they complete
+            for r, timer in results:
+                status_counts[r["status"]] += 1
+                latencies.record(timer.elapsed_ms)
+                if progress:
+                    progress.record(r)
+                if metrics:
+                    metrics.record(r)
+                if trace:
+                    trace.write(timer.events)
+                in_flight_window.release(r["seq"])
+                write_trial(r)
+
+                # Stages and metrics are not recorded because nothing is requested for them
+                for seq in repeats.pop(r["seq"], []):
+                    repeated: dict = to_repeated_trial(r, seq, reqs[seq - 1])
+                    status_counts[repeated["status"]] += 1
+                    if progress:
+                        progress.record(repeated)
+                    write_trial(repeated)
+
+                abort_reason = config.abort.map(lambda x: judge_abort(x, status_counts)).get()
+                if abort_reason:
+                    # Cancel challenges which are not started yet
+                    results.close()
+                    break
+    finally:
+        if cpu_executor:
+            cpu_executor.shutdown(wait=to_remaining_sec(deadline) != 0)
+        if trial_log:
+            trial_log.close()
+        if trace:
+            trace.close()
+        if progress:
+            progress.stop()
+        if metrics:
+            metrics.stop()
     end_time = now()
 
+    # Trials are written in order of completion, so the order of seq is restored here
+    if trial_log:
+        trial_logs.sort_by_seq(trials_path)
+    trials = trials.order_by(lambda x: x.seq)
+
+    if not abort_reason and sum(status_counts.values()) < len(reqs):
+        abort_reason = f"run deadline {run_sec}s exceeded"
+
+    aborted: Optional[dict] = None
+    if abort_reason:
+        logger.warning(f"Abort: {abort_reason}")
+        aborted = {
+            "reason": abort_reason,
+            "trials": sum(status_counts.values()),
+            "total": len(reqs),
+        }
+
+    # Sessions in worker processes are copies, so connections of them can't be measured here
+    connections: Optional[dict] = (
+        None
+        if in_worker_process(config)
+        else {"one": session_one.stats(), "other": session_other.stats()}
+    )
+    # Responses in child processes are not counted here
+    record: Optional[RecordStats] = (
+        record_session.to_stats() if record_session and not in_worker_process(config) else None
+    )
+    if record:
+        logger.info_lv1(
+            f"Record ({record.mode.value}): recorded {record.recorded}"
+            f" / replayed {record.replayed} / missed {record.missed}"
+        )
+    if record_session:
+        record_session.close()
+    else:
+        session_one.close()
+    session_other.close()
+
     latest = f"{config.output.response_dir}/latest"
     if os.path.lexists(latest):
         os.remove(latest)
     os.symlink(key, latest, True)
 
+    dedup: Optional[dict] = (
+        {
+            "unique": len(reqs) - len(finished_seqs) - len(repeated_seqs),
+            "repeated": len(repeated_seqs),
+        }
+        if config.dedup.get_or(False)
+        else None
+    )
+
     summary = Summary.from_dict(
         {
             "one": {
@@ -677,6 +1758,9 @@ def exec(config: Config, reqs: TList[Request], key: str, retry_hash: Optional[st
                 "proxy": config.one.proxy,
                 "headers": config.one.headers,
                 "default_response_encoding": config.one.default_response_encoding,
+                "pool": config.one.pool,
+                "rate_limit": config.one.rate_limit,
+                "timeout": config.one.timeout,
             },
             "other": {
                 "name": config.other.name,
@@ -686,8 +1770,11 @@ def exec(config: Config, reqs: TList[Request], key: str, retry_hash: Optional[st
                 "proxy": config.other.proxy,
                 "headers": config.other.headers,
                 "default_response_encoding": config.other.default_response_encoding,
+                "pool": config.other.pool,
+                "rate_limit": config.other.rate_limit,
+                "timeout": config.other.timeout,
             },
-            "status": trials.group_by(_.status.value).map_values(len).to_dict(),
+            "status": dict(status_counts),
             "tags": tags,
             "time": {
                 "start": start_time.isoformat(),
@@ -696,6 +1783,14 @@ def exec(config: Config, reqs: TList[Request], key: str, retry_hash: Optional[st
             },
             "output": config.output.to_dict(),
             "concurrency": concurrency,
+            "connections": connections,
+            "record": record,
+            "dedup": dedup,
+            "aborted": aborted,
+            "latencies": latencies.to_stats(),
+            "addon_profiles": global_addon_executor.profiler.to_profiles()
+            if global_addon_executor.profiler
+            else None,
         }
     )
 
@@ -720,6 +1815,8 @@ def __run(
     addon_executor: AddOnExecutor,
     hash: str,
     retry_hash: Optional[str],
+    resume: bool = False,
+    profile: Optional[str] = None,
 ):
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding=config.output.encoding)
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding=config.output.encoding)
@@ -742,29 +1839,44 @@ def __run(
     global global_addon_executor
     global_addon_executor = addon_executor
 
-    # Requests
-    reqs: TList[Request] = addon_executor.apply_reqs2reqs(
-        Reqs2ReqsAddOnPayload.from_dict({"requests": origin_reqs}), config
-    ).requests
-
-    # Execute
-    report = exec(config, reqs, hash, retry_hash)
-
-    # Finalize
-    addon_executor.apply_final(
-        FinalAddOnPayload.from_dict({"report": report, "output_summary": config.output}),
-        FinalAddOnReference.from_dict({"notifiers": config.notifiers}),
-    )
+    profiler: Optional[profilers.SamplingProfiler] = profilers.start_main() if profile else None
+    # Worker processes write their profiles here when they exit
+    profile_dir: Optional[str] = tempfile.mkdtemp(prefix="jumeaux-profile-") if profile else None
+    try:
+        # Requests
+        reqs: TList[Request] = addon_executor.apply_reqs2reqs(
+            Reqs2ReqsAddOnPayload.from_dict({"requests": origin_reqs}), config
+        ).requests
+
+        # Execute
+        report = exec(config, reqs, hash, retry_hash, resume, profile_dir)
+
+        # Finalize
+        addon_executor.apply_final(
+            FinalAddOnPayload.from_dict({"report": report, "output_summary": config.output}),
+            FinalAddOnReference.from_dict({"notifiers": config.notifiers}),
+        )
+    finally:
+        if profiler and profile and profile_dir:
+            profilers.finish_main(profiler, profile, profile_dir)
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    # Final add-ons can't be in the report because they receive it
+    if addon_executor.profiler:
+        for p in addon_executor.profiler.to_profiles().filter(lambda x: x.layer == "final"):
+            logger.info_lv1(
+                f"Add-on profile: final/{p.name} {p.total_ms}ms ({p.errors} errors)"
+            )
 
 
 def hash_from_args(args_str: str) -> str:
     return hashlib.sha256((str(now()) + args_str).encode()).hexdigest()
 
 
-def retry(*, args: MergedArgs, report: str):
+def retry(*, args: MergedArgs, report: str, profile: TOption[str] = TOption(None)):
     report: Report = Report.from_jsonf(report, force_cast=True)
     config: Config = merge_args2config(args, create_config_from_report(report))
-    addon_executor = AddOnExecutor(config.addons)
+    addon_executor = AddOnExecutor(config.addons, config.profile_addons.get_or(False))
     origin_reqs: TList[Request] = report.trials.map(
         lambda x: Request.from_dict(
             {
@@ -778,18 +1890,53 @@ def retry(*, args: MergedArgs, report: str):
             }
         )
     )
-    __run(config, origin_reqs, addon_executor, hash_from_args(args.to_json()), report.key)
+    __run(
+        config,
+        origin_reqs,
+        addon_executor,
+        hash_from_args(args.to_json()),
+        report.key,
+        profile=profile.get(),
+    )
 
 
 def run(
-    *, args: MergedArgs, config_paths: TList[str], skip_addon_tag: TOption[TList[str]],
+    *,
+    args: MergedArgs,
+    config_paths: TList[str],
+    skip_addon_tag: TOption[TList[str]],
+    resume: TOption[str] = TOption(None),
+    profile: TOption[str] = TOption(None),
 ):
     config: Config = merge_args2config(
         args, create_config(config_paths, skip_addon_tag),
     )
 
-    addon_executor = AddOnExecutor(config.addons)
+    if resume.get():
+        trials_path = f"{config.output.response_dir}/{resume.get()}/trials.jsonl"
+        if not os.path.exists(trials_path):
+            logger.error(
+                f"{trials_path} doesn't exist. Only a run in streaming mode can be resumed."
+            )
+            logger.error(
+                "Please check `--resume` and `output.response_dir`, or set `output.streaming`.",
+                exit=True,
+            )
+        # Trials must be appended to the trial log of the interrupted run
+        config = Config.from_dict(
+            {**config.to_dict(), "output": {**config.output.to_dict(), "streaming": True}}
+        )
+
+    addon_executor = AddOnExecutor(config.addons, config.profile_addons.get_or(False))
     origin_reqs: TList[Request] = config.input_files.get().flat_map(
         lambda f: addon_executor.apply_log2reqs(Log2ReqsAddOnPayload.from_dict({"file": f}))
     )
-    __run(config, origin_reqs, addon_executor, hash_from_args(args.to_json()), None)
+    __run(
+        config,
+        origin_reqs,
+        addon_executor,
+        resume.get() or hash_from_args(args.to_json()),
+        None,
+        resume.any(),
+        profile.get(),
+    )
@@ -0,0 +1,187 @@
+# -*- coding:utf-8 -*-
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from owlmixin import TDict, TList
+
+from jumeaux.models import LatencyStats, AddOnProfile
+from jumeaux.trace import create_span
+
+# Each bucket is 1% wider than the previous one, so percentiles are within 1% error
+BUCKET_GROWTH = 1.01
+# Latencies under this are regarded as the same (milliseconds)
+MIN_MS = 0.01
+# Add-on layers in order of execution
+LAYERS = [
+    "log2reqs",
+    "reqs2reqs",
+    "res2res",
+    "res2dict",
+    "judgement",
+    "store_criterion",
+    "dump",
+    "did_challenge",
+    "final",
+]
+
+
+class Lap:
+    """Milliseconds of a `StageTimer.measure` block. It is available after the block."""
+
+    def __init__(self) -> None:
+        self.ms: float = 0.0
+
+
+class StageTimer:
+    """Milliseconds spent on each stage in a trial.
+
+    Stages can be nested. The time of an inner stage is not counted in the outer one,
+    so that a lazy stage (ex. res2dict) is not counted twice.
+
+    If `trace` is True, spans of stages are also recorded to `events` as Chrome trace events.
+    It is picklable so that it can be returned from a process.
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        self.elapsed_ms: Dict[str, float] = {}
+        self._inner_ms: List[float] = []
+        self.events: Optional[List[dict]] = [] if trace else None
+
+    def span(self, name: str, category: str, begin: float, end: float, **args):
+        """Records a span of the current thread. `begin` and `end` are `time.perf_counter()`."""
+        if self.events is not None:
+            self.events.append(create_span(name, category, begin, end, **args))
+
+    def add(self, stage: str, ms: float):
+        self.elapsed_ms[stage] = self.elapsed_ms.get(stage, 0.0) + ms
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[Lap]:
+        lap = Lap()
+        begin = time.perf_counter()
+        self._inner_ms.append(0.0)
+        try:
+            yield lap
+        finally:
+            end = time.perf_counter()
+            self.span(stage, "stage", begin, end)
+            ms = (end - begin) * 1000
+            inner_ms = self._inner_ms.pop()
+            if self._inner_ms:
+                self._inner_ms[-1] += ms
+            lap.ms = round(ms - inner_ms, 3)
+            self.add(stage, ms - inner_ms)
+
+
+class LatencyHistogram:
+    """Histogram with logarithmic buckets which keeps percentiles in constant memory.
+    A percentile is the slowest latency in the bucket which includes it.
+    """
+
+    def __init__(self) -> None:
+        # Count and the slowest latency by index of a bucket
+        self.counts: Dict[int, int] = {}
+        self.slowest: Dict[int, float] = {}
+        self.count: int = 0
+        self.max: float = 0.0
+        self.total: float = 0.0
+
+    def record(self, ms: float):
+        index = 0 if ms <= MIN_MS else math.ceil(math.log(ms / MIN_MS, BUCKET_GROWTH))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.slowest[index] = max(self.slowest.get(index, ms), ms)
+        self.count += 1
+        self.max = max(self.max, ms)
+        self.total += ms
+
+    def percentile(self, p: float) -> float:
+        rank = max(math.ceil(self.count * p / 100), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return self.slowest[index]
+        return self.max
+
+    def to_stats(self) -> LatencyStats:
+        return LatencyStats.from_dict(
+            {
+                "count": self.count,
+                "p50": round(self.percentile(50), 2),
+                "p90": round(self.percentile(90), 2),
+                "p99": round(self.percentile(99), 2),
+                "max": round(self.max, 2),
+                "total": round(self.total, 2),
+            }
+        )
+
+
+class StageLatencies:
+    """Histograms of stages in all trials. They can be read by another thread while recording."""
+
+    def __init__(self, stages: List[str]) -> None:
+        self.lock = threading.Lock()
+        # Stages are printed in this order
+        self.histograms: Dict[str, LatencyHistogram] = {x: LatencyHistogram() for x in stages}
+
+    def record(self, elapsed_ms: Dict[str, float]):
+        with self.lock:
+            for stage, ms in elapsed_ms.items():
+                self.histograms.setdefault(stage, LatencyHistogram()).record(ms)
+
+    def to_stats(self) -> TDict[LatencyStats]:
+        with self.lock:
+            return TDict({k: v.to_stats() for k, v in self.histograms.items() if v.count > 0})
+
+
+class AddOnProfiler:
+    """Calls, time and errors of each add-on. It is shared by threads."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # (layer, index in the layer) -> [name, calls, total ms, max ms, errors]
+        self.records: Dict[Tuple[str, int], list] = {}
+
+    @contextmanager
+    def measure(self, layer: str, index: int, name: str) -> Iterator[None]:
+        error = False
+        begin = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            ms = (time.perf_counter() - begin) * 1000
+            with self.lock:
+                r = self.records.setdefault((layer, index), [name, 0, 0.0, 0.0, 0])
+                r[1] += 1
+                r[2] += ms
+                r[3] = max(r[3], ms)
+                r[4] += error
+
+    def to_profiles(self) -> TList[AddOnProfile]:
+        """Profiles in order of measured layers, and of add-ons in each layer"""
+        with self.lock:
+            records = list(self.records.items())
+
+        return TList(
+            AddOnProfile.from_dict(
+                {
+                    "layer": layer,
+                    "name": name,
+                    "calls": calls,
+                    "total_ms": round(total, 3),
+                    "mean_ms": round(total / calls, 3),
+                    "max_ms": round(max_ms, 3),
+                    "errors": errors,
+                }
+            )
+            for (layer, _), (name, calls, total, max_ms, errors) in sorted(
+                records, key=lambda x: (LAYERS.index(x[0][0]), x[0][1])
+            )
+        )
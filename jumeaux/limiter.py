@@ -0,0 +1,145 @@
+# -*- coding:utf-8 -*-
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from owlmixin import TOption
+
+from jumeaux.logger import Logger
+from jumeaux.models import RateLimit, AdaptiveConcurrency
+
+logger: Logger = Logger(__name__)
+
+# A latency is regarded as congested when it exceeds the fastest one of the same path by these
+LATENCY_TOLERANCE = 2
+# Resolution of `response_sec`
+LATENCY_MARGIN_SEC = 0.01
+
+
+class TokenBucket:
+    """Token bucket by GCRA (Generic Cell Rate Algorithm).
+
+    `reserve` never blocks. It reserves a token and returns seconds to wait until it is available,
+    so that both threads and coroutines can wait in their own way.
+    """
+
+    def __init__(self, qps: int, burst: int) -> None:
+        self.interval: float = 1 / qps
+        self.tolerance: float = (burst - 1) * self.interval
+        self.lock = threading.Lock()
+        self.tat: float = time.monotonic()
+
+    def reserve(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            tat = max(self.tat, now)
+            self.tat = tat + self.interval
+            return max(0.0, tat - self.tolerance - now)
+
+
+class AdaptiveLimit:
+    """AIMD (Additive Increase / Multiplicative Decrease) limit of challenges in flight.
+
+    The limit increases by 1 after as many successful trials as the limit,
+    and halves on a failure or a latency over twice as slow as the fastest one.
+    The fastest latency is kept by path, because endpoints differ in their latencies
+    and a slow endpoint is not a sign of congestion.
+    """
+
+    def __init__(self, adaptive: AdaptiveConcurrency) -> None:
+        self.min: int = adaptive.min
+        self.max: int = adaptive.max
+        self.limit: int = min(max(adaptive.initial.get_or(adaptive.min), self.min), self.max)
+        self.min_latencies: Dict[str, float] = {}
+        self.completed: int = 0
+        self.successes: int = 0
+        self.last_decreased: Optional[int] = None
+
+    def _change(self, limit: int, reason: str):
+        if limit != self.limit:
+            logger.info_lv1(f"Adaptive concurrency: {self.limit} -> {limit} ({reason})")
+            self.limit = limit
+
+    def update(self, trial: dict):
+        self.completed += 1
+
+        if trial["status"] == "failure":
+            reason: Optional[str] = "failure"
+        else:
+            latency: float = max(trial["one"]["response_sec"], trial["other"]["response_sec"])
+            min_latency = min(self.min_latencies.get(trial["path"], latency), latency)
+            self.min_latencies[trial["path"]] = min_latency
+            threshold = max(min_latency * LATENCY_TOLERANCE, min_latency + LATENCY_MARGIN_SEC)
+            reason = f"latency {latency}s > {round(threshold, 2)}s" if latency > threshold else None
+
+        if reason:
+            self.successes = 0
+            # Trials which were in flight together must not decrease the limit again and again
+            if self.last_decreased is None or self.completed - self.last_decreased >= self.limit:
+                self.last_decreased = self.completed
+                self._change(max(self.limit // 2, self.min), reason)
+            return
+
+        self.successes += 1
+        if self.successes >= self.limit:
+            self.successes = 0
+            self._change(min(self.limit + 1, self.max), "no congestion")
+
+
+class ChallengeLimiter:
+    """Limits of starting challenges by `rate_limit` of one and other, and adaptive concurrency.
+
+    A challenge always requests both one and other at the same time,
+    so it takes a token from both buckets and the smaller `max_in_flight` is applied.
+    """
+
+    def __init__(
+        self,
+        one: TOption[RateLimit],
+        other: TOption[RateLimit],
+        adaptive: TOption[AdaptiveConcurrency] = TOption(None),
+    ) -> None:
+        rate_limits: List[RateLimit] = [x.get() for x in (one, other) if x.get()]
+
+        self.buckets: List[TokenBucket] = [
+            TokenBucket(x.qps.get(), x.burst.get_or(1)) for x in rate_limits if x.qps.get()
+        ]
+        self.max_in_flight: Optional[int] = min(
+            [x.max_in_flight.get() for x in rate_limits if x.max_in_flight.get()], default=None
+        )
+        self.adaptive: Optional[AdaptiveLimit] = adaptive.map(AdaptiveLimit).get()
+        self.in_flight: int = 0
+        self.condition = threading.Condition()
+
+    @property
+    def capacity(self) -> Optional[int]:
+        limits = [x for x in (self.max_in_flight, self.adaptive and self.adaptive.limit) if x]
+        return min(limits, default=None)
+
+    def reserve(self) -> float:
+        return max([b.reserve() for b in self.buckets], default=0.0)
+
+    def try_acquire(self) -> bool:
+        """Takes a slot in flight without waiting. Tokens are not taken."""
+        with self.condition:
+            capacity = self.capacity
+            if capacity is not None and self.in_flight >= capacity:
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self):
+        with self.condition:
+            self.condition.wait_for(self.try_acquire)
+        wait_sec = self.reserve()
+        if wait_sec > 0:
+            time.sleep(wait_sec)
+
+    def release(self, trial: Optional[dict] = None):
+        """`trial` is a result of the challenge (dict like `Trial`), or None if it was not finished."""
+        with self.condition:
+            self.in_flight -= 1
+            if self.adaptive and trial:
+                self.adaptive.update(trial)
+            self.condition.notify_all()
@@ -55,6 +55,18 @@ def init_logger(v_num: int):
     Call when initialize Jumeaux !!
     :return:
     """
+    init_logger_by_level(
+        {  # type: ignore # Prevent for enum problem
+            0: LogLevel.INFO_LV1,
+            1: LogLevel.INFO_LV2,
+            2: LogLevel.INFO_LV3,
+            3: LogLevel.DEBUG,
+        }[v_num]
+    )
+
+
+def init_logger_by_level(level: LogLevel):
+    """Same as `init_logger` but with a level (ex. the level of the main process in a worker)"""
     logging.addLevelName(
         LogLevel.INFO_LV1.value, "INFO_LV1"  # type: ignore # Prevent for enum problem
     )
@@ -65,16 +77,13 @@ def init_logger(v_num: int):
         LogLevel.INFO_LV3.value, "INFO_LV3"  # type: ignore # Prevent for enum problem
     )
 
-    logging.config.dictConfig(
-        create_logger_config(
-            {  # type: ignore # Prevent for enum problem
-                0: LogLevel.INFO_LV1,
-                1: LogLevel.INFO_LV2,
-                2: LogLevel.INFO_LV3,
-                3: LogLevel.DEBUG,
-            }[v_num]
-        )
-    )
+    logging.config.dictConfig(create_logger_config(level))
+
+
+def root_log_level() -> LogLevel:
+    """The highest `LogLevel` which is not over the level of the root logger"""
+    level: int = logging.getLogger().level
+    return next(x for x in LogLevel if x.value <= level)  # type: ignore # Prevent for enum problem
 
 
 class Logger:
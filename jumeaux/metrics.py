@@ -0,0 +1,189 @@
+# -*- coding:utf-8 -*-
+
+"""Metrics of a run in OpenMetrics text format (https://openmetrics.io).
+
+The output can be collected by a textfile collector of node_exporter.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from owlmixin import TDict, TList
+
+from jumeaux.domain.config.vo import Metrics
+from jumeaux.latency import AddOnProfiler, StageLatencies
+from jumeaux.logger import Logger
+from jumeaux.models import AddOnProfile, LatencyStats
+
+logger: Logger = Logger(__name__)
+
+# Upper bounds of buckets of response seconds
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+SIDES = ["one", "other"]
+STATUSES = ["same", "different", "failure"]
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def to_number(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+class RunMetrics:
+    """Counters of trials. Trials are recorded by one thread and exported by another one."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.status_counts: Dict[str, int] = {x: 0 for x in STATUSES}
+        # side -> counts of each bucket (not cumulative)
+        self.bucket_counts: Dict[str, List[int]] = {x: [0] * (len(BUCKETS) + 1) for x in SIDES}
+        self.response_counts: Dict[str, int] = {x: 0 for x in SIDES}
+        self.response_sec: Dict[str, float] = {x: 0.0 for x in SIDES}
+        self.bytes: Dict[str, int] = {x: 0 for x in SIDES}
+
+    def record(self, trial: dict):
+        """:param trial: dict like `Trial`"""
+        with self.lock:
+            self.status_counts[trial["status"]] = self.status_counts.get(trial["status"], 0) + 1
+            for side in SIDES:
+                res: dict = trial.get(side) or {}
+                self.bytes[side] += res.get("byte") or 0
+                sec: Optional[float] = res.get("response_sec")
+                if sec is None:
+                    continue
+                index = next((i for i, x in enumerate(BUCKETS) if sec <= x), len(BUCKETS))
+                self.bucket_counts[side][index] += 1
+                self.response_counts[side] += 1
+                self.response_sec[side] += sec
+
+    def to_openmetrics(
+        self,
+        latencies: Optional[TDict[LatencyStats]] = None,
+        addon_profiles: Optional[TList[AddOnProfile]] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        :param latencies: Stats of stages in milliseconds
+        :param addon_profiles: Profiles of add-ons
+        :param labels: Labels added to all metrics
+        """
+        latencies = latencies or TDict()
+        addon_profiles = addon_profiles or TList()
+        labels = labels or {}
+        lines: List[str] = []
+
+        def add(metric: str, value: float, **extra: str):
+            lines.append(f"{metric}{to_labels({**labels, **extra})} {to_number(value)}")
+
+        with self.lock:
+            lines.append("# TYPE jumeaux_trials counter")
+            lines.append("# HELP jumeaux_trials Finished trials by status.")
+            for status, count in self.status_counts.items():
+                add("jumeaux_trials_total", count, status=status)
+
+            lines.append("# TYPE jumeaux_response_seconds histogram")
+            lines.append("# HELP jumeaux_response_seconds Response time of one and other.")
+            for side in SIDES:
+                cumulative = 0
+                for le, count in zip(BUCKETS + [float("inf")], self.bucket_counts[side]):
+                    cumulative += count
+                    add("jumeaux_response_seconds_bucket", cumulative, side=side, le=to_number(le))
+                add("jumeaux_response_seconds_count", self.response_counts[side], side=side)
+                add("jumeaux_response_seconds_sum", round(self.response_sec[side], 6), side=side)
+
+            lines.append("# TYPE jumeaux_response_bytes counter")
+            lines.append("# HELP jumeaux_response_bytes Bytes of response bodies.")
+            for side in SIDES:
+                add("jumeaux_response_bytes_total", self.bytes[side], side=side)
+
+        lines.append("# TYPE jumeaux_stage_seconds summary")
+        lines.append("# HELP jumeaux_stage_seconds Time of each stage in trials.")
+        for stage, x in latencies.items():
+            for quantile, ms in [("0.5", x.p50), ("0.9", x.p90), ("0.99", x.p99)]:
+                add("jumeaux_stage_seconds", round(ms / 1000, 6), stage=stage, quantile=quantile)
+            add("jumeaux_stage_seconds_count", x.count, stage=stage)
+            add("jumeaux_stage_seconds_sum", round(x.total / 1000, 6), stage=stage)
+
+        lines.append("# TYPE jumeaux_addon_seconds counter")
+        lines.append("# HELP jumeaux_addon_seconds Time spent in each add-on.")
+        for p in addon_profiles:
+            add(
+                "jumeaux_addon_seconds_total",
+                round(p.total_ms / 1000, 6),
+                layer=p.layer,
+                name=p.name,
+            )
+        lines.append("# TYPE jumeaux_addon_calls counter")
+        lines.append("# HELP jumeaux_addon_calls Calls of each add-on.")
+        for p in addon_profiles:
+            add("jumeaux_addon_calls_total", p.calls, layer=p.layer, name=p.name)
+        lines.append("# TYPE jumeaux_addon_errors counter")
+        lines.append("# HELP jumeaux_addon_errors Calls of each add-on which raised errors.")
+        for p in addon_profiles:
+            add("jumeaux_addon_errors_total", p.errors, layer=p.layer, name=p.name)
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, text: str):
+    # A collector never reads a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class MetricsWriter:
+    """Writes metrics of a running run to `path` every `interval_sec`"""
+
+    def __init__(
+        self,
+        config: Metrics,
+        latencies: StageLatencies,
+        profiler: Optional[AddOnProfiler] = None,
+    ) -> None:
+        self.config = config
+        self.latencies = latencies
+        self.profiler = profiler
+        self.metrics = RunMetrics()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, trial: dict):
+        self.metrics.record(trial)
+
+    def write(self):
+        write_textfile(
+            self.config.path,
+            self.metrics.to_openmetrics(
+                self.latencies.to_stats(),
+                self.profiler.to_profiles() if self.profiler else None,
+                self.config.labels.to_dict(),
+            ),
+        )
+
+    def _run(self):
+        while not self._stopped.wait(self.config.interval_sec):
+            self.write()
+
+    def start(self) -> "MetricsWriter":
+        self._thread = threading.Thread(target=self._run, name="jumeaux-metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops writing and writes the last metrics"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        self.write()
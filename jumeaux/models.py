@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 import datetime
-from typing import Optional, List, Any
+import json
+from typing import Optional, List, Any, Iterator
 
 from owlmixin import OwlMixin, TOption, TList, TDict, OwlEnum
+import requests
 from requests.structures import CaseInsensitiveDict as RequestsCaseInsensitiveDict
 from requests_toolbelt.utils import deprecated
 
@@ -11,9 +13,17 @@ from jumeaux.domain.config.vo import (
     PathReplace,
     QueryCustomization,
     AccessPoint,
+    ConnectionPool,
+    RateLimit,
+    Timeout,
+    AdaptiveConcurrency,
+    AbortThreshold,
+    AbortCondition,
     Concurrency,
+    DiffEngine,
     OutputSummary,
     Notifier,
+    RecordMode,
 )
 
 DictOrList = any  # type: ignore
@@ -37,6 +47,14 @@ class Status(OwlEnum):
     FAILURE = "failure"
 
 
+class FailureReason(OwlEnum):
+    CONNECTION_ERROR = "connection_error"
+    # Connect or read timeout of an access point
+    TIMEOUT = "timeout"
+    # Out of `deadline.trial_ms`
+    TRIAL_TIMEOUT = "trial_timeout"
+
+
 class HttpMethod(OwlEnum):
     GET = "GET"
     POST = "POST"
@@ -145,32 +163,139 @@ class Response(OwlMixin):
                 "elapsed": res.elapsed,
                 "elapsed_sec": round(res.elapsed.seconds + res.elapsed.microseconds / 1000000, 2),
                 "type": type,
-            }
+            },
+            # Keys are already snake case (it is on the hot path)
+            force_snake_case=False,
+        )
+
+
+class RawResponse:
+    """Part of `requests.Response` which `Response.from_requests` and `judge_responses` read.
+
+    It is sent to worker processes instead of `requests.Response`,
+    which also carries the prepared request, cookies, history and so on.
+    """
+
+    __slots__ = ("content", "headers", "url", "status_code", "elapsed", "encoding")
+
+    # It reads only `content`
+    apparent_encoding = requests.Response.apparent_encoding
+
+    def __init__(
+        self,
+        content: bytes,
+        headers: RequestsCaseInsensitiveDict,
+        url: str,
+        status_code: int,
+        elapsed: datetime.timedelta,
+        encoding: Optional[str],
+    ) -> None:
+        self.content = content
+        self.headers = headers
+        self.url = url
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.encoding = encoding
+
+    @classmethod
+    def from_requests(cls, res: Any) -> "RawResponse":
+        return RawResponse(
+            res.content, res.headers, res.url, res.status_code, res.elapsed, res.encoding
         )
 
 
 # --------
 
 
-class ChallengeArg(OwlMixin):
-    seq: int
-    number_of_request: int
-    key: str
-    session: object
-    req: Request
-    host_one: str
-    host_other: str
-    path_one: TOption[PathReplace]
-    path_other: TOption[PathReplace]
-    query_one: TOption[QueryCustomization]
-    query_other: TOption[QueryCustomization]
-    proxy_one: TOption[Proxy]
-    proxy_other: TOption[Proxy]
-    headers_one: TDict[str]
-    headers_other: TDict[str]
-    default_response_encoding_one: TOption[str]
-    default_response_encoding_other: TOption[str]
-    res_dir: str
+class ChallengeArg:
+    """Arguments of a challenge.
+
+    It is created for every trial, so it is a plain class with `__slots__` instead of OwlMixin.
+    """
+
+    __slots__ = (
+        "seq",
+        "number_of_request",
+        "key",
+        "session_one",
+        "session_other",
+        "req",
+        "host_one",
+        "host_other",
+        "path_one",
+        "path_other",
+        "query_one",
+        "query_other",
+        "proxy_one",
+        "proxy_other",
+        "headers_one",
+        "headers_other",
+        "default_response_encoding_one",
+        "default_response_encoding_other",
+        "res_dir",
+        "trial_timeout_ms",
+        "run_deadline",
+        "diff_engine",
+        "trace",
+        "profile_dir",
+    )
+
+    def __init__(
+        self,
+        *,
+        seq: int,
+        number_of_request: int,
+        key: str,
+        session_one: object,
+        session_other: object,
+        req: Request,
+        host_one: str,
+        host_other: str,
+        res_dir: str,
+        path_one: TOption[PathReplace] = TOption(None),
+        path_other: TOption[PathReplace] = TOption(None),
+        query_one: TOption[QueryCustomization] = TOption(None),
+        query_other: TOption[QueryCustomization] = TOption(None),
+        proxy_one: TOption[Proxy] = TOption(None),
+        proxy_other: TOption[Proxy] = TOption(None),
+        headers_one: TDict[str] = TDict(),
+        headers_other: TDict[str] = TDict(),
+        default_response_encoding_one: TOption[str] = TOption(None),
+        default_response_encoding_other: TOption[str] = TOption(None),
+        trial_timeout_ms: TOption[int] = TOption(None),
+        run_deadline: TOption[float] = TOption(None),
+        diff_engine: DiffEngine = DiffEngine.JUMEAUX,  # type: ignore
+        trace: bool = False,
+        profile_dir: TOption[str] = TOption(None),
+    ) -> None:
+        self.seq = seq
+        self.number_of_request = number_of_request
+        self.key = key
+        self.session_one = session_one
+        self.session_other = session_other
+        self.req = req
+        self.host_one = host_one
+        self.host_other = host_other
+        self.path_one = path_one
+        self.path_other = path_other
+        self.query_one = query_one
+        self.query_other = query_other
+        self.proxy_one = proxy_one
+        self.proxy_other = proxy_other
+        self.headers_one = headers_one
+        self.headers_other = headers_other
+        self.default_response_encoding_one = default_response_encoding_one
+        self.default_response_encoding_other = default_response_encoding_other
+        self.res_dir = res_dir
+        self.trial_timeout_ms = trial_timeout_ms
+        self.run_deadline = run_deadline
+        self.diff_engine = diff_engine
+        self.trace = trace
+        self.profile_dir = profile_dir
+
+    def replace(self, **kwargs) -> "ChallengeArg":
+        """Copy whose properties are replaced with `kwargs` like `namedtuple._replace`"""
+        return ChallengeArg(**{**{k: getattr(self, k) for k in self.__slots__}, **kwargs})
 
 
 # --------
@@ -188,6 +313,65 @@ class Time(OwlMixin):
     elapsed_sec: int
 
 
+class ConnectionStats(OwlMixin):
+    requests: int
+    new_connections: int
+    reuse_ratio: float
+
+
+class ConnectionsSummary(OwlMixin):
+    one: ConnectionStats
+    other: ConnectionStats
+
+
+class RecordStats(OwlMixin):
+    mode: RecordMode
+    path: str
+    # Responses of one which were stored
+    recorded: int
+    # Responses of one which were served from the store
+    replayed: int
+    # Responses of one which were not in the store and fetched live
+    missed: int
+
+
+class DedupStats(OwlMixin):
+    # Requests which were challenged (except for ones finished before resumed)
+    unique: int
+    # Requests whose trials were copied from the same request
+    repeated: int
+
+
+class Aborted(OwlMixin):
+    reason: str
+    # Trials which finished before aborted
+    trials: int
+    # Trials which were planned
+    total: int
+
+
+class LatencyStats(OwlMixin):
+    count: int
+    # Milliseconds
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    total: float
+
+
+class AddOnProfile(OwlMixin):
+    layer: str
+    name: str
+    calls: int
+    # Milliseconds
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    # Calls which raised exceptions
+    errors: int
+
+
 class Summary(OwlMixin):
     one: AccessPoint
     other: AccessPoint
@@ -197,6 +381,34 @@ class Summary(OwlMixin):
     concurrency: Concurrency
     output: OutputSummary
     default_encoding: TOption[str]
+    # None if connections are not managed in this process (ex. challenges in worker processes)
+    connections: TOption[ConnectionsSummary]
+    # Only with `record`. None if responses are not recorded in this process (ex. processes mode)
+    record: TOption[RecordStats]
+    # Only with `dedup`
+    dedup: TOption[DedupStats]
+    # None unless the run was aborted by `abort` conditions
+    aborted: TOption[Aborted]
+    # Latencies of stages in trials by stage names (except for failure trials)
+    latencies: TOption[TDict[LatencyStats]]
+    # Only with `profile_addons`. Add-ons in child processes are not included (ex. processes mode)
+    addon_profiles: TOption[TList[AddOnProfile]]
+
+
+class ProgressStatus(OwlMixin):
+    total: int
+    completed: int
+    in_flight: int
+    # Not dispatched yet
+    remaining: int
+    status: StatusCounts
+    elapsed_sec: float
+    # Over the sliding window
+    req_per_sec: float
+    bytes_per_sec: float
+    # None until any trial is completed in the sliding window
+    eta_sec: TOption[float]
+    finished: bool
 
 
 class DiffKeys(OwlMixin):
@@ -243,8 +455,19 @@ class Trial(OwlMixin):
     path: str
     request_time: str
     status: Status
+    # Only if status is failure
+    failure_reason: TOption[FailureReason]
     # `None` is not same as `{}`. `{}` means no diffs, None means unknown
     diffs_by_cognition: TOption[TDict[DiffKeys]]
+    # Only if the request repeats the one of this seq (`dedup`). Responses and result are shared
+    repeat_of: TOption[int]
+
+
+def iter_trials_from_jsonlf(fpath: str) -> Iterator[Trial]:
+    with open(fpath, encoding="utf8") as f:
+        for line in f:
+            if line.strip():
+                yield Trial.from_dict(json.loads(line))
 
 
 class Report(OwlMixin):
@@ -338,6 +561,17 @@ class FinalAddOnPayload(OwlMixin):
     def result_path(self) -> str:
         return f"{self.output_summary.response_dir}/{self.report.key}"
 
+    @property
+    def trials_path(self) -> str:
+        return f"{self.result_path}/trials.jsonl"
+
+    def iter_trials(self) -> Iterator[Trial]:
+        """`report.trials` is empty in streaming mode, so trials are read from `trials_path` lazily
+        """
+        if self.output_summary.streaming.get_or(False):
+            return iter_trials_from_jsonlf(self.trials_path)
+        return iter(self.report.trials)
+
 
 class FinalAddOnReference(OwlMixin):
     notifiers: TOption[TDict[Notifier]]
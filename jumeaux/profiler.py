@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+
+"""Sampling profiler which aggregates stacks of all threads in collapsed-stack format.
+
+A line of collapsed stacks is `<frame of root>;...;<frame of leaf> <count>`.
+It can be rendered by flamegraph.pl, speedscope (https://www.speedscope.app) and so on.
+
+Samples are taken by wall-clock, so threads waiting for responses are sampled too.
+"""
+
+import glob
+import os
+import sys
+import threading
+from collections import Counter
+from multiprocessing.util import Finalize
+from typing import Optional
+
+from jumeaux.logger import Logger
+
+logger: Logger = Logger(__name__)
+
+DEFAULT_INTERVAL_SEC = 0.01
+
+
+def to_frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def to_collapsed_stack(frame, root: str) -> str:
+    names = []
+    while frame is not None:
+        names.append(to_frame_name(frame))
+        frame = frame.f_back
+    return ";".join([root] + names[::-1])
+
+
+class SamplingProfiler:
+    """Samples stacks of all threads in this process every `interval_sec` on a daemon thread.
+
+    `root` is the root frame of all stacks (ex. `main` or `worker`).
+    """
+
+    def __init__(self, root: str, interval_sec: float = DEFAULT_INTERVAL_SEC) -> None:
+        self.root = root
+        self.interval_sec = interval_sec
+        self.pid = os.getpid()
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self):
+        me = threading.get_ident()
+        for tid, frame in sys._current_frames().items():
+            if tid != me:
+                self.stacks[to_collapsed_stack(frame, self.root)] += 1
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_sec):
+            self.sample()
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="jumeaux-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        return self.stacks
+
+
+def write_collapsed(path: str, stacks: Counter):
+    with open(path, "w", encoding="utf8") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed(path: str) -> Counter:
+    stacks: Counter = Counter()
+    with open(path, encoding="utf8") as f:
+        for line in f:
+            stack, count = line.rstrip("\n").rsplit(" ", 1)
+            stacks[stack] += int(count)
+    return stacks
+
+
+# The profiler running in this process
+_profiler: Optional[SamplingProfiler] = None
+_lock = threading.Lock()
+
+
+def start_main() -> SamplingProfiler:
+    """Starts a profiler of the main process. Workers in this process are also sampled by it."""
+    global _profiler
+    with _lock:
+        _profiler = SamplingProfiler("main").start()
+    return _profiler
+
+
+def profile_worker(dir: str):
+    """Starts a profiler of a worker process only once.
+    Its stacks are written to `dir` when the process exits.
+
+    It does nothing in the process which is already profiled (ex. workers are threads).
+    """
+    global _profiler
+    with _lock:
+        # A forked process inherits a profiler whose thread doesn't run in it
+        if _profiler and _profiler.pid == os.getpid():
+            return
+        _profiler = SamplingProfiler("worker").start()
+        Finalize(None, _dump_worker, args=(_profiler, dir), exitpriority=10)
+
+
+def _dump_worker(profiler: SamplingProfiler, dir: str):
+    write_collapsed(os.path.join(dir, f"{profiler.pid}.txt"), profiler.stop())
+
+
+def finish_main(profiler: SamplingProfiler, path: str, workers_dir: str) -> Counter:
+    """Stops the profiler of the main process and writes its stacks and ones of workers to `path`.
+    Workers must have exited before.
+    """
+    global _profiler
+    with _lock:
+        _profiler = None
+
+    stacks = profiler.stop()
+    for p in glob.glob(os.path.join(workers_dir, "*.txt")):
+        stacks = stacks + read_collapsed(p)
+
+    write_collapsed(path, stacks)
+    logger.info_lv1(f"Write a profile ({sum(stacks.values())} samples) to {path}")
+    return stacks
@@ -0,0 +1,136 @@
+# -*- coding:utf-8 -*-
+
+import os
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Optional, Tuple
+
+from jumeaux.domain.config.vo import Progress
+from jumeaux.logger import Logger
+from jumeaux.models import ProgressStatus
+
+logger: Logger = Logger(__name__)
+
+
+def to_bytes(trial: dict) -> int:
+    return sum((trial.get(x) or {}).get("byte") or 0 for x in ("one", "other"))
+
+
+def to_human_bytes(num: float) -> str:
+    for unit in ["B", "KB", "MB"]:
+        if num < 1024:
+            return f"{num:.1f}{unit}"
+        num /= 1024
+    return f"{num:.1f}GB"
+
+
+def to_message(s: ProgressStatus) -> str:
+    percent = s.completed / s.total * 100 if s.total else 100.0
+    eta = s.eta_sec.map(lambda x: f"{x:.0f}s").get_or("-")
+    return (
+        f"Progress: {s.completed}/{s.total} ({percent:.1f}%)"
+        f" | in-flight {s.in_flight} | remaining {s.remaining}"
+        f" | {s.req_per_sec:.1f} req/s | {to_human_bytes(s.bytes_per_sec)}/s"
+        f" | same {s.status.same} / different {s.status.different} / failure {s.status.failure}"
+        f" | ETA {eta}"
+    )
+
+
+class ProgressReporter:
+    """Reports progress of a run to stderr (and `status_file`) every `interval_sec`.
+
+    Trials are recorded by the thread which consumes results, and reported by another thread.
+    """
+
+    def __init__(
+        self,
+        progress: Progress,
+        total: int,
+        in_flight: Callable[[], int],
+        status_counts: Optional[Counter] = None,
+    ) -> None:
+        self.progress = progress
+        self.total = total
+        self.in_flight = in_flight
+        self.lock = threading.Lock()
+        # Counts of a resumed run are included in completed but not in throughput
+        self.status_counts: Counter = Counter(status_counts or {})
+        self.bytes = 0
+        self.begin = time.monotonic()
+        # (time.monotonic(), completed, bytes) in the sliding window
+        self.samples: Deque[Tuple[float, int, int]] = deque(
+            [(self.begin, self.completed(), self.bytes)]
+        )
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def completed(self) -> int:
+        return sum(self.status_counts.values())
+
+    def record(self, trial: dict):
+        with self.lock:
+            self.status_counts[trial["status"]] += 1
+            self.bytes += to_bytes(trial)
+
+    def status(self, now: float, finished: bool = False) -> ProgressStatus:
+        with self.lock:
+            completed = self.completed()
+            self.samples.append((now, completed, self.bytes))
+            # The newest sample before the window is kept as the base
+            while len(self.samples) > 2 and self.samples[1][0] <= now - self.progress.window_sec:
+                self.samples.popleft()
+            base_time, base_completed, base_bytes = self.samples[0]
+            status = dict(self.status_counts)
+            bytes = self.bytes
+
+        sec = now - base_time
+        req_per_sec = (completed - base_completed) / sec if sec > 0 else 0.0
+        bytes_per_sec = (bytes - base_bytes) / sec if sec > 0 else 0.0
+        in_flight = 0 if finished else self.in_flight()
+
+        return ProgressStatus.from_dict(
+            {
+                "total": self.total,
+                "completed": completed,
+                "in_flight": in_flight,
+                "remaining": max(self.total - completed - in_flight, 0),
+                "status": status,
+                "elapsed_sec": round(now - self.begin, 3),
+                "req_per_sec": round(req_per_sec, 3),
+                "bytes_per_sec": round(bytes_per_sec, 3),
+                "eta_sec": round((self.total - completed) / req_per_sec, 3)
+                if req_per_sec > 0
+                else None,
+                "finished": finished,
+            }
+        )
+
+    def report(self, finished: bool = False) -> ProgressStatus:
+        status = self.status(time.monotonic(), finished)
+        logger.info_lv1(to_message(status))
+
+        status_file: Optional[str] = self.progress.status_file.get()
+        if status_file:
+            # Readers never see a half-written file
+            tmp = f"{status_file}.tmp"
+            status.to_jsonf(tmp)
+            os.replace(tmp, status_file)
+
+        return status
+
+    def _run(self):
+        while not self._stopped.wait(self.progress.interval_sec):
+            self.report()
+
+    def start(self) -> "ProgressReporter":
+        self._thread = threading.Thread(target=self._run, name="jumeaux-progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> ProgressStatus:
+        """Stops reporting and reports the last progress"""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+        return self.report(finished=True)
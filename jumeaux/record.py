@@ -0,0 +1,190 @@
+# -*- coding:utf-8 -*-
+
+"""Record and replay of responses of `one`.
+
+`one` is often a stable build requested with the same requests every run.
+Its responses are recorded to a SQLite database keyed by the resolved request,
+and replayed from it so that only `other` is requested live.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from jumeaux.domain.config.vo import Record, RecordMode
+from jumeaux.logger import Logger
+from jumeaux.models import RawResponse, RecordStats
+
+logger: Logger = Logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    encoding TEXT,
+    elapsed_sec REAL NOT NULL,
+    content BLOB NOT NULL
+)
+"""
+
+
+def to_key(method: str, url: str, headers: Optional[dict], data=None, json_=None) -> str:
+    """Key of a resolved request.
+    The default User-Agent (jumeaux/x.y.z) is excluded so that records survive upgrades.
+    """
+    headers = {
+        k: v
+        for k, v in (headers or {}).items()
+        if not (k.lower() == "user-agent" and v.startswith("jumeaux/"))
+    }
+    request = json.dumps([method, url, headers, data, json_], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(request.encode("utf8")).hexdigest()
+
+
+class ResponseStore:
+    """Responses in a SQLite database. It is shared by threads of a process."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        # Readers (ex. other processes) are not blocked by a writer
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def get(self, key: str) -> Optional[RawResponse]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT url, status_code, headers, encoding, elapsed_sec, content"
+                " FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        url, status_code, headers, encoding, elapsed_sec, content = row
+        return RawResponse(
+            content,
+            CaseInsensitiveDict(json.loads(headers)),
+            url,
+            status_code,
+            datetime.timedelta(seconds=elapsed_sec),
+            encoding,
+        )
+
+    def put(self, key: str, method: str, res) -> None:
+        """:param res: `requests.Response` or `RawResponse`"""
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    method,
+                    res.url,
+                    res.status_code,
+                    json.dumps(dict(res.headers), ensure_ascii=False),
+                    res.encoding,
+                    res.elapsed.total_seconds(),
+                    res.content,
+                ),
+            )
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class RecordedSession:
+    """Session of `one` which records responses to, or replays them from `ResponseStore`.
+
+    It has the same interface as `PooledSession` which it wraps.
+    Requests which are not in the store are sent by the wrapped session even in replay mode.
+    It is picklable for `ProcessPoolExecutor`, and each process opens the store by itself.
+    """
+
+    def __init__(self, session, record: Record) -> None:
+        self.session = session
+        self.record = record
+        self._init()
+
+    def _init(self):
+        self.lock = threading.Lock()
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+        self._store: Optional[ResponseStore] = None
+        self._pid: Optional[int] = None
+
+    def __getstate__(self) -> dict:
+        return {"session": self.session, "record": self.record}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._init()
+
+    @property
+    def store(self) -> ResponseStore:
+        # A connection must not be shared with a forked process
+        with self.lock:
+            if self._store is None or self._pid != os.getpid():
+                self._store = ResponseStore(self.record.path)
+                self._pid = os.getpid()
+            return self._store
+
+    def _count(self, name: str):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def request(self, method: str, url: str, **kwargs):
+        key = to_key(method, url, kwargs.get("headers"), kwargs.get("data"), kwargs.get("json"))
+
+        if self.record.mode is RecordMode.REPLAY:
+            res: Optional[RawResponse] = self.store.get(key)
+            if res is not None:
+                self._count("replayed")
+                return res
+            logger.info_lv3(f"Not recorded, so request live: {method} {url}")
+            self._count("missed")
+            return self.session.request(method, url, **kwargs)
+
+        res = self.session.request(method, url, **kwargs)
+        self.store.put(key, method, res)
+        self._count("recorded")
+        return res
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        return self.session.stats()
+
+    def to_stats(self) -> RecordStats:
+        with self.lock:
+            return RecordStats.from_dict(
+                {
+                    "mode": self.record.mode,
+                    "path": self.record.path,
+                    "recorded": self.recorded,
+                    "replayed": self.replayed,
+                    "missed": self.missed,
+                }
+            )
+
+    def close(self):
+        self.session.close()
+        if self._store is not None and self._pid == os.getpid():
+            self._store.close()
@@ -0,0 +1,74 @@
+# -*- coding:utf-8 -*-
+
+"""Longest-expected-first scheduling of requests by response times of a previous run.
+
+Challenging slow requests first shortens the wall time of a run with a fixed number of workers,
+because they no longer run alone at the end of it.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from owlmixin import TList
+
+from jumeaux.domain.config.vo import Schedule, ScheduleKey
+from jumeaux.logger import Logger
+from jumeaux.models import Request
+
+logger: Logger = Logger(__name__)
+
+
+def to_expected_sec(trial: dict) -> Optional[float]:
+    """one and other are requested at the same time, so the slower one is the time of a challenge"""
+    secs = [
+        x
+        for x in ((trial.get(side) or {}).get("response_sec") for side in ("one", "other"))
+        if x is not None
+    ]
+    return max(secs) if secs else None
+
+
+def load_expected_secs(trials: List[dict], by: ScheduleKey) -> Dict[str, float]:
+    """:return: Mean seconds of trials by `by`. Trials without response times are ignored"""
+    secs: Dict[str, List[float]] = {}
+    for t in trials:
+        sec = to_expected_sec(t)
+        if sec is not None:
+            secs.setdefault(t[by.value], []).append(sec)
+    return {k: sum(v) / len(v) for k, v in secs.items()}
+
+
+def to_key(req: Request, seq: int, by: ScheduleKey) -> str:
+    # Same as `Trial.name` and `Trial.path`
+    return req.name.get_or(str(seq)) if by is ScheduleKey.NAME else req.path
+
+
+def order_longest_first(
+    reqs: TList[Request], expected_secs: Dict[str, float], by: ScheduleKey
+) -> List[int]:
+    """:return: Indexes of `reqs` in descending order of expected seconds.
+    Requests not in `expected_secs` are expected to take the mean of them.
+    Requests expected to take the same time keep their order.
+    """
+    default = sum(expected_secs.values()) / len(expected_secs) if expected_secs else 0.0
+    expected = [expected_secs.get(to_key(r, i + 1, by), default) for i, r in enumerate(reqs)]
+    return sorted(range(len(reqs)), key=lambda i: -expected[i])
+
+
+def schedule(reqs: TList[Request], config: Schedule) -> List[int]:
+    """:return: Indexes of `reqs` in order of challenges"""
+    by: ScheduleKey = config.by.get_or(ScheduleKey.PATH)
+    try:
+        with open(config.report, encoding=config.encoding) as f:
+            trials: List[dict] = json.load(f).get("trials") or []
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to read {config.report} for schedule. ({e})", exit=True)
+
+    expected_secs = load_expected_secs(trials, by)
+    order = order_longest_first(reqs, expected_secs, by)
+    matched = sum(to_key(r, i + 1, by) in expected_secs for i, r in enumerate(reqs))
+    logger.info_lv1(
+        f"Schedule longest expected first by {by.value}: "
+        f"{matched} / {len(reqs)} requests are found in {config.report}"
+    )
+    return order
@@ -0,0 +1,58 @@
+# -*- coding:utf-8 -*-
+
+import json
+import os
+import threading
+from typing import List, Optional
+
+
+def to_us(sec: float) -> int:
+    return int(sec * 1000000)
+
+
+def create_span(name: str, category: str, begin: float, end: float, **args) -> dict:
+    """Complete event ("X") of the current thread. `begin` and `end` are `time.perf_counter()`."""
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": to_us(begin),
+        "dur": to_us(end - begin),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": args,
+    }
+
+
+def create_async_span(
+    name: str, category: str, id: int, begin: float, end: float, **args
+) -> List[dict]:
+    """Begin ("b") and end ("e") events which can overlap others in a same thread (ex. trials)"""
+    common = {"name": name, "cat": category, "id": id, "pid": os.getpid(), "tid": 0}
+    return [
+        {**common, "ph": "b", "ts": to_us(begin), "args": args},
+        {**common, "ph": "e", "ts": to_us(end)},
+    ]
+
+
+class TraceWriter:
+    """`trace.json` in Chrome trace event format (JSON array format).
+
+    Events are written one by one, so a trace of an interrupted run can be opened too.
+    It can be viewed by Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "w", encoding="utf8")
+        self.file.write("[\n")
+        self.first = True
+
+    def write(self, events: Optional[List[dict]]):
+        for e in events or []:
+            self.file.write(("" if self.first else ",\n") + json.dumps(e, ensure_ascii=False))
+            self.first = False
+
+    def close(self):
+        self.file.write("\n]\n")
+        self.file.close()
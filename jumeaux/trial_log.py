@@ -0,0 +1,93 @@
+# -*- coding:utf-8 -*-
+
+import json
+import os
+from collections import Counter
+from typing import List, Optional, Set, Tuple
+
+from jumeaux.logger import Logger
+
+logger: Logger = Logger(__name__)
+
+
+class TrialLog:
+    """Append-only `trials.jsonl` which has a dict like `Trial` in each line.
+
+    Each trial is flushed as soon as it is written so that finished trials survive a crash.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "a", encoding="utf8")
+
+    def write(self, trial: dict):
+        self.file.write(json.dumps(trial, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "TrialLog":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def recover(path: str) -> Tuple[Set[int], Counter]:
+    """Read seqs and status counts of trials which were already written to `path`.
+
+    A broken last line (ex. killed while writing) is truncated so that the log can be appended.
+    """
+    seqs: Set[int] = set()
+    status_counts: Counter = Counter()
+    valid_size = 0
+
+    with open(path, "rb") as f:
+        for line in f:
+            # Every trial is written with a line break, so a line without it is broken
+            if not line.endswith(b"\n"):
+                break
+            try:
+                trial: Optional[dict] = json.loads(line.decode("utf8")) if line.strip() else None
+            except ValueError:
+                break
+            if trial is not None:
+                seqs.add(trial["seq"])
+                status_counts[trial["status"]] += 1
+            valid_size += len(line)
+
+    if valid_size < os.path.getsize(path):
+        logger.warning(f"Truncate a broken line at the end of {path}")
+        with open(path, "rb+") as f:
+            f.truncate(valid_size)
+
+    return seqs, status_counts
+
+
+def sort_by_seq(path: str) -> bool:
+    """Sort trials in `path` by seq if they were written in another order (ex. `schedule`).
+
+    Only seqs and offsets of lines are held in memory.
+    :return: True if they were sorted
+    """
+    # (seq, offset, length)
+    lines: List[Tuple[int, int, int]] = []
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                lines.append((json.loads(line.decode("utf8"))["seq"], offset, len(line)))
+            offset += len(line)
+
+    if all(x[0] < y[0] for x, y in zip(lines, lines[1:])):
+        return False
+
+    # Readers never see a half-written file
+    tmp = f"{path}.tmp"
+    with open(path, "rb") as src, open(tmp, "wb") as dst:
+        for _, offset, length in sorted(lines):
+            src.seek(offset)
+            dst.write(src.read(length))
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+
+import threading
+from typing import Any, Optional, Set
+
+
+class InFlightWindow:
+    """Bounds challenges which are submitted but not completed yet.
+
+    A key is acquired by the thread which submits challenges and released by the one which
+    consumes their results. Results are handled as they complete, so a slow challenge holds only
+    its own place and never blocks later ones. The order of `seq` is restored only when trials
+    are finalized (`trials.order_by` and `trial_log.sort_by_seq`).
+    """
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        self.window = window
+        self.condition = threading.Condition()
+        self.keys: Set[Any] = set()
+        self.max_size: int = 0
+        self.closed = False
+
+    def _has_room(self) -> bool:
+        return not self.window or len(self.keys) < self.window
+
+    def _add(self, key):
+        self.keys.add(key)
+        self.max_size = max(self.max_size, len(self.keys))
+
+    def try_acquire(self, key) -> bool:
+        """Takes a place of `key` in the window without waiting"""
+        with self.condition:
+            if self.closed or not self._has_room():
+                return False
+            self._add(key)
+            return True
+
+    def acquire(self, key) -> bool:
+        """Waits for a place of `key` in the window. False if it was closed while waiting"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.closed or self._has_room())
+            if self.closed:
+                return False
+            self._add(key)
+            return True
+
+    def release(self, key):
+        with self.condition:
+            self.keys.discard(key)
+            self.condition.notify_all()
+
+    def close(self):
+        """Stops waiting for places in the window"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import os
+from typing import Callable
+
+import pytest
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from jumeaux.models import FinalAddOnPayload, Report
+from jumeaux.trial_log import TrialLog
+
+KEY = "5fd8d8a7fbd0f6bb8eb75e5a89c8e58e8d1e6d5be3b0c9e2dcd5ec3e7cd2c3b1"
+
+
+def create_trial(seq: int, status: str, response_sec: float) -> dict:
+    return {
+        "seq": seq,
+        "name": f"リクエスト{seq}",
+        "tags": [],
+        "headers": {"x-id": str(seq)},
+        "queries": {"q": ["1", "2"]},
+        "one": {
+            "url": f"http://host/one/api?seq={seq}",
+            "type": "json",
+            "status_code": 200,
+            "byte": 10,
+            "response_sec": response_sec,
+            "content_type": "application/json",
+            "mime_type": "application/json",
+            "encoding": "utf8",
+        },
+        "other": {
+            "url": f"http://host/other/api?seq={seq}",
+            "type": "json",
+            "status_code": 200,
+            "byte": 12,
+            "response_sec": response_sec * 2,
+            "content_type": "application/json",
+            "mime_type": "application/json",
+            "encoding": "utf8",
+        },
+        "method": "GET",
+        "path": "/api",
+        "request_time": "2000/01/01 10:10:10.000010",
+        "status": status,
+        "diffs_by_cognition": {"unknown": {"added": [], "changed": ["root<'id'>"], "removed": []}}
+        if status == "different"
+        else None,
+    }
+
+
+TRIALS = [
+    create_trial(1, "same", 0.02),
+    create_trial(2, "different", 0.3),
+    create_trial(3, "same", 1.2),
+]
+
+
+@pytest.fixture
+def create_payload(tmpdir) -> Callable[[bool], FinalAddOnPayload]:
+    """Returns a payload whose trials are in `report.trials`, or in `trials.jsonl` if streaming"""
+
+    def func(streaming: bool) -> FinalAddOnPayload:
+        response_dir = str(tmpdir.join("streaming" if streaming else "default"))
+        os.makedirs(f"{response_dir}/{KEY}")
+        if streaming:
+            with TrialLog(f"{response_dir}/{KEY}/trials.jsonl") as log:
+                for t in TRIALS:
+                    log.write(t)
+
+        output = {"response_dir": response_dir, "encoding": "utf8", "streaming": streaming}
+        report = Report.from_dict(
+            {
+                "version": "2.0.0",
+                "key": KEY,
+                "title": "テスト",
+                "summary": {
+                    "one": {"name": "one", "host": "http://host/one"},
+                    "other": {"name": "other", "host": "http://host/other"},
+                    "status": {"same": 2, "different": 1, "failure": 0},
+                    "tags": [],
+                    "time": {
+                        "start": "2000/01/01 10:10:10",
+                        "end": "2000/01/01 10:10:12",
+                        "elapsed_sec": 2,
+                    },
+                    "concurrency": {"threads": 1, "processes": 1},
+                    "output": output,
+                },
+                "trials": [] if streaming else TRIALS,
+            }
+        )
+        return FinalAddOnPayload.from_dict({"report": report, "output_summary": output})
+
+    return func
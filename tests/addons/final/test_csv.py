@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import pytest
+
+from jumeaux.addons.final.csv import Executor
+from jumeaux.models import FinalAddOnReference
+
+COLUMN_NAMES = [
+    "seq",
+    "name",
+    "headers",
+    "queries",
+    "status",
+    "one.status",
+    "one.response_sec",
+    "other.byte",
+    "other.encoding",
+]
+
+EXPECTED = """
+seq,name,headers,queries,status,one.status,one.response_sec,other.byte,other.encoding
+1,リクエスト1,"{""x-id"": ""1""}","{""q"": [""1"",""2""]}",same,200,0.02,12,utf8
+2,リクエスト2,"{""x-id"": ""2""}","{""q"": [""1"",""2""]}",different,200,0.3,12,utf8
+3,リクエスト3,"{""x-id"": ""3""}","{""q"": [""1"",""2""]}",same,200,1.2,12,utf8
+""".lstrip()
+
+
+class TestExec:
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test(self, create_payload, tmpdir, streaming):
+        output_path = str(tmpdir.join("trials.csv"))
+        config = {"column_names": COLUMN_NAMES, "output_path": output_path, "with_header": True}
+
+        Executor(config).exec(create_payload(streaming), FinalAddOnReference.from_dict({}))
+
+        with open(output_path, encoding="utf8", newline="") as f:
+            assert f.read() == EXPECTED
+
+    def test_without_header(self, create_payload, tmpdir):
+        output_path = str(tmpdir.join("trials.csv"))
+        config = {"column_names": ["seq", "status"], "output_path": output_path}
+
+        Executor(config).exec(create_payload(True), FinalAddOnReference.from_dict({}))
+
+        with open(output_path, encoding="utf8", newline="") as f:
+            assert f.read() == "1,same\n2,different\n3,same\n"
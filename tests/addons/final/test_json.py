@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import pytest
+
+from owlmixin import TList
+
+from jumeaux.addons.final.json import Executor
+from jumeaux.models import FinalAddOnPayload, FinalAddOnReference, Report
+
+
+def read(path: str) -> str:
+    with open(path, encoding="utf8") as f:
+        return f.read()
+
+
+def with_trials(payload: FinalAddOnPayload) -> Report:
+    """The report which holds all trials as the default mode does"""
+    return Report.from_dict(
+        {**payload.report.to_dict(), "trials": TList(payload.iter_trials()).to_dicts()}
+    )
+
+
+class TestExec:
+    @pytest.mark.parametrize("indent", [None, 0, 2, 4])
+    def test_streaming_is_same_as_default(self, create_payload, indent):
+        payload = create_payload(True)
+
+        Executor({"indent": indent}).exec(payload, FinalAddOnReference.from_dict({}))
+
+        assert read(f"{payload.result_path}/report.json") == with_trials(payload).to_json(
+            indent=indent
+        )
+
+    def test_default(self, create_payload):
+        payload = create_payload(False)
+
+        Executor({"indent": 2}).exec(payload, FinalAddOnReference.from_dict({}))
+
+        assert read(f"{payload.result_path}/report.json") == payload.report.to_json(indent=2)
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_streaming_without_trials(self, create_payload, indent):
+        payload = create_payload(True)
+        open(payload.trials_path, "w").close()
+
+        Executor({"indent": indent}).exec(payload, FinalAddOnReference.from_dict({}))
+
+        assert read(f"{payload.result_path}/report.json") == payload.report.to_json(indent=indent)
+
+    def test_streaming_sysout(self, create_payload, capsys):
+        payload = create_payload(True)
+
+        Executor({"sysout": True}).exec(payload, FinalAddOnReference.from_dict({}))
+
+        assert capsys.readouterr().out == with_trials(payload).to_json() + "\n"
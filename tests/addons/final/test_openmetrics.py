@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import pytest
+
+from jumeaux.addons.final.openmetrics import Executor
+from jumeaux.models import FinalAddOnReference
+
+
+def read(path: str) -> str:
+    with open(path, encoding="utf8") as f:
+        return f.read()
+
+
+class TestExec:
+    def test_streaming_is_same_as_default(self, create_payload):
+        default = create_payload(False)
+        streaming = create_payload(True)
+
+        for payload in [default, streaming]:
+            Executor({}).exec(payload, FinalAddOnReference.from_dict({}))
+
+        assert read(f"{streaming.result_path}/metrics.prom") == read(
+            f"{default.result_path}/metrics.prom"
+        )
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test(self, create_payload, tmpdir, streaming):
+        path = str(tmpdir.join("jumeaux.prom"))
+
+        Executor({"path": path, "labels": {"job": "test"}}).exec(
+            create_payload(streaming), FinalAddOnReference.from_dict({})
+        )
+
+        lines = read(path).splitlines()
+        assert [x for x in lines if x.startswith("jumeaux_trials_total")] == [
+            'jumeaux_trials_total{job="test",status="same"} 2',
+            'jumeaux_trials_total{job="test",status="different"} 1',
+            'jumeaux_trials_total{job="test",status="failure"} 0',
+        ]
+        assert [x for x in lines if x.startswith("jumeaux_response_seconds_count")] == [
+            'jumeaux_response_seconds_count{job="test",side="one"} 3',
+            'jumeaux_response_seconds_count{job="test",side="other"} 3',
+        ]
+        assert 'jumeaux_response_bytes_total{job="test",side="other"} 36' in lines
+        assert lines[-1] == "# EOF"
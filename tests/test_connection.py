@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import pickle
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from jumeaux.connection import PooledSession
+from jumeaux.models import ConnectionPool, Timeout
+from requests.exceptions import ReadTimeout
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """Same as `http.server.ThreadingHTTPServer` which is not in Python 3.6"""
+
+    daemon_threads = True
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def create_session(
+    pool: dict = None, timeout: dict = None, max_retries: int = 0, retry_read: bool = True
+) -> PooledSession:
+    return PooledSession(
+        "one",
+        ConnectionPool.from_optional_dict(pool),
+        max_retries,
+        1,
+        Timeout.from_optional_dict(timeout),
+        retry_read,
+    )
+
+
+class TestPooledSession:
+    def test_reuse_connection(self, url):
+        session = create_session()
+        for _ in range(4):
+            assert session.get(url).status_code == 200
+
+        assert session.stats().to_dict() == {
+            "requests": 4,
+            "new_connections": 1,
+            "reuse_ratio": 0.75,
+        }
+
+    def test_idle_timeout(self, url):
+        session = create_session({"idle_timeout_sec": 0})
+        for _ in range(3):
+            session.get(url)
+
+        assert session.stats().to_dict() == {
+            "requests": 3,
+            "new_connections": 3,
+            "reuse_ratio": 0.0,
+        }
+
+    def test_max_connections(self, url):
+        session = create_session({"max_connections": 2})
+        assert session.semaphore is not None
+        assert session.adapter._pool_maxsize == 2
+
+    def test_timeout(self, url):
+        session = create_session(timeout={"connect_ms": 1000, "read_ms": 100})
+        assert session.requests_timeout == (1.0, 0.1)
+
+        assert session.get(url).status_code == 200
+        with pytest.raises(ReadTimeout):
+            session.get(f"{url}slow")
+
+    def test_no_timeout(self):
+        assert create_session().requests_timeout is None
+        assert create_session(timeout={"read_ms": 100}).requests_timeout == (None, 0.1)
+
+    def test_remaining_sec(self, url):
+        session = create_session()
+        with pytest.raises(ReadTimeout):
+            session.get(f"{url}slow", remaining_sec=0.1)
+        assert session.to_requests_timeout(0) == 0.001
+
+        # Each configured timeout is capped at the remaining time
+        session = create_session(timeout={"read_ms": 100})
+        assert session.to_requests_timeout(5) == (5, 0.1)
+        assert session.to_requests_timeout(0.05) == (0.05, 0.05)
+
+    def test_no_read_retries(self, url):
+        session = create_session(max_retries=3, retry_read=False)
+
+        begin = time.monotonic()
+        with pytest.raises(ReadTimeout):
+            session.get(f"{url}slow", remaining_sec=0.1)
+        # Not multiplied by retries
+        assert time.monotonic() - begin < 0.3
+
+    def test_no_requests(self):
+        assert create_session().stats().to_dict() == {
+            "requests": 0,
+            "new_connections": 0,
+            "reuse_ratio": 0.0,
+        }
+
+    def test_pickle(self, url):
+        session = create_session({"max_keepalive": 3})
+        session.get(url)
+
+        actual: PooledSession = pickle.loads(pickle.dumps(session))
+
+        assert actual.pool.get().to_dict() == {"max_keepalive": 3}
+        assert actual.adapter._pool_maxsize == 3
+        assert actual.stats().requests == 0
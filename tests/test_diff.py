@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import random
+
+import pytest
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from jumeaux.diff import diff
+from jumeaux.domain.config.vo import DiffEngine
+from jumeaux.executor import create_diff_keys
+
+
+def random_tree(rnd: random.Random, depth: int):
+    kind = rnd.randrange(6 if depth > 0 else 4)
+    if kind == 0:
+        return rnd.choice([0, 1, 1.0, 2.5, -3])
+    if kind == 1:
+        return rnd.choice(["a", "b", "", "x[0]"])
+    if kind == 2:
+        return rnd.choice([True, False])
+    if kind == 3:
+        return None
+    if kind == 4:
+        return [random_tree(rnd, depth - 1) for _ in range(rnd.randrange(4))]
+    return {
+        rnd.choice(["id", "name", "items", "k[1]"]): random_tree(rnd, depth - 1)
+        for _ in range(rnd.randrange(4))
+    }
+
+
+CASES = [
+    ({}, {}),
+    ({"a": 1}, {"a": 1}),
+    ({"a": 1}, {"a": 2}),
+    ({"a": 1}, {"a": 1.0}),
+    ({"a": 1}, {"a": "1"}),
+    ({"a": None}, {"a": 0}),
+    ({"a": True}, {"a": 1}),
+    ({"a": 1}, {"b": 1}),
+    ({"a": {"b": [1, 2, 3]}}, {"a": {"b": [1, 5]}}),
+    ({"a": [1]}, {"a": [1, {"c": 3}]}),
+    ({"a": {"b": 1}}, {"a": [1]}),
+    ({"a[0]": {"x]": 1}}, {"a[0]": {"x]": 2}}),
+    ([1, 2, 3], [3, 2, 1]),
+    ([{"id": 1}, {"id": 2}], [{"id": 1, "name": "n"}]),
+    ({"a": [[1, 2], [3]]}, {"a": [[1], [3, 4]]}),
+]
+
+
+class TestDiff:
+    @pytest.mark.parametrize("one, other", CASES)
+    def test_same_as_deepdiff(self, one, other):
+        assert (
+            diff(one, other).to_dict()
+            == create_diff_keys(one, other, DiffEngine.DEEPDIFF).to_dict()
+        )
+
+    def test_same_as_deepdiff_on_random_trees(self):
+        rnd = random.Random(0)
+        for _ in range(500):
+            one = random_tree(rnd, 4)
+            other = random_tree(rnd, 4)
+            assert (
+                diff(one, other).to_dict()
+                == create_diff_keys(one, other, DiffEngine.DEEPDIFF).to_dict()
+            ), (one, other)
+
+    def test_keys(self):
+        actual = diff(
+            {"a": 1, "b": [1, 2], "c": {"d": "x"}}, {"a": 2, "b": [1], "c": {"d": "x", "e[0]": 1}}
+        )
+
+        assert actual.to_dict() == {
+            "added": ["root<'c'><'e<0>'>"],
+            "changed": ["root<'a'>"],
+            "removed": ["root<'b'><1>"],
+        }
+
+    def test_jumeaux_engine(self):
+        assert create_diff_keys({"a": 1}, {"a": 2}, DiffEngine.JUMEAUX).to_dict() == {
+            "added": [],
+            "changed": ["root<'a'>"],
+            "removed": [],
+        }
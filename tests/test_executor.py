@@ -2,23 +2,48 @@
 # -*- coding:utf-8 -*-
 # pylint: disable=no-self-use,duplicate-code
 
+import asyncio
 import datetime
+import json
 import os
 import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent import futures
 from datetime import timezone, timedelta
-from typing import Optional, Dict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Optional, Dict, Tuple
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
-from owlmixin import TList, TDict
-from requests.exceptions import ConnectionError
+from owlmixin import TList, TDict, TOption
+from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
 
 from jumeaux import executor, __version__
 from jumeaux.addons import AddOnExecutor, Addons
 from jumeaux.executor import create_query_string, merge_headers
-from jumeaux.domain.config.vo import Config
-from jumeaux.models import CaseInsensitiveDict, ChallengeArg, Request, Report, QueryCustomization
+from jumeaux.domain.config.vo import Config, AbortCondition
+from jumeaux.latency import StageTimer
+from jumeaux.limiter import ChallengeLimiter
+from jumeaux.window import InFlightWindow
+from jumeaux.models import (
+    CaseInsensitiveDict,
+    ChallengeArg,
+    Request,
+    Report,
+    QueryCustomization,
+    FinalAddOnPayload,
+    DiffKeys,
+    FailureReason,
+    Response,
+    Status,
+    Trial,
+)
 
 
 def mock_date(year, month, day, hour, minute, second, microsecond):
@@ -144,26 +169,23 @@ class TestChallenge:
         now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
         store_criterion.return_value = True
 
-        args: ChallengeArg = ChallengeArg.from_dict(
-            {
-                "seq": 1,
-                "number_of_request": 10,
-                "key": "hash_key",
-                "session": "dummy",
-                "req": {
+        args: ChallengeArg = ChallengeArg(
+            seq=1,
+            number_of_request=10,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict(
+                {
                     "name": "name1",
                     "path": "/challenge",
                     "qs": {"q1": ["1"], "q2": ["2-1", "2-2"]},
                     "headers": {"header1": "1", "header2": "2"},
-                },
-                "host_one": "hoge_one",
-                "host_other": "hoge_other",
-                "res_dir": "tmpdir",
-                "proxy_one": None,
-                "proxy_other": None,
-                "headers_one": {},
-                "headers_other": {},
-            }
+                }
+            ),
+            host_one="hoge_one",
+            host_other="hoge_other",
+            res_dir="tmpdir",
         )
 
         actual = executor.challenge(args)
@@ -232,13 +254,14 @@ class TestChallenge:
         now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
         store_criterion.return_value = False
 
-        args: ChallengeArg = ChallengeArg.from_dict(
-            {
-                "seq": 1,
-                "number_of_request": 10,
-                "key": "hash_key",
-                "session": "dummy",
-                "req": {
+        args: ChallengeArg = ChallengeArg(
+            seq=1,
+            number_of_request=10,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict(
+                {
                     "name": "name2",
                     "method": "POST",
                     "path": "/challenge",
@@ -247,15 +270,11 @@ class TestChallenge:
                     "raw": "dummy",
                     "form": {"form": "dummy"},
                     "json": {"json": "dummy"},
-                },
-                "host_one": "hoge_one",
-                "host_other": "hoge_other",
-                "res_dir": "tmpdir",
-                "proxy_one": None,
-                "proxy_other": None,
-                "headers_one": {},
-                "headers_other": {},
-            }
+                }
+            ),
+            host_one="hoge_one",
+            host_other="hoge_other",
+            res_dir="tmpdir",
         )
         actual = executor.challenge(args)
 
@@ -265,6 +284,8 @@ class TestChallenge:
             "tags": [],
             "request_time": "2000-01-01T10:10:10.000010+09:00",
             "status": "same",
+            # Byte-identical bodies have no diffs even if they can't be parsed
+            "diffs_by_cognition": {},
             "method": "POST",
             "path": "/challenge",
             "queries": {"q1": ["1"], "q2": ["2-1", "2-2"]},
@@ -296,31 +317,37 @@ class TestChallenge:
 
         assert actual == expected
 
-    def test_failure(self, concurrent_request, now, store_criterion):
-        concurrent_request.side_effect = ConnectionError
+    @pytest.mark.parametrize(
+        "error, expected_reason",
+        [
+            (ConnectionError, "connection_error"),
+            (ConnectTimeout, "timeout"),
+            (ReadTimeout, "timeout"),
+            (futures.TimeoutError, "trial_timeout"),
+        ],
+    )
+    def test_failure(self, concurrent_request, now, store_criterion, error, expected_reason):
+        concurrent_request.side_effect = error
         now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
         store_criterion.return_value = False
 
-        args: ChallengeArg = ChallengeArg.from_dict(
-            {
-                "seq": 1,
-                "number_of_request": 10,
-                "key": "hash_key",
-                "session": "dummy",
-                "req": {
+        args: ChallengeArg = ChallengeArg(
+            seq=1,
+            number_of_request=10,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict(
+                {
                     "name": "name3",
                     "path": "/challenge",
                     "qs": {"q1": ["1"]},
                     "headers": {"header1": "1", "header2": "2"},
-                },
-                "host_one": "http://one",
-                "host_other": "http://other",
-                "res_dir": "tmpdir",
-                "proxy_one": None,
-                "proxy_other": None,
-                "headers_one": {},
-                "headers_other": {},
-            }
+                }
+            ),
+            host_one="http://one",
+            host_other="http://other",
+            res_dir="tmpdir",
         )
         actual = executor.challenge(args)
 
@@ -330,6 +357,7 @@ class TestChallenge:
             "tags": [],
             "request_time": "2000-01-01T10:10:10.000010+09:00",
             "status": "failure",
+            "failure_reason": expected_reason,
             "method": "GET",
             "path": "/challenge",
             "queries": {"q1": ["1"]},
@@ -497,8 +525,14 @@ class TestMergeHeaders:
         assert expected == actual.to_dict()
 
 
+def create_timer(elapsed_ms: Dict[str, float]) -> StageTimer:
+    timer = StageTimer()
+    timer.elapsed_ms = elapsed_ms
+    return timer
+
+
 @patch("jumeaux.executor.now")
-@patch("jumeaux.executor.challenge")
+@patch("jumeaux.executor.challenge_with_stages")
 @patch("jumeaux.executor.hash_from_args")
 class TestExec:
     """TODO: Multi process test to fix dead lock!!!
@@ -517,7 +551,7 @@ class TestExec:
         dummy_hash = "dummy hash"
 
         hash_from_args.return_value = dummy_hash
-        challenge.side_effect = [
+        trials = [
             {
                 "seq": 1,
                 "name": "name1",
@@ -577,6 +611,10 @@ class TestExec:
                 },
             },
         ]
+        challenge.side_effect = [
+            (trials[0], create_timer({"request_one": 1230.0, "request_other": 9880.0, "diff": 1.5})),
+            (trials[1], create_timer({"request_one": 1000.0, "request_other": 2000.0, "diff": 0.5})),
+        ]
         now.side_effect = [
             mock_date(2000, 1, 1, 23, 50, 30, 100),
             mock_date(2000, 1, 2, 0, 0, 0, 200),
@@ -684,6 +722,36 @@ class TestExec:
                 "status": {"same": 1, "different": 1, "failure": 0},
                 "output": {"encoding": "utf8", "response_dir": "tmpdir"},
                 "concurrency": {"threads": 1, "processes": 1},
+                "connections": {
+                    "one": {"requests": 0, "new_connections": 0, "reuse_ratio": 0.0},
+                    "other": {"requests": 0, "new_connections": 0, "reuse_ratio": 0.0},
+                },
+                "latencies": {
+                    "request_one": {
+                        "count": 2,
+                        "p50": 1000.0,
+                        "p90": 1230.0,
+                        "p99": 1230.0,
+                        "max": 1230.0,
+                        "total": 2230.0,
+                    },
+                    "request_other": {
+                        "count": 2,
+                        "p50": 2000.0,
+                        "p90": 9880.0,
+                        "p99": 9880.0,
+                        "max": 9880.0,
+                        "total": 11880.0,
+                    },
+                    "diff": {
+                        "count": 2,
+                        "p50": 0.5,
+                        "p90": 1.5,
+                        "p99": 1.5,
+                        "max": 1.5,
+                        "total": 2.0,
+                    },
+                },
             },
             "trials": [
                 {
@@ -748,3 +816,1026 @@ class TestExec:
         }
 
         assert expected == actual.to_dict()
+
+
+def create_http_response(args) -> MagicMock:
+    url: str = args[1]
+    body: bytes = b'{"id": 2}' if "diff" in url and "other" in url else b'{"id": 1}'
+    return (
+        ResponseBuilder()
+        .text(body.decode())
+        .url(url)
+        .status_code(200)
+        .content_type("application/json")
+        .content(body)
+        .encoding("utf8")
+        .second(0, 100000)
+        .build()
+    )
+
+
+class TestCheckTrialDeadline:
+    def create_arg(self, trial_timeout_ms: Optional[int]) -> ChallengeArg:
+        return ChallengeArg(
+            seq=1,
+            number_of_request=1,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict({"path": "/challenge"}),
+            host_one="http://one",
+            host_other="http://other",
+            res_dir="tmpdir",
+            trial_timeout_ms=TOption(trial_timeout_ms),
+        )
+
+    @patch("jumeaux.executor.time.monotonic")
+    def test_in_time(self, monotonic):
+        monotonic.return_value = 100.5
+        executor.check_trial_deadline(self.create_arg(500), 100.0, "diff")
+        executor.check_trial_deadline(self.create_arg(None), 0.0, "diff")
+
+    @patch("jumeaux.executor.time.monotonic")
+    def test_over(self, monotonic):
+        monotonic.return_value = 100.501
+        with pytest.raises(executor.TrialTimeoutError, match="Over 500ms before diff"):
+            executor.check_trial_deadline(self.create_arg(500), 100.0, "diff")
+
+
+class TestFromWorkerTask:
+    def test(self):
+        template: ChallengeArg = TestCheckTrialDeadline().create_arg(None)
+        with patch("jumeaux.executor.worker_template", template):
+            actual: ChallengeArg = executor.from_worker_task(2, Request.from_dict({"path": "/x"}))
+
+        assert actual.seq == 2
+        assert actual.req.path == "/x"
+        assert actual.host_one == "http://one"
+
+    def test_not_initialized(self):
+        with patch("jumeaux.executor.worker_template", None):
+            with pytest.raises(RuntimeError, match="not initialized by init_worker"):
+                executor.from_worker_task(2, Request.from_dict({"path": "/x"}))
+
+
+class TestCreateTrial:
+    def create_arg(self) -> ChallengeArg:
+        return ChallengeArg(
+            seq=1,
+            number_of_request=1,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict(
+                {
+                    "name": "name",
+                    "path": "/challenge",
+                    "qs": {"q": ["1"]},
+                    "form": {"f": 1},
+                    "headers": {"h": "v"},
+                }
+            ),
+            host_one="http://one",
+            host_other="http://other",
+            res_dir="tmpdir",
+        )
+
+    def test_same_as_trial(self):
+        res: Response = Response.from_dict(
+            {
+                "body": b'{"a": 1}',
+                "encoding": "utf-8",
+                "headers": {"content-type": "application/json; charset=utf-8"},
+                "url": "http://one/challenge?q=1",
+                "status_code": 200,
+                "elapsed": datetime.timedelta(seconds=1),
+                "elapsed_sec": 1.0,
+                "type": "json",
+            }
+        )
+        arg = self.create_arg()
+        req_time = datetime.datetime(2000, 1, 1)
+        diffs_by_cognition = TDict({"unknown": DiffKeys.from_dict(
+            {"added": ["<root><'b'>"], "changed": [], "removed": []}
+        )})
+
+        actual = executor.create_trial(
+            arg,
+            "name",
+            ["tag"],
+            req_time,
+            Status.DIFFERENT,
+            executor.to_response_summary(res.url, res, "one/(1)name"),
+            executor.to_response_summary("http://other/challenge?q=1"),
+            diffs_by_cognition=diffs_by_cognition,
+        )
+        expected = Trial.from_dict(
+            {
+                "seq": 1,
+                "name": "name",
+                "tags": ["tag"],
+                "request_time": req_time.isoformat(),
+                "status": Status.DIFFERENT,
+                "method": arg.req.method,
+                "path": arg.req.path,
+                "queries": arg.req.qs,
+                "raw": arg.req.raw,
+                "form": arg.req.form,
+                "json": arg.req.json,
+                "headers": arg.req.headers,
+                "diffs_by_cognition": diffs_by_cognition,
+                "one": {
+                    "url": res.url,
+                    "type": res.type,
+                    "status_code": res.status_code,
+                    "byte": res.byte,
+                    "response_sec": res.elapsed_sec,
+                    "content_type": res.content_type,
+                    "mime_type": res.mime_type,
+                    "encoding": res.encoding,
+                    "file": "one/(1)name",
+                },
+                "other": {"url": "http://other/challenge?q=1", "type": "unknown"},
+            }
+        ).to_dict()
+
+        assert actual == expected
+        assert list(actual.keys()) == list(expected.keys())
+        assert list(actual["one"].keys()) == list(expected["one"].keys())
+
+
+class TestDedup:
+    def create_arg(self, seq: int, req: dict, query: Optional[dict] = None) -> ChallengeArg:
+        query_customization = TOption(query).map(QueryCustomization.from_dict)
+        return ChallengeArg(
+            seq=seq,
+            number_of_request=1,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict(req),
+            host_one="http://one",
+            host_other="http://other",
+            query_one=query_customization,
+            query_other=query_customization,
+            res_dir="tmpdir",
+        )
+
+    def to_key(self, req: dict, query: Optional[dict] = None) -> str:
+        return executor.to_dedup_key(self.create_arg(1, req, query))
+
+    def test_same_key(self):
+        base = self.to_key({"path": "/api", "qs": {"a": ["1"], "b": ["2"]}, "headers": {"X": "1"}})
+
+        # Order of queries and cases of header names are ignored
+        assert base == self.to_key(
+            {"path": "/api", "qs": {"b": ["2"], "a": ["1"]}, "headers": {"x": "1"}}
+        )
+        # Queries are compared after customized
+        assert base == self.to_key(
+            {"path": "/api", "qs": {"a": ["1"], "b": ["2"], "t": ["0"]}, "headers": {"X": "1"}},
+            {"remove": ["t"]},
+        )
+
+    @pytest.mark.parametrize(
+        "title, req",
+        [
+            ("Path", {"path": "/other"}),
+            ("Query", {"path": "/api", "qs": {"a": ["2"]}}),
+            ("Header value", {"path": "/api", "headers": {"X": "2"}}),
+            ("Method", {"path": "/api", "method": "POST"}),
+            ("Body", {"path": "/api", "method": "POST", "json": {"id": 1}}),
+        ],
+    )
+    def test_different_key(self, title, req):
+        assert self.to_key({"path": "/api", "qs": {"a": ["1"]}}) != self.to_key(req)
+
+    def test_find_repeats(self):
+        paths = ["/a", "/b", "/a", "/c", "/b", "/a"]
+        args = [self.create_arg(i + 1, {"path": x}) for i, x in enumerate(paths)]
+
+        assert executor.find_repeats(args) == {1: [3, 6], 2: [5]}
+
+    def test_to_repeated_trial(self):
+        trial = {"seq": 1, "name": "first", "path": "/a", "queries": {}, "status": "same"}
+
+        assert executor.to_repeated_trial(
+            trial, 3, Request.from_dict({"path": "/a", "name": "third"})
+        ) == {
+            "seq": 3,
+            "name": "third",
+            "headers": {},
+            "path": "/a",
+            "queries": {},
+            "status": "same",
+            "repeat_of": 1,
+        }
+
+
+class TestJudgeAbort:
+    @pytest.mark.parametrize(
+        "title, condition, counts, expected",
+        [
+            ("No thresholds", {}, {"failure": 100}, None),
+            ("Count not exceeded", {"different": {"count": 3}}, {"different": 3}, None),
+            (
+                "Count exceeded",
+                {"different": {"count": 3}},
+                {"different": 4},
+                "different count 4 > 3",
+            ),
+            (
+                "Ratio before min_trials",
+                {"failure": {"ratio": 0.2, "min_trials": 10}},
+                {"same": 5, "failure": 4},
+                None,
+            ),
+            (
+                "Ratio exceeded after min_trials",
+                {"failure": {"ratio": 0.2, "min_trials": 10}},
+                {"same": 7, "failure": 3},
+                "failure ratio 0.300 > 0.2 after 10 trials",
+            ),
+            (
+                "Ratio not exceeded",
+                {"failure": {"ratio": 0.2}},
+                {"same": 8, "failure": 2},
+                None,
+            ),
+        ],
+    )
+    def test(self, title, condition, counts, expected):
+        actual = executor.judge_abort(AbortCondition.from_dict(condition), Counter(counts))
+        assert actual == expected
+
+
+class Arg:
+    def __init__(self, seq: int, sec: float = 0.0) -> None:
+        self.seq = seq
+        self.sec = sec
+
+
+class TestChallengeAllWindow:
+    """Results are yielded as they complete, and args not released by the window are bounded"""
+
+    def iter_args(self, pulled: list, total: int, slow: Optional[int] = None):
+        for seq in range(1, total + 1):
+            pulled.append(seq)
+            yield Arg(seq, 0.2 if seq == slow else 0.0)
+
+    def consume(self, results, pulled: list, window: InFlightWindow) -> list:
+        """:return: seqs in order of completion"""
+        completed = []
+        for trial, _ in results:
+            completed.append(trial["seq"])
+            window.release(trial["seq"])
+            # Give the submitter a chance to read ahead as far as possible
+            time.sleep(0.01)
+            # An arg which is read ahead waits for a place in the window
+            assert len(pulled) <= len(completed) + window.window + 1
+        return completed
+
+    @patch("jumeaux.executor.challenge_with_stages")
+    def test_pool(self, challenge_with_stages):
+        def challenge(x, _):
+            time.sleep(x.sec)
+            return {"seq": x.seq, "status": "same"}, None
+
+        challenge_with_stages.side_effect = challenge
+        pulled: list = []
+        limiter = ChallengeLimiter(TOption(None), TOption(None))
+        window = InFlightWindow(6)
+
+        with futures.ThreadPoolExecutor(max_workers=2) as ex:
+            results = executor.challenge_all_pool(
+                self.iter_args(pulled, 20, slow=2), ex, limiter, window=window
+            )
+            completed = self.consume(results, pulled, window)
+
+        # A slow challenge does not block later results
+        assert completed.index(2) > completed.index(3)
+        assert sorted(completed) == list(range(1, 21))
+        assert window.max_size <= 6
+
+    @patch("jumeaux.executor.challenge_async")
+    def test_asyncio(self, challenge_async):
+        async def challenge(x, **kwargs):
+            await asyncio.sleep(x.sec)
+            return {"seq": x.seq, "status": "same"}, None
+
+        challenge_async.side_effect = challenge
+        pulled: list = []
+        limiter = ChallengeLimiter(TOption(None), TOption(None))
+        window = InFlightWindow(6)
+
+        with futures.ThreadPoolExecutor(max_workers=2) as ex:
+            results = executor.challenge_all_async(
+                self.iter_args(pulled, 20, slow=2), ex, 2, limiter, window=window
+            )
+            completed = self.consume(results, pulled, window)
+
+        assert completed.index(2) > completed.index(3)
+        assert sorted(completed) == list(range(1, 21))
+        assert window.max_size <= 6
+
+
+@patch("jumeaux.executor.now")
+@patch("jumeaux.executor.http_get")
+class TestExecEngine:
+    @classmethod
+    def setup_class(cls):
+        executor.global_addon_executor = AddOnExecutor(
+            Addons.from_dict({"log2reqs": {"name": "jumeaux.addons.log2reqs.csv"}})
+        )
+
+    def create_config(
+        self,
+        response_dir: str,
+        engine: Optional[str],
+        streaming: bool = False,
+        rate_limit: Optional[dict] = None,
+        adaptive: Optional[dict] = None,
+        abort: Optional[dict] = None,
+        deadline: Optional[dict] = None,
+        schedule: Optional[dict] = None,
+    ) -> Config:
+        return Config.from_dict(
+            {
+                "threads": 2,
+                "engine": engine,
+                "max_in_flight": 3,
+                "adaptive": adaptive,
+                "abort": abort,
+                "deadline": deadline,
+                "schedule": schedule,
+                "one": {"name": "name_one", "host": "http://host/one", "rate_limit": rate_limit},
+                "other": {"name": "name_other", "host": "http://host/other"},
+                "output": {
+                    "encoding": "utf8",
+                    "response_dir": response_dir,
+                    "streaming": streaming,
+                },
+                "addons": {"log2reqs": {"name": "addons.log2reqs.csv"}},
+            }
+        )
+
+    def test_asyncio_is_same_as_pool(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts(
+            [{"path": "/same"}, {"path": "/diff"}, {"path": "/same"}, {"path": "/diff"}] * 5
+        )
+
+        pool: Report = executor.exec(self.create_config(str(tmpdir), None), reqs, "pool", None)
+        asyncio: Report = executor.exec(
+            self.create_config(str(tmpdir), "asyncio"), reqs, "asyncio", None
+        )
+
+        assert asyncio.trials.to_dicts() == pool.trials.to_dicts()
+        assert asyncio.summary.status.to_dict() == {"same": 10, "different": 10, "failure": 0}
+        for r in [pool, asyncio]:
+            latencies = r.summary.latencies.get()
+            assert list(latencies.keys()) == [
+                "request_one",
+                "request_other",
+                "res2res",
+                "res2dict",
+                "diff",
+                "judgement",
+                "store_criterion",
+                "did_challenge",
+            ]
+            assert latencies["res2res"].count == 20
+            # Only different trials need res2dict
+            assert latencies["res2dict"].count == 10
+        assert asyncio.summary.concurrency.to_dict() == {
+            "threads": 2,
+            "processes": 1,
+            "engine": "asyncio",
+            "max_in_flight": 3,
+        }
+
+    def test_res2dict_is_skipped_for_identical_bodies(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+
+        with patch("jumeaux.executor.res2dict", wraps=executor.res2dict) as res2dict:
+            actual: Report = executor.exec(self.create_config(str(tmpdir), None), reqs, "lazy", None)
+
+        # Only responses of different trials are parsed
+        assert res2dict.call_count > 0
+        assert all("/diff" in c[0][0].url for c in res2dict.call_args_list)
+        assert actual.summary.status.to_dict() == {"same": 3, "different": 3, "failure": 0}
+
+    def test_judgement_addons_are_skipped_for_identical_bodies(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+
+        default = executor.global_addon_executor
+        executor.global_addon_executor = AddOnExecutor(
+            Addons.from_dict(
+                {
+                    "log2reqs": {"name": "jumeaux.addons.log2reqs.csv"},
+                    "judgement": [{"name": "ignore", "config": {"ignores": []}}],
+                }
+            )
+        )
+        try:
+            with patch("jumeaux.executor.res2dict", wraps=executor.res2dict) as res2dict:
+                actual: Report = executor.exec(
+                    self.create_config(str(tmpdir), None), reqs, "lazy", None
+                )
+        finally:
+            executor.global_addon_executor = default
+
+        # The reference of judgement add-ons is created only for different trials
+        assert res2dict.call_count > 0
+        assert all("/diff" in c[0][0].url for c in res2dict.call_args_list)
+        assert actual.summary.status.to_dict() == {"same": 3, "different": 3, "failure": 0}
+
+    def test_diff_engine(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 2)
+
+        expected: Report = executor.exec(self.create_config(str(tmpdir), None), reqs, "all", None)
+        config: Config = Config.from_dict(
+            {**self.create_config(str(tmpdir), None).to_dict(), "diff_engine": "deepdiff"}
+        )
+        actual: Report = executor.exec(config, reqs, "diff", None)
+
+        assert actual.trials.to_dicts() == expected.trials.to_dicts()
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_trace(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}])
+        os.makedirs(os.path.join(str(tmpdir), "trace"))
+
+        config: Config = self.create_config(str(tmpdir), engine)
+        config.output.trace = TOption(True)
+        executor.exec(config, reqs, "trace", None)
+
+        with open(os.path.join(str(tmpdir), "trace", "trace.json"), encoding="utf8") as f:
+            events = json.load(f)
+
+        trials = [(x["name"], x["id"], x["args"]["status"]) for x in events if x["ph"] == "b"]
+        assert sorted(trials) == [("1", 1, "same"), ("2", 2, "different")]
+        assert len([x for x in events if x["ph"] == "e"]) == 2
+        https = [(x["name"], x["args"]["url"]) for x in events if x["cat"] == "http"]
+        assert sorted(https) == [
+            ("one", "http://host/one/diff?"),
+            ("one", "http://host/one/same?"),
+            ("other", "http://host/other/diff?"),
+            ("other", "http://host/other/same?"),
+        ]
+        stages = {x["name"] for x in events if x["cat"] == "stage"}
+        assert stages == {
+            "res2res",
+            "res2dict",
+            "diff",
+            "judgement",
+            "store_criterion",
+            "did_challenge",
+        }
+
+    def test_progress(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 2)
+        status_file = os.path.join(str(tmpdir), "status.json")
+
+        config: Config = Config.from_dict(
+            {
+                **self.create_config(str(tmpdir), None).to_dict(),
+                "progress": {"interval_sec": 60, "status_file": status_file},
+            }
+        )
+        executor.exec(config, reqs, "progress", None)
+
+        with open(status_file, encoding="utf8") as f:
+            actual = json.load(f)
+        assert actual["completed"] == 4
+        assert actual["remaining"] == 0
+        assert actual["status"] == {"same": 2, "different": 2, "failure": 0}
+        assert actual["finished"] is True
+
+    def test_metrics(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 2)
+        path = os.path.join(str(tmpdir), "jumeaux.prom")
+
+        config: Config = Config.from_dict(
+            {
+                **self.create_config(str(tmpdir), None).to_dict(),
+                "metrics": {"path": path, "interval_sec": 60},
+            }
+        )
+        executor.exec(config, reqs, "metrics", None)
+
+        with open(path, encoding="utf8") as f:
+            actual = f.read().splitlines()
+        assert 'jumeaux_trials_total{status="same"} 2' in actual
+        assert 'jumeaux_trials_total{status="different"} 2' in actual
+        assert 'jumeaux_response_seconds_count{side="one"} 4' in actual
+        assert 'jumeaux_stage_seconds_count{stage="request_one"} 4' in actual
+
+    def test_no_trace(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}])
+
+        executor.exec(self.create_config(str(tmpdir), None), reqs, "no_trace", None)
+
+        assert not os.path.exists(os.path.join(str(tmpdir), "no_trace", "trace.json"))
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_profile_addons(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 2)
+
+        default = executor.global_addon_executor
+        executor.global_addon_executor = AddOnExecutor(
+            Addons.from_dict(
+                {
+                    "log2reqs": {"name": "jumeaux.addons.log2reqs.csv"},
+                    "res2res": [{"name": "json_sort", "config": {"items": []}}],
+                    "judgement": [{"name": "same", "config": {"when_any": ["False"]}}],
+                }
+            ),
+            profile=True,
+        )
+        try:
+            actual: Report = executor.exec(
+                self.create_config(str(tmpdir), engine), reqs, "profile", None
+            )
+        finally:
+            executor.global_addon_executor = default
+
+        assert [
+            (x.layer, x.name, x.calls, x.errors) for x in actual.summary.addon_profiles.get()
+        ] == [("res2res", "json_sort", 8, 0), ("judgement", "same", 2, 0)]
+        assert default.profiler is None
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_streaming(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 5)
+
+        expected: Report = executor.exec(self.create_config(str(tmpdir), engine), reqs, "all", None)
+        config: Config = self.create_config(str(tmpdir), engine, streaming=True)
+        actual: Report = executor.exec(config, reqs, "streaming", None)
+
+        assert actual.trials.to_dicts() == []
+        assert actual.summary.status.to_dict() == expected.summary.status.to_dict()
+
+        payload = FinalAddOnPayload.from_dict({"report": actual, "output_summary": config.output})
+        assert payload.trials_path == f"{tmpdir}/streaming/trials.jsonl"
+        assert TList(payload.iter_trials()).to_dicts() == expected.trials.to_dicts()
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_rate_limit(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+        rate_limit = {"qps": 1, "burst": 2, "max_in_flight": 1}
+
+        expected: Report = executor.exec(self.create_config(str(tmpdir), engine), reqs, "all", None)
+        with patch("jumeaux.limiter.time.sleep") as sleep, patch(
+            "jumeaux.executor.asyncio.sleep"
+        ) as async_sleep:
+            actual: Report = executor.exec(
+                self.create_config(str(tmpdir), engine, rate_limit=rate_limit),
+                reqs,
+                "limited",
+                None,
+            )
+
+        assert actual.trials.to_dicts() == expected.trials.to_dicts()
+        assert actual.summary.one.rate_limit.get().to_dict() == rate_limit
+        # All but burst wait for tokens
+        assert sleep.call_count + async_sleep.call_count == 4
+
+    @pytest.mark.parametrize(
+        "engine, expected_concurrency",
+        [
+            (None, {"threads": 4, "processes": 1}),
+            ("asyncio", {"threads": 2, "processes": 1, "engine": "asyncio", "max_in_flight": 3}),
+        ],
+    )
+    def test_adaptive(self, http_get, now, tmpdir, engine, expected_concurrency):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 5)
+        adaptive = {"min": 1, "max": 4}
+
+        expected: Report = executor.exec(self.create_config(str(tmpdir), engine), reqs, "all", None)
+        actual: Report = executor.exec(
+            self.create_config(str(tmpdir), engine, adaptive=adaptive), reqs, "adaptive", None
+        )
+
+        assert actual.trials.to_dicts() == expected.trials.to_dicts()
+        assert actual.summary.concurrency.to_dict() == {
+            **expected_concurrency,
+            "adaptive": adaptive,
+        }
+
+    def test_max_in_flight_is_capped(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}])
+        config: Config = Config.from_dict(
+            {**self.create_config(str(tmpdir), "asyncio").to_dict(), "max_in_flight": 1000}
+        )
+
+        actual: Report = executor.exec(config, reqs, "capped", None)
+
+        assert actual.summary.concurrency.to_dict() == {
+            "threads": 2,
+            "processes": 1,
+            "engine": "asyncio",
+            "max_in_flight": executor.MAX_IN_FLIGHT,
+        }
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_abort(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 50)
+        config: Config = self.create_config(
+            str(tmpdir), engine, abort={"different": {"count": 2}}
+        )
+
+        actual: Report = executor.exec(config, reqs, "abort", None)
+
+        # Trials complete out of order, but they are reported in order of seq
+        seqs = actual.trials.map(lambda x: x.seq)
+        assert seqs == sorted(seqs)
+        assert actual.summary.status.different == 3
+        assert actual.summary.aborted.get().to_dict() == {
+            "reason": "different count 3 > 2",
+            "trials": len(seqs),
+            "total": 100,
+        }
+        assert http_get.call_count < 100 * 2
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_run_deadline(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}] * 10)
+        config: Config = self.create_config(str(tmpdir), engine, deadline={"run_sec": 60})
+
+        # Deadline has already passed
+        with patch("jumeaux.executor.to_remaining_sec", return_value=0):
+            actual: Report = executor.exec(config, reqs, "deadline", None)
+
+        assert actual.trials.to_dicts() == []
+        assert actual.summary.aborted.get().to_dict() == {
+            "reason": "run deadline 60s exceeded",
+            "trials": 0,
+            "total": 10,
+        }
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_dedup(self, http_get, now, tmpdir, engine):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts(
+            [{"path": "/same"}, {"path": "/diff"}, {"path": "/same"}, {"path": "/same"}]
+        )
+        config: Config = Config.from_dict(
+            {**self.create_config(str(tmpdir), engine).to_dict(), "dedup": True}
+        )
+
+        actual: Report = executor.exec(config, reqs, "dedup", None)
+
+        assert http_get.call_count == 2 * 2
+        assert actual.trials.map(lambda x: (x.seq, x.status.value, x.repeat_of.get())) == [
+            (1, "same", None),
+            (2, "different", None),
+            (3, "same", 1),
+            (4, "same", 1),
+        ]
+        assert actual.summary.status.to_dict() == {"same": 3, "different": 1, "failure": 0}
+        assert actual.summary.dedup.get().to_dict() == {"unique": 2, "repeated": 2}
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_schedule(self, http_get, now, tmpdir, streaming):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+        report_path = f"{tmpdir}/previous.json"
+        with open(report_path, "w", encoding="utf8") as f:
+            json.dump(
+                {
+                    "trials": [
+                        {"path": "/same", "one": {"response_sec": 0.1}, "other": {}},
+                        {"path": "/diff", "one": {"response_sec": 3.0}, "other": {}},
+                    ]
+                },
+                f,
+            )
+        config: Config = self.create_config(
+            str(tmpdir), None, streaming=streaming, schedule={"report": report_path}
+        )
+
+        acquired: list = []
+
+        class RecordingInFlightWindow(InFlightWindow):
+            def acquire(self, key) -> bool:
+                acquired.append(key)
+                return super().acquire(key)
+
+        with patch("jumeaux.executor.InFlightWindow", RecordingInFlightWindow):
+            actual: Report = executor.exec(config, reqs, "schedule", None)
+
+        # Expected-slow requests (/diff) are challenged first
+        assert acquired == [2, 4, 6, 1, 3, 5]
+        payload = FinalAddOnPayload.from_dict({"report": actual, "output_summary": config.output})
+        assert [x.seq for x in payload.iter_trials()] == [1, 2, 3, 4, 5, 6]
+
+    def test_resume(self, http_get, now, tmpdir):
+        http_get.side_effect = create_http_response
+        now.return_value = mock_date(2000, 1, 1, 10, 10, 10, 10)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+        config: Config = self.create_config(str(tmpdir), None, streaming=True)
+
+        expected: Report = executor.exec(config, reqs, "all", None)
+
+        # Interrupted after 2 trials and in the middle of writing the 3rd one
+        os.makedirs(f"{tmpdir}/resumed")
+        with open(f"{tmpdir}/all/trials.jsonl", encoding="utf8") as f:
+            lines = f.readlines()
+        with open(f"{tmpdir}/resumed/trials.jsonl", "w", encoding="utf8") as f:
+            f.write("".join(lines[:2]) + lines[2][:10])
+
+        http_get.reset_mock()
+        actual: Report = executor.exec(config, reqs, "resumed", None, resume=True)
+
+        assert http_get.call_count == 4 * 2
+        assert actual.summary.status.to_dict() == expected.summary.status.to_dict()
+        payload = FinalAddOnPayload.from_dict({"report": actual, "output_summary": config.output})
+        assert TList(payload.iter_trials()).to_dicts() == TList(
+            FinalAddOnPayload.from_dict(
+                {"report": expected, "output_summary": config.output}
+            ).iter_trials()
+        ).to_dicts()
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """Same as `http.server.ThreadingHTTPServer` which is not in Python 3.6"""
+
+    daemon_threads = True
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # Hung access point until the server is released
+        if self.path == "/one/hang":
+            self.server.released.wait(30)
+        # Only `/diff` of other returns a different body
+        body = b'{"id": 2}' if self.path == "/other/diff" else b'{"id": 1}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JsonHandler)
+    server.released = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.released.set()
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture(scope="module")
+def host():
+    yield from serve()
+
+
+@pytest.fixture
+def hung_host():
+    """Requests left behind by a test never outlive it"""
+    yield from serve()
+
+
+# Runs a challenge of a hung access point in another interpreter to measure when it exits
+EXIT_SCRIPT = """
+import sys
+import time
+import jumeaux.addons
+from jumeaux import executor
+from jumeaux.addons import AddOnExecutor
+from jumeaux.domain.config.vo import Config
+from jumeaux.models import Request
+
+config = Config.from_json(sys.argv[1])
+executor.global_addon_executor = AddOnExecutor(config.addons)
+print(f"begin:{time.monotonic()}", flush=True)
+executor.exec(config, Request.from_dicts([{"path": "/hang"}]), "exit", None)
+"""
+
+
+class TestExecProcesses:
+    """Worker processes can't share mocks, so they access a local server"""
+
+    def create_config(self, response_dir: str, host: str, **kwargs) -> Config:
+        return Config.from_dict(
+            {
+                "one": {"name": "one", "host": f"{host}/one"},
+                "other": {"name": "other", "host": f"{host}/other"},
+                "output": {"response_dir": response_dir},
+                "addons": {
+                    "log2reqs": {"name": "plain"},
+                    "res2dict": [{"name": "json"}],
+                    "store_criterion": [{"name": "free", "config": {"when_any": ["True"]}}],
+                },
+                **kwargs,
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "start_method, engine",
+        [
+            (None, None),
+            ("fork", None),
+            pytest.param(
+                "spawn",
+                None,
+                marks=pytest.mark.skipif(sys.version_info < (3, 7), reason="Python 3.7+"),
+            ),
+            pytest.param(
+                "spawn",
+                "asyncio",
+                marks=pytest.mark.skipif(sys.version_info < (3, 7), reason="Python 3.7+"),
+            ),
+            (None, "hybrid"),
+            pytest.param(
+                "spawn",
+                "hybrid",
+                marks=pytest.mark.skipif(sys.version_info < (3, 7), reason="Python 3.7+"),
+            ),
+        ],
+    )
+    def test_same_as_threads(self, host, tmpdir, start_method, engine):
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+        config: Config = self.create_config(str(tmpdir), host)
+        executor.global_addon_executor = AddOnExecutor(config.addons)
+
+        expected: Report = executor.exec(config, reqs, "threads", None)
+        actual: Report = executor.exec(
+            self.create_config(
+                str(tmpdir), host, processes=2, start_method=start_method, engine=engine
+            ),
+            reqs,
+            "processes",
+            None,
+        )
+
+        def omit_time(trial: dict) -> dict:
+            trial = {k: v for k, v in trial.items() if k != "request_time"}
+            for side in ["one", "other"]:
+                trial[side] = {k: v for k, v in trial[side].items() if k != "response_sec"}
+            return trial
+
+        assert actual.trials.to_dicts() and actual.trials.map(
+            lambda x: omit_time(x.to_dict())
+        ) == expected.trials.map(lambda x: omit_time(x.to_dict()))
+        assert actual.summary.status.to_dict() == {"same": 3, "different": 3, "failure": 0}
+        # Add-ons in workers stored responses
+        assert len(os.listdir(f"{tmpdir}/processes/one")) == 6
+
+    def test_hybrid_concurrency(self, host, tmpdir):
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}])
+        config: Config = self.create_config(
+            str(tmpdir), host, threads=3, processes=2, engine="hybrid"
+        )
+        executor.global_addon_executor = AddOnExecutor(config.addons)
+
+        actual: Report = executor.exec(config, reqs, "hybrid", None)
+
+        assert actual.summary.concurrency.to_dict() == {
+            "threads": 3,
+            "processes": 2,
+            "engine": "hybrid",
+        }
+        # Requests are sent by threads of the main process
+        assert actual.summary.connections.get().one.requests == 2
+
+    @pytest.mark.parametrize("engine", [None, "asyncio"])
+    def test_run_deadline_with_hung_access_point(self, hung_host, tmpdir, engine):
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/hang"}])
+        config: Config = self.create_config(
+            str(tmpdir), hung_host, threads=2, engine=engine, deadline={"run_sec": 1}
+        )
+        executor.global_addon_executor = AddOnExecutor(config.addons)
+
+        begin = time.monotonic()
+        actual: Report = executor.exec(config, reqs, "hang", None)
+
+        # Neither the run nor requests without `timeout` wait for the hung access point
+        assert time.monotonic() - begin < 3
+        assert actual.summary.aborted.get().reason == "run deadline 1s exceeded"
+
+    def test_trial_deadline_with_hung_access_point(self, hung_host, tmpdir):
+        reqs: TList[Request] = Request.from_dicts([{"path": "/hang"}])
+        config: Config = self.create_config(str(tmpdir), hung_host, deadline={"trial_ms": 200})
+        executor.global_addon_executor = AddOnExecutor(config.addons)
+
+        begin = time.monotonic()
+        actual: Report = executor.exec(config, reqs, "hang", None)
+
+        assert time.monotonic() - begin < 3
+        assert actual.trials[0].status == Status.FAILURE
+        assert actual.trials[0].failure_reason.get() == FailureReason.TRIAL_TIMEOUT
+
+    @pytest.mark.parametrize(
+        "engine, deadline",
+        [
+            (None, {"run_sec": 1}),
+            ("asyncio", {"run_sec": 1}),
+            (None, {"trial_ms": 1000}),
+            # `timeout` without read_ms is also bounded
+            (None, {"run_sec": 1, "timeout": {"connect_ms": 1000}}),
+        ],
+    )
+    def test_exit_with_hung_access_point(self, hung_host, tmpdir, engine, deadline):
+        timeout = deadline.pop("timeout", None)
+        config: Config = self.create_config(
+            str(tmpdir), hung_host, engine=engine, deadline=deadline, max_retries=3
+        )
+        if timeout:
+            config = Config.from_dict(
+                {**config.to_dict(), "one": {**config.one.to_dict(), "timeout": timeout}}
+            )
+
+        process = subprocess.run(
+            [sys.executable, "-c", EXIT_SCRIPT, config.to_json()],
+            stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            timeout=30,
+        )
+        end = time.monotonic()
+
+        assert process.returncode == 0
+        begin = float(
+            [x for x in process.stdout.decode().splitlines() if x.startswith("begin:")][0][6:]
+        )
+        # Neither retries of reads nor threads left behind hold the interpreter
+        assert end - begin < 3
+
+    def test_record_and_replay(self, host, tmpdir):
+        reqs: TList[Request] = Request.from_dicts([{"path": "/same"}, {"path": "/diff"}] * 3)
+        path = f"{tmpdir}/one.sqlite3"
+        config: Config = self.create_config(str(tmpdir), host)
+        executor.global_addon_executor = AddOnExecutor(config.addons)
+
+        # Responses recorded in worker processes are not counted
+        recorded: Report = executor.exec(
+            self.create_config(
+                str(tmpdir), host, processes=2, record={"path": path, "mode": "record"}
+            ),
+            reqs,
+            "record",
+            None,
+        )
+        assert recorded.summary.record.is_none()
+
+        replayed: Report = executor.exec(
+            self.create_config(str(tmpdir), host, record={"path": path, "mode": "replay"}),
+            reqs,
+            "replay",
+            None,
+        )
+
+        assert replayed.summary.record.get().to_dict() == {
+            "mode": "replay",
+            "path": path,
+            "recorded": 0,
+            "replayed": 6,
+            "missed": 0,
+        }
+        assert replayed.summary.connections.get().one.requests == 0
+        assert replayed.summary.status.to_dict() == {"same": 3, "different": 3, "failure": 0}
+
+        # The same requests are recorded as the last response of them
+        def omit_time(trial: Trial) -> dict:
+            return {k: v for k, v in trial.one.to_dict().items() if k != "response_sec"}
+
+        assert replayed.trials.map(omit_time) == recorded.trials.map(omit_time)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+from unittest.mock import patch
+
+import pytest
+import jumeaux.addons  # XXX: Workaround for cyclic import
+
+from jumeaux.latency import StageTimer, LatencyHistogram, StageLatencies, AddOnProfiler
+
+
+class TestStageTimer:
+    def test_measure(self):
+        timer = StageTimer()
+        with patch("jumeaux.latency.time.perf_counter") as perf_counter:
+            perf_counter.side_effect = [1.0, 1.5, 2.0, 2.25]
+            with timer.measure("res2res") as lap:
+                pass
+            assert lap.ms == 500.0
+            with timer.measure("res2res"):
+                pass
+
+        assert timer.elapsed_ms == {"res2res": 750.0}
+
+    def test_nested_stage_is_excluded(self):
+        timer = StageTimer()
+        with patch("jumeaux.latency.time.perf_counter") as perf_counter:
+            perf_counter.side_effect = [1.0, 1.25, 1.5, 2.0]
+            with timer.measure("diff") as lap:
+                with timer.measure("res2dict"):
+                    pass
+
+        assert lap.ms == 750.0
+        assert timer.elapsed_ms == {"diff": 750.0, "res2dict": 250.0}
+
+
+class TestLatencyHistogram:
+    def test_to_stats(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(float(ms))
+
+        assert histogram.to_stats().to_dict() == {
+            "count": 100,
+            "p50": 50.0,
+            "p90": 90.0,
+            "p99": 99.0,
+            "max": 100.0,
+            "total": 5050.0,
+        }
+
+    @pytest.mark.parametrize("p", [50, 90, 99])
+    def test_error_is_within_1_percent(self, p):
+        histogram = LatencyHistogram()
+        samples = [1.0007 ** i for i in range(10000)]
+        for ms in samples:
+            histogram.record(ms)
+
+        expected = samples[p * 100 - 1]
+        assert expected <= histogram.percentile(p) <= expected * 1.01
+
+    def test_zero(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+
+        assert histogram.to_stats().to_dict() == {
+            "count": 1,
+            "p50": 0.0,
+            "p90": 0.0,
+            "p99": 0.0,
+            "max": 0.0,
+            "total": 0.0,
+        }
+
+
+class TestStageLatencies:
+    def test_to_stats(self):
+        latencies = StageLatencies(["request_one", "diff", "judgement"])
+        latencies.record({"diff": 2.0, "request_one": 10.0})
+        latencies.record({})
+        latencies.record({"diff": 4.0, "request_one": 30.0, "extra": 1.0})
+
+        actual = latencies.to_stats()
+
+        assert list(actual.keys()) == ["request_one", "diff", "extra"]
+        assert actual["diff"].to_dict() == {
+            "count": 2,
+            "p50": 2.0,
+            "p90": 4.0,
+            "p99": 4.0,
+            "max": 4.0,
+            "total": 6.0,
+        }
+
+
+class TestAddOnProfiler:
+    def test_to_profiles(self):
+        profiler = AddOnProfiler()
+        with patch("jumeaux.latency.time.perf_counter") as perf_counter:
+            perf_counter.side_effect = [1.0, 1.5, 2.0, 2.25, 3.0, 3.001]
+            with profiler.measure("judgement", 0, "ignore"):
+                pass
+            with pytest.raises(ValueError):
+                with profiler.measure("judgement", 0, "ignore"):
+                    raise ValueError()
+            with profiler.measure("res2res", 0, "json"):
+                pass
+
+        assert profiler.to_profiles().to_dicts() == [
+            {
+                "layer": "res2res",
+                "name": "json",
+                "calls": 1,
+                "total_ms": 1.0,
+                "mean_ms": 1.0,
+                "max_ms": 1.0,
+                "errors": 0,
+            },
+            {
+                "layer": "judgement",
+                "name": "ignore",
+                "calls": 2,
+                "total_ms": 750.0,
+                "mean_ms": 375.0,
+                "max_ms": 500.0,
+                "errors": 1,
+            },
+        ]
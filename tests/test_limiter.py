@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import random
+from unittest.mock import patch
+
+import pytest
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from owlmixin import TOption
+
+from jumeaux.limiter import TokenBucket, ChallengeLimiter, AdaptiveLimit
+from jumeaux.models import RateLimit, AdaptiveConcurrency
+
+
+def to_rate_limit(d: dict) -> TOption[RateLimit]:
+    return RateLimit.from_optional_dict(d)
+
+
+class TestTokenBucket:
+    @pytest.mark.parametrize(
+        "title, qps, burst, expected",
+        [
+            ("Paced without burst", 10, 1, [0.0, 0.1, 0.2, 0.3]),
+            ("Burst is not waited", 10, 3, [0.0, 0.0, 0.0, 0.1]),
+        ],
+    )
+    def test_reserve(self, title, qps, burst, expected):
+        with patch("jumeaux.limiter.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(qps, burst)
+            assert [round(bucket.reserve(), 3) for _ in expected] == expected
+
+    def test_reserve_after_idle(self):
+        with patch("jumeaux.limiter.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            bucket = TokenBucket(10, 1)
+            bucket.reserve()
+            bucket.reserve()
+
+            monotonic.return_value = 200.0
+            assert bucket.reserve() == 0.0
+
+
+def to_trial(status: str, latency: float = 0.1, path: str = "/") -> dict:
+    if status == "failure":
+        return {"status": status, "path": path, "one": {}, "other": {}}
+    return {
+        "status": status,
+        "path": path,
+        "one": {"response_sec": latency},
+        "other": {"response_sec": 0.0},
+    }
+
+
+def create_adaptive_limit(d: dict) -> AdaptiveLimit:
+    return AdaptiveLimit(AdaptiveConcurrency.from_dict(d))
+
+
+class TestAdaptiveLimit:
+    def test_initial(self):
+        assert create_adaptive_limit({"max": 10}).limit == 1
+        assert create_adaptive_limit({"min": 2, "max": 10, "initial": 5}).limit == 5
+        assert create_adaptive_limit({"min": 2, "max": 10, "initial": 50}).limit == 10
+
+    def test_increase_additively_until_max(self):
+        limit = create_adaptive_limit({"max": 3})
+        actual = []
+        for _ in range(8):
+            limit.update(to_trial("same"))
+            actual.append(limit.limit)
+
+        assert actual == [2, 2, 3, 3, 3, 3, 3, 3]
+
+    def test_decrease_multiplicatively_until_min(self):
+        limit = create_adaptive_limit({"min": 3, "max": 20, "initial": 16})
+        for _ in range(16):
+            limit.update(to_trial("same"))
+        assert limit.limit == 17
+
+        limit.update(to_trial("failure"))
+        assert limit.limit == 8
+        # Trials in flight together with the failed one don't decrease the limit
+        for _ in range(7):
+            limit.update(to_trial("failure"))
+        assert limit.limit == 8
+
+        limit.update(to_trial("failure"))
+        assert limit.limit == 4
+        for _ in range(4):
+            limit.update(to_trial("failure"))
+        assert limit.limit == 3
+
+    def test_decrease_by_latency(self):
+        limit = create_adaptive_limit({"max": 20, "initial": 10})
+        limit.update(to_trial("same", 0.1))
+        limit.update(to_trial("different", 0.2))
+        assert limit.limit == 10
+
+        limit.update(to_trial("same", 0.21))
+        assert limit.limit == 5
+
+    def test_latency_by_path(self):
+        limit = create_adaptive_limit({"max": 20, "initial": 10})
+        rnd = random.Random(0)
+        # 70% of requests are fast and the rest are slow endpoints
+        for _ in range(300):
+            if rnd.random() < 0.7:
+                limit.update(to_trial("same", rnd.uniform(0.02, 0.025), "/fast"))
+            else:
+                limit.update(to_trial("same", rnd.uniform(0.15, 0.16), "/slow"))
+        assert limit.limit == 20
+
+        limit.update(to_trial("same", 0.4, "/slow"))
+        assert limit.limit == 10
+
+
+class TestChallengeLimiter:
+    def test_no_limits(self):
+        limiter = ChallengeLimiter(to_rate_limit(None), to_rate_limit(None))
+        assert limiter.buckets == []
+        assert limiter.max_in_flight is None
+        assert limiter.capacity is None
+        assert limiter.reserve() == 0.0
+
+        limiter.acquire()
+        limiter.release()
+
+    def test_smaller_max_in_flight(self):
+        limiter = ChallengeLimiter(
+            to_rate_limit({"max_in_flight": 5}), to_rate_limit({"max_in_flight": 3, "qps": 10})
+        )
+        assert len(limiter.buckets) == 1
+        assert limiter.max_in_flight == 3
+
+    def test_reserve_waits_slower_one(self):
+        with patch("jumeaux.limiter.time.monotonic", return_value=100.0):
+            limiter = ChallengeLimiter(to_rate_limit({"qps": 10}), to_rate_limit({"qps": 2}))
+            assert [round(limiter.reserve(), 3) for _ in range(3)] == [0.0, 0.5, 1.0]
+
+    def test_capacity_follows_adaptive_limit(self):
+        limiter = ChallengeLimiter(
+            to_rate_limit({"max_in_flight": 3}),
+            to_rate_limit(None),
+            AdaptiveConcurrency.from_optional_dict({"max": 10, "initial": 2}),
+        )
+        assert [limiter.try_acquire() for _ in range(3)] == [True, True, False]
+
+        limiter.release(to_trial("same"))
+        limiter.release(to_trial("same"))
+        assert limiter.adaptive.limit == 3
+        assert limiter.capacity == 3
+        assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import os
+
+from owlmixin import TDict, TList
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from jumeaux.domain.config.vo import Metrics
+from jumeaux.latency import StageLatencies
+from jumeaux.metrics import MetricsWriter, RunMetrics, to_labels, write_textfile
+from jumeaux.models import AddOnProfile, LatencyStats, Trial
+
+
+def create_trial(status: str, one_sec: float = None, other_sec: float = None) -> dict:
+    def res(side: str, sec: float) -> dict:
+        return {"url": f"http://{side}", "type": "json", "byte": 100, "response_sec": sec}
+
+    return Trial.from_dict(
+        {
+            "seq": 1,
+            "name": "name",
+            "tags": [],
+            "headers": {},
+            "queries": {},
+            "one": res("one", one_sec),
+            "other": res("other", other_sec),
+            "method": "GET",
+            "path": "/path",
+            "request_time": "2000-01-01T00:00:00",
+            "status": status,
+        }
+    ).to_dict()
+
+
+class TestToLabels:
+    def test(self):
+        assert to_labels({"a": "x", "b": 'y"\\\n'}) == '{a="x",b="y\\"\\\\\\n"}'
+
+    def test_empty(self):
+        assert to_labels({}) == ""
+
+
+class TestRunMetrics:
+    def test_to_openmetrics(self):
+        metrics = RunMetrics()
+        metrics.record(create_trial("same", 0.004, 0.3))
+        metrics.record(create_trial("different", 0.05, 20.0))
+        metrics.record({"status": "failure", "one": {"url": "u"}, "other": {"url": "u"}})
+
+        actual = metrics.to_openmetrics(
+            TDict(
+                {
+                    "diff": LatencyStats.from_dict(
+                        {"count": 2, "p50": 1.5, "p90": 2.5, "p99": 2.5, "max": 2.5, "total": 4.0}
+                    )
+                }
+            ),
+            TList(
+                [
+                    AddOnProfile.from_dict(
+                        {
+                            "layer": "res2res",
+                            "name": "json_sort",
+                            "calls": 4,
+                            "total_ms": 12.0,
+                            "mean_ms": 3.0,
+                            "max_ms": 5.0,
+                            "errors": 1,
+                        }
+                    )
+                ]
+            ),
+            {"job": "test"},
+        )
+
+        assert (
+            actual
+            == """# TYPE jumeaux_trials counter
+# HELP jumeaux_trials Finished trials by status.
+jumeaux_trials_total{job="test",status="same"} 1
+jumeaux_trials_total{job="test",status="different"} 1
+jumeaux_trials_total{job="test",status="failure"} 1
+# TYPE jumeaux_response_seconds histogram
+# HELP jumeaux_response_seconds Response time of one and other.
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.005"} 1
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.01"} 1
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.025"} 1
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.05"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.1"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.25"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="0.5"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="1.0"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="2.5"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="5.0"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="10.0"} 2
+jumeaux_response_seconds_bucket{job="test",side="one",le="+Inf"} 2
+jumeaux_response_seconds_count{job="test",side="one"} 2
+jumeaux_response_seconds_sum{job="test",side="one"} 0.054
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.005"} 0
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.01"} 0
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.025"} 0
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.05"} 0
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.1"} 0
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.25"} 0
+jumeaux_response_seconds_bucket{job="test",side="other",le="0.5"} 1
+jumeaux_response_seconds_bucket{job="test",side="other",le="1.0"} 1
+jumeaux_response_seconds_bucket{job="test",side="other",le="2.5"} 1
+jumeaux_response_seconds_bucket{job="test",side="other",le="5.0"} 1
+jumeaux_response_seconds_bucket{job="test",side="other",le="10.0"} 1
+jumeaux_response_seconds_bucket{job="test",side="other",le="+Inf"} 2
+jumeaux_response_seconds_count{job="test",side="other"} 2
+jumeaux_response_seconds_sum{job="test",side="other"} 20.3
+# TYPE jumeaux_response_bytes counter
+# HELP jumeaux_response_bytes Bytes of response bodies.
+jumeaux_response_bytes_total{job="test",side="one"} 200
+jumeaux_response_bytes_total{job="test",side="other"} 200
+# TYPE jumeaux_stage_seconds summary
+# HELP jumeaux_stage_seconds Time of each stage in trials.
+jumeaux_stage_seconds{job="test",stage="diff",quantile="0.5"} 0.0015
+jumeaux_stage_seconds{job="test",stage="diff",quantile="0.9"} 0.0025
+jumeaux_stage_seconds{job="test",stage="diff",quantile="0.99"} 0.0025
+jumeaux_stage_seconds_count{job="test",stage="diff"} 2
+jumeaux_stage_seconds_sum{job="test",stage="diff"} 0.004
+# TYPE jumeaux_addon_seconds counter
+# HELP jumeaux_addon_seconds Time spent in each add-on.
+jumeaux_addon_seconds_total{job="test",layer="res2res",name="json_sort"} 0.012
+# TYPE jumeaux_addon_calls counter
+# HELP jumeaux_addon_calls Calls of each add-on.
+jumeaux_addon_calls_total{job="test",layer="res2res",name="json_sort"} 4
+# TYPE jumeaux_addon_errors counter
+# HELP jumeaux_addon_errors Calls of each add-on which raised errors.
+jumeaux_addon_errors_total{job="test",layer="res2res",name="json_sort"} 1
+# EOF
+"""
+        )
+
+
+class TestWriteTextfile:
+    def test(self, tmpdir):
+        path = os.path.join(str(tmpdir), "jumeaux.prom")
+        write_textfile(path, "# EOF\n")
+
+        with open(path, encoding="utf8") as f:
+            assert f.read() == "# EOF\n"
+        assert os.listdir(str(tmpdir)) == ["jumeaux.prom"]
+
+
+class TestMetricsWriter:
+    def test_stop(self, tmpdir):
+        path = os.path.join(str(tmpdir), "jumeaux.prom")
+        latencies = StageLatencies(["diff"])
+        writer = MetricsWriter(
+            Metrics.from_dict({"path": path, "labels": {"job": "test"}}), latencies
+        ).start()
+        writer.record(create_trial("same", 0.1, 0.2))
+        latencies.record({"diff": 1.0})
+
+        writer.stop()
+
+        with open(path, encoding="utf8") as f:
+            actual = f.read().splitlines()
+        assert 'jumeaux_trials_total{job="test",status="same"} 1' in actual
+        assert 'jumeaux_stage_seconds_count{job="test",stage="diff"} 1' in actual
+        assert actual[-1] == "# EOF"
@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 # -*- coding:utf-8 -*-
+import datetime
+import pickle
 from collections import namedtuple
 
 import pytest
+import requests
 from owlmixin import TOption
 
-from jumeaux.models import Proxy, Response
+from jumeaux.domain.config.vo import DiffEngine
+from jumeaux.models import ChallengeArg, HttpMethod, Proxy, RawResponse, Request, Response
 
 
 class TestProxy:
@@ -19,6 +23,86 @@ class TestProxy:
         assert actual is None
 
 
+class TestChallengeArg:
+    def test_defaults(self):
+        actual = ChallengeArg(
+            seq=1,
+            number_of_request=2,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict({"path": "/challenge", "method": "POST"}),
+            host_one="http://one",
+            host_other="http://other",
+            res_dir="tmpdir",
+        )
+
+        assert actual.req.method is HttpMethod.POST
+        assert actual.proxy_one.is_none()
+        assert actual.headers_one == {}
+        assert actual.trial_timeout_ms.is_none()
+        assert actual.diff_engine is DiffEngine.JUMEAUX
+        assert actual.trace is False
+
+    def test_replace(self):
+        arg = ChallengeArg(
+            seq=0,
+            number_of_request=2,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict({"path": ""}),
+            host_one="http://one",
+            host_other="http://other",
+            res_dir="tmpdir",
+        )
+
+        actual = arg.replace(seq=1, req=Request.from_dict({"path": "/challenge"}))
+
+        assert actual.seq == 1
+        assert actual.req.path == "/challenge"
+        assert actual.host_one == "http://one"
+        assert arg.seq == 0
+        assert arg.req.path == ""
+
+    def test_pickle(self):
+        arg = ChallengeArg(
+            seq=1,
+            number_of_request=2,
+            key="hash_key",
+            session_one="dummy",
+            session_other="dummy",
+            req=Request.from_dict({"path": "/challenge", "method": "POST"}),
+            host_one="http://one",
+            host_other="http://other",
+            proxy_one=TOption(Proxy.from_dict({"http": "http://proxy", "https": "https://proxy"})),
+            res_dir="tmpdir",
+        )
+
+        actual: ChallengeArg = pickle.loads(pickle.dumps(arg))
+
+        assert not hasattr(actual, "__dict__")
+        assert actual.seq == 1
+        assert actual.req.to_dict() == arg.req.to_dict()
+        assert actual.req.method is HttpMethod.POST
+        assert actual.proxy_one.get().http == "http://proxy"
+
+
+class TestRawResponse:
+    def test_same_response(self):
+        res = requests.Response()
+        res._content = '<html><meta charset="euc-jp"></html>'.encode("euc-jp")
+        res.status_code = 200
+        res.url = "http://one/challenge"
+        res.headers["Content-Type"] = "text/html"
+        res.elapsed = datetime.timedelta(seconds=1, microseconds=234567)
+
+        raw: RawResponse = pickle.loads(pickle.dumps(RawResponse.from_requests(res)))
+
+        assert Response.from_requests(raw).to_dict() == Response.from_requests(res).to_dict()
+        assert raw.apparent_encoding == res.apparent_encoding
+
+
 class TestModels:
     @pytest.mark.parametrize(
         "title, headers, text, content, encoding, apparent_encoding, default_encoding, expected",
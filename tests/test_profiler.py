@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent import futures
+
+from jumeaux import profiler as profilers
+from jumeaux.profiler import SamplingProfiler, read_collapsed, write_collapsed
+
+
+def busy(sec: float) -> int:
+    end = time.monotonic() + sec
+    while time.monotonic() < end:
+        pass
+    return os.getpid()
+
+
+def profile_busy(dir: str) -> int:
+    profilers.profile_worker(dir)
+    return busy(0.2)
+
+
+class TestToCollapsedStack:
+    def test(self):
+        actual = profilers.to_collapsed_stack(sys._getframe(), "main").split(";")
+
+        assert actual[0] == "main"
+        assert (
+            actual[-1] == f"test ({__file__}:{TestToCollapsedStack.test.__code__.co_firstlineno})"
+        )
+
+
+class TestSamplingProfiler:
+    def test(self):
+        thread = threading.Thread(target=busy, args=(0.2,))
+        profiler = SamplingProfiler("main", 0.001).start()
+        thread.start()
+        thread.join()
+        stacks = profiler.stop()
+
+        busy_samples = sum(v for k, v in stacks.items() if k.split(";")[-1].startswith("busy "))
+        assert busy_samples > 0
+        assert all(k.startswith("main;") for k in stacks)
+        # The thread of the profiler is not sampled
+        assert not any(f"_run ({profilers.__file__}" in k for k in stacks)
+
+
+class TestCollapsed:
+    def test_write_and_read(self, tmpdir):
+        path = os.path.join(str(tmpdir), "profile.txt")
+        stacks = Counter({"main;a (x.py:1);b (x.py:3)": 3, "main;a (x.py:1)": 1})
+
+        write_collapsed(path, stacks)
+
+        with open(path, encoding="utf8") as f:
+            assert f.read() == "main;a (x.py:1) 1\nmain;a (x.py:1);b (x.py:3) 3\n"
+        assert read_collapsed(path) == stacks
+
+
+class TestProfileWorker:
+    def test_processes(self, tmpdir):
+        workers_dir = str(tmpdir)
+        main = profilers.start_main()
+        with futures.ProcessPoolExecutor(max_workers=2) as ex:
+            pids = set(ex.map(profile_busy, [workers_dir] * 4))
+
+        path = os.path.join(workers_dir, "profile.txt")
+        stacks = profilers.finish_main(main, path, workers_dir)
+
+        assert {f"{x}.txt" for x in pids} <= set(os.listdir(workers_dir))
+        assert any(k.startswith("worker;") and "busy (" in k for k in stacks)
+        assert read_collapsed(path) == stacks
+
+    def test_threads(self, tmpdir):
+        main = profilers.start_main()
+        profilers.profile_worker(str(tmpdir))
+        profilers.finish_main(main, os.path.join(str(tmpdir), "profile.txt"), str(tmpdir))
+
+        # Threads are sampled by the profiler of the main process
+        assert os.listdir(str(tmpdir)) == ["profile.txt"]
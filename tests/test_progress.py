@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import json
+import os
+from collections import Counter
+from unittest.mock import patch
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+
+from jumeaux.domain.config.vo import Progress
+from jumeaux.progress import ProgressReporter, to_bytes, to_human_bytes, to_message
+
+
+def create_trial(status: str, one_byte: int = 100, other_byte: int = 200) -> dict:
+    return {"status": status, "one": {"byte": one_byte}, "other": {"byte": other_byte}}
+
+
+def create_reporter(progress: dict = None, total: int = 10, in_flight: int = 0, **kwargs):
+    with patch("jumeaux.progress.time.monotonic", return_value=100.0):
+        return ProgressReporter(
+            Progress.from_dict(progress or {}), total, lambda: in_flight, **kwargs
+        )
+
+
+class TestToBytes:
+    def test(self):
+        assert to_bytes(create_trial("same")) == 300
+
+    def test_failure(self):
+        assert to_bytes({"status": "failure", "one": {"url": "u"}, "other": {"url": "u"}}) == 0
+
+
+class TestToHumanBytes:
+    def test(self):
+        assert to_human_bytes(512) == "512.0B"
+        assert to_human_bytes(1536) == "1.5KB"
+        assert to_human_bytes(3 * 1024 * 1024) == "3.0MB"
+        assert to_human_bytes(5 * 1024 ** 3) == "5.0GB"
+
+
+class TestProgressReporter:
+    def test_status(self):
+        reporter = create_reporter(total=10, in_flight=3)
+        for s in ["same", "same", "different", "failure"]:
+            reporter.record(create_trial(s))
+
+        actual = reporter.status(102.0)
+
+        assert actual.to_dict() == {
+            "total": 10,
+            "completed": 4,
+            "in_flight": 3,
+            "remaining": 3,
+            "status": {"same": 2, "different": 1, "failure": 1},
+            "elapsed_sec": 2.0,
+            "req_per_sec": 2.0,
+            "bytes_per_sec": 600.0,
+            "eta_sec": 3.0,
+            "finished": False,
+        }
+
+    def test_no_trials(self):
+        actual = create_reporter().status(101.0)
+
+        assert actual.req_per_sec == 0.0
+        assert actual.eta_sec.get() is None
+
+    def test_sliding_window(self):
+        reporter = create_reporter({"window_sec": 10}, total=100)
+        for _ in range(50):
+            reporter.record(create_trial("same"))
+        reporter.status(110.0)
+        for _ in range(10):
+            reporter.record(create_trial("same"))
+        reporter.status(120.0)
+        for _ in range(10):
+            reporter.record(create_trial("same"))
+
+        actual = reporter.status(130.0)
+
+        # Only trials in the last 10 seconds
+        assert actual.req_per_sec == 1.0
+        assert actual.eta_sec.get() == 30.0
+
+    def test_resumed(self):
+        reporter = create_reporter(total=10, status_counts=Counter({"same": 5}))
+        reporter.record(create_trial("different"))
+
+        actual = reporter.status(101.0)
+
+        assert actual.completed == 6
+        assert actual.req_per_sec == 1.0
+
+    def test_stop(self, tmpdir):
+        status_file = os.path.join(str(tmpdir), "status.json")
+        reporter = create_reporter({"status_file": status_file}, total=2, in_flight=1).start()
+        reporter.record(create_trial("same"))
+        reporter.record(create_trial("different"))
+
+        actual = reporter.stop()
+
+        assert actual.finished is True
+        assert actual.in_flight == 0
+        with open(status_file, encoding="utf8") as f:
+            assert json.load(f) == actual.to_dict()
+        assert not os.path.exists(f"{status_file}.tmp")
+
+
+class TestToMessage:
+    def test(self):
+        reporter = create_reporter(total=10, in_flight=3)
+        for s in ["same", "same", "different", "failure"]:
+            reporter.record(create_trial(s))
+
+        assert to_message(reporter.status(102.0)) == (
+            "Progress: 4/10 (40.0%) | in-flight 3 | remaining 3 | 2.0 req/s | 600.0B/s"
+            " | same 2 / different 1 / failure 1 | ETA 3s"
+        )
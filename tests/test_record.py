@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import datetime
+import os
+import pickle
+from unittest.mock import MagicMock
+
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from owlmixin import TOption
+from requests.structures import CaseInsensitiveDict
+
+from jumeaux.connection import PooledSession
+from jumeaux.domain.config.vo import Record
+from jumeaux.models import RawResponse
+from jumeaux.record import RecordedSession, ResponseStore, to_key
+
+
+def create_response(content: bytes = b'{"id": 1}') -> RawResponse:
+    return RawResponse(
+        content,
+        CaseInsensitiveDict({"Content-Type": "application/json; charset=utf8"}),
+        "http://one/api",
+        200,
+        datetime.timedelta(seconds=1, microseconds=500000),
+        "utf8",
+    )
+
+
+def create_session(tmpdir, mode: str) -> RecordedSession:
+    inner = MagicMock()
+    inner.request.side_effect = lambda method, url, **kwargs: create_response()
+    return RecordedSession(
+        inner, Record.from_dict({"path": os.path.join(str(tmpdir), "one.db"), "mode": mode})
+    )
+
+
+class TestToKey:
+    def test_default_user_agent_is_ignored(self):
+        assert to_key("GET", "http://one/api", {"User-Agent": "jumeaux/1.0.0"}) == to_key(
+            "GET", "http://one/api", {"User-Agent": "jumeaux/2.0.0"}
+        )
+
+    def test_resolved_request(self):
+        base = to_key("POST", "http://one/api?q=1", {"X-Id": "1"}, None, {"id": 1})
+        assert base == to_key("POST", "http://one/api?q=1", {"X-Id": "1"}, None, {"id": 1})
+        assert base != to_key("GET", "http://one/api?q=1", {"X-Id": "1"}, None, {"id": 1})
+        assert base != to_key("POST", "http://one/api?q=2", {"X-Id": "1"}, None, {"id": 1})
+        assert base != to_key("POST", "http://one/api?q=1", {"X-Id": "2"}, None, {"id": 1})
+        assert base != to_key("POST", "http://one/api?q=1", {"X-Id": "1"}, None, {"id": 2})
+
+
+class TestResponseStore:
+    def test_put_and_get(self, tmpdir):
+        store = ResponseStore(os.path.join(str(tmpdir), "one.db"))
+        store.put("key", "GET", create_response())
+
+        actual = store.get("key")
+        assert actual.content == b'{"id": 1}'
+        assert actual.headers["content-type"] == "application/json; charset=utf8"
+        assert actual.url == "http://one/api"
+        assert actual.status_code == 200
+        assert actual.elapsed == datetime.timedelta(seconds=1, microseconds=500000)
+        assert actual.encoding == "utf8"
+        assert store.get("unknown") is None
+        store.close()
+
+
+class TestRecordedSession:
+    def test_record_then_replay(self, tmpdir):
+        recorder = create_session(tmpdir, "record")
+        recorder.get("http://one/api", headers={"X-Id": "1"}, proxies={})
+        recorder.close()
+        assert recorder.to_stats().recorded == 1
+
+        replayer = create_session(tmpdir, "replay")
+        actual = replayer.get("http://one/api", headers={"X-Id": "1"}, proxies={})
+        assert actual.content == b'{"id": 1}'
+        replayer.session.request.assert_not_called()
+
+        # Not recorded requests are sent live
+        replayer.get("http://one/api", headers={"X-Id": "2"}, proxies={})
+        assert replayer.session.request.call_count == 1
+        assert replayer.to_stats().to_dict() == {
+            "mode": "replay",
+            "path": os.path.join(str(tmpdir), "one.db"),
+            "recorded": 0,
+            "replayed": 1,
+            "missed": 1,
+        }
+
+    def test_pickle(self, tmpdir):
+        session = RecordedSession(
+            PooledSession("one", TOption(None), 0, 1),
+            Record.from_dict({"path": os.path.join(str(tmpdir), "one.db"), "mode": "replay"}),
+        )
+        session.store.put("key", "GET", create_response())
+
+        # The store is opened again in the process which unpickles it
+        actual: RecordedSession = pickle.loads(pickle.dumps(session))
+
+        assert actual.record.to_dict() == session.record.to_dict()
+        assert actual.store is not session.store
+        assert actual.store.get("key").content == b'{"id": 1}'
+        session.close()
+        actual.close()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import json
+import os
+
+import pytest
+import jumeaux.addons  # XXX: Workaround for cyclic import
+from owlmixin import TList
+
+from jumeaux.domain.config.vo import Schedule, ScheduleKey
+from jumeaux.models import Request
+from jumeaux.schedule import (
+    load_expected_secs,
+    order_longest_first,
+    schedule,
+    to_expected_sec,
+)
+
+
+def create_trial(path: str, name: str, one: dict, other: dict) -> dict:
+    return {"path": path, "name": name, "one": one, "other": other}
+
+
+TRIALS = [
+    create_trial("/fast", "a", {"response_sec": 0.1}, {"response_sec": 0.2}),
+    create_trial("/slow", "b", {"response_sec": 2.0}, {"response_sec": 1.0}),
+    create_trial("/slow", "c", {"response_sec": 3.0}, {"response_sec": 4.0}),
+    create_trial("/broken", "d", {}, {}),
+]
+
+
+class TestToExpectedSec:
+    @pytest.mark.parametrize(
+        "title, one, other, expected",
+        [
+            ("Slower one", {"response_sec": 0.3}, {"response_sec": 1.2}, 1.2),
+            ("Only one side", {"response_sec": 0.3}, {}, 0.3),
+            ("Failure", {}, {}, None),
+        ],
+    )
+    def test(self, title, one, other, expected):
+        assert to_expected_sec(create_trial("/", "n", one, other)) == expected
+
+
+class TestLoadExpectedSecs:
+    def test_by_path(self):
+        assert load_expected_secs(TRIALS, ScheduleKey.PATH) == {"/fast": 0.2, "/slow": 3.0}
+
+    def test_by_name(self):
+        assert load_expected_secs(TRIALS, ScheduleKey.NAME) == {"a": 0.2, "b": 2.0, "c": 4.0}
+
+
+class TestOrderLongestFirst:
+    def test_by_path(self):
+        reqs = Request.from_dicts(
+            [{"path": "/fast"}, {"path": "/unknown"}, {"path": "/slow"}, {"path": "/fast"}]
+        )
+        expected_secs = {"/fast": 0.2, "/slow": 3.0}
+
+        # Unknown requests are expected to take the mean (1.6 sec)
+        assert order_longest_first(reqs, expected_secs, ScheduleKey.PATH) == [2, 1, 0, 3]
+
+    def test_by_name(self):
+        reqs = Request.from_dicts([{"path": "/", "name": "a"}, {"path": "/"}])
+        # A request without a name is named by its seq as same as a trial
+        expected_secs = {"a": 0.2, "2": 1.0}
+
+        assert order_longest_first(reqs, expected_secs, ScheduleKey.NAME) == [1, 0]
+
+    def test_no_expectation(self):
+        reqs = Request.from_dicts([{"path": "/a"}, {"path": "/b"}])
+        assert order_longest_first(reqs, {}, ScheduleKey.PATH) == [0, 1]
+
+
+class TestSchedule:
+    def test(self, tmpdir):
+        path = os.path.join(str(tmpdir), "report.json")
+        with open(path, "w", encoding="utf8") as f:
+            json.dump({"key": "previous", "trials": TRIALS}, f)
+        reqs: TList[Request] = Request.from_dicts([{"path": "/fast"}, {"path": "/slow"}])
+
+        assert schedule(reqs, Schedule.from_dict({"report": path})) == [1, 0]
+
+    def test_not_found(self, tmpdir):
+        config = Schedule.from_dict({"report": os.path.join(str(tmpdir), "report.json")})
+
+        with pytest.raises(SystemExit):
+            schedule(TList(), config)
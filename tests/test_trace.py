@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+import json
+import os
+import threading
+
+from jumeaux.trace import TraceWriter, create_async_span, create_span
+
+
+class TestCreateSpan:
+    def test(self):
+        actual = create_span("diff", "stage", 1.5, 1.75, url="http://host")
+
+        assert actual == {
+            "name": "diff",
+            "cat": "stage",
+            "ph": "X",
+            "ts": 1500000,
+            "dur": 250000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"url": "http://host"},
+        }
+
+
+class TestCreateAsyncSpan:
+    def test(self):
+        actual = create_async_span("[1] name", "trial", 1, 1.5, 2.0, status="same")
+
+        common = {"name": "[1] name", "cat": "trial", "id": 1, "pid": os.getpid(), "tid": 0}
+        assert actual == [
+            {**common, "ph": "b", "ts": 1500000, "args": {"status": "same"}},
+            {**common, "ph": "e", "ts": 2000000},
+        ]
+
+
+class TestTraceWriter:
+    def test(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trace.json")
+        writer = TraceWriter(path)
+        writer.write([{"name": "a"}])
+        writer.write(None)
+        writer.write([{"name": "b"}, {"name": "c"}])
+        writer.close()
+
+        with open(path, encoding="utf8") as f:
+            assert json.load(f) == [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+
+    def test_empty(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trace.json")
+        TraceWriter(path).close()
+
+        with open(path, encoding="utf8") as f:
+            assert json.load(f) == []
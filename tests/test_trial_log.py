@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import os
+
+from jumeaux import trial_log
+from jumeaux.trial_log import TrialLog
+
+
+class TestTrialLog:
+    def test_write(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trials.jsonl")
+        with TrialLog(path) as log:
+            log.write({"seq": 1, "name": "名前", "status": "same"})
+        with TrialLog(path) as log:
+            log.write({"seq": 2, "name": "name", "status": "failure"})
+
+        with open(path, encoding="utf8") as f:
+            assert f.read() == (
+                '{"seq": 1, "name": "名前", "status": "same"}\n'
+                '{"seq": 2, "name": "name", "status": "failure"}\n'
+            )
+
+
+class TestRecover:
+    def test_normal(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trials.jsonl")
+        with TrialLog(path) as log:
+            log.write({"seq": 1, "status": "same"})
+            log.write({"seq": 3, "status": "different"})
+            log.write({"seq": 2, "status": "same"})
+
+        seqs, status_counts = trial_log.recover(path)
+
+        assert seqs == {1, 2, 3}
+        assert status_counts == {"same": 2, "different": 1}
+
+    def test_broken_last_line(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trials.jsonl")
+        with open(path, "w", encoding="utf8") as f:
+            f.write('{"seq": 1, "status": "same"}\n{"seq": 2, "stat')
+
+        seqs, status_counts = trial_log.recover(path)
+
+        assert seqs == {1}
+        assert status_counts == {"same": 1}
+        with open(path, encoding="utf8") as f:
+            assert f.read() == '{"seq": 1, "status": "same"}\n'
+
+
+class TestSortBySeq:
+    def write(self, path: str, seqs: list):
+        with TrialLog(path) as log:
+            for seq in seqs:
+                log.write({"seq": seq, "status": "same"})
+
+    def test_not_sorted(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trials.jsonl")
+        self.write(path, [3, 1, 2])
+
+        assert trial_log.sort_by_seq(path)
+        with open(path, encoding="utf8") as f:
+            assert f.read() == (
+                '{"seq": 1, "status": "same"}\n'
+                '{"seq": 2, "status": "same"}\n'
+                '{"seq": 3, "status": "same"}\n'
+            )
+
+    def test_already_sorted(self, tmpdir):
+        path = os.path.join(str(tmpdir), "trials.jsonl")
+        self.write(path, [1, 2, 4])
+
+        assert not trial_log.sort_by_seq(path)
+        assert os.listdir(str(tmpdir)) == ["trials.jsonl"]
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding:utf-8 -*-
+# pylint: disable=no-self-use
+import threading
+
+from jumeaux.window import InFlightWindow
+
+
+def acquire_all(window: InFlightWindow, keys: list) -> InFlightWindow:
+    for k in keys:
+        assert window.try_acquire(k)
+    return window
+
+
+class TestInFlightWindow:
+    def test_window(self):
+        window = acquire_all(InFlightWindow(2), [1, 2])
+        assert not window.try_acquire(3)
+
+        # A place is released as soon as its challenge completes, even if previous ones don't
+        window.release(2)
+        assert window.try_acquire(3)
+        assert not window.try_acquire(4)
+        assert window.max_size == 2
+
+    def test_no_window(self):
+        window = acquire_all(InFlightWindow(), range(100))
+        assert window.max_size == 100
+
+    def test_acquire_waits_until_released(self):
+        window = acquire_all(InFlightWindow(1), [1])
+        acquired: list = []
+        t = threading.Thread(target=lambda: acquired.append(window.acquire(2)))
+        t.start()
+        t.join(0.05)
+        assert acquired == []
+
+        window.release(1)
+        t.join()
+        assert acquired == [True]
+
+    def test_acquire_returns_false_when_closed(self):
+        window = acquire_all(InFlightWindow(1), [1])
+        acquired: list = []
+        t = threading.Thread(target=lambda: acquired.append(window.acquire(2)))
+        t.start()
+
+        window.close()
+        t.join()
+        assert acquired == [False]
+        assert not window.try_acquire(3)